@@ -21,9 +21,13 @@ Communication = {
     # Optional: Protocol to use. If not specified, the standard Client protocol is used which requests all
     # parameters in each update cycle. Use this to implement bidirectional communication.
     "protocol": KemperBidirectionalProtocol(
-        time_lease_seconds = 30               # When the controller is removed, the Profiler will stay in bidirectional
+        time_lease_seconds = 30,              # When the controller is removed, the Profiler will stay in bidirectional
                                               # mode for this amount of seconds. The communication is re-initiated every  
                                               # half of this value. 
+
+        #auto_parameter_set = True            # Optional: Let the Profiler only send the smallest parameter set containing 
+                                              # the parameters used by your configuration. Currently only set 2 is 
+                                              # defined, so this has no effect yet.
     ),
 
     # MIDI setup. This defines all MIDI routings. You at least have to define routings from and to 
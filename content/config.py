@@ -14,6 +14,12 @@ Config = {
     # A good value is the maximum amount of switches. Default is 10.
     #"maxConsecutiveMidiMessages": 10,
 
+    # Time budget (microseconds) for parsing MIDI messages before the switch states are evaluated again.
+    # If set, this replaces maxConsecutiveMidiMessages: Messages are parsed until the budget is used up.
+    # When the MIDI input buffer is close to overflowing, the budget is increased temporarily (up to 4 times). 
+    # Default is 0 (disabled).
+    #"midiTimeBudgetMicros": 3000,
+
     # Clear MIDI buffer before starting processing. Default is True.
     #"clearBuffers": True,                 
 
@@ -21,10 +27,48 @@ Config = {
     # assumed that the Kemper device is offline. Optional, default is 2 seconds.
     #"maxRequestLifetimeMillis": 2000,
 
+    # Maximum number of parameter requests waiting for an answer at the same time. Further requests are queued
+    # and sent as soon as earlier ones have been answered or timed out. Default is 0 (no limit).
+    #"maxRequestsInFlight": 8,
+
+    # Send parameter requests at the end of each tick, after all messages triggered by the user (switches etc.), and optionally
+    # limit the number of request messages sent per tick (the rest is sent in the next ticks). The request timeout 
+    # ("maxRequestLifetimeMillis") starts when a request is actually sent. Default is False / 0 (no limit).
+    #"prioritizeSetMessages": True,
+    #"maxRequestMessagesPerTick": 4,
+
+    # Coalesce the messages of continuous inputs (expression pedals, encoders): Only the latest value of each parameter is
+    # sent at the end of each tick, optionally with a maximum rate (MIDI messages per second on the output, shared by all continuous
+    # inputs, which take turns). The rate applies to the client's MIDI output as a whole, so with several output devices routed from 
+    # the application, each of them gets the same messages. Default is False / 0 (no limit).
+    #"coalesceContinuousMessages": True,
+    #"coalesceMaxRate": 50,
+
+    # Adaptive polling (only without bidirectional communication): Parameters whose values have been stable are requested 
+    # less often, backing off exponentially (starting at "updateInterval") up to this interval in milliseconds. User changes, 
+    # rig changes and changed values switch back to the fast rate. Default is 0 (disabled).
+    #"pollMaxIntervalMillis": 2000,
+
+    # Store the last known parameter values on flash, so they can be shown directly after booting (until the device has
+    # answered). Only permanently displayed values are stored (for the Kemper: rig, bank and effect slot values). Writes are delayed until the values have been stable for "valueCacheWriteDelayMillis" and happen at most 
+    # every "valueCacheMinWriteIntervalMillis" to save flash wear. Only works when the USB drive is not mounted. Default is False.
+    #"valueCache": True,
+    #"valueCacheFile": "/.pyswitch_values",
+    #"valueCacheWriteDelayMillis": 5000,
+    #"valueCacheMinWriteIntervalMillis": 60000,
+
     # Update interval, for updating the rig date (which triggers all other data to update when changed) (milliseconds)
     # and other displays if assigned. 200 is the default.
     #"updateInterval": 200,
 
+    # Own update interval for the bidirectional client (keep-alive and connection sensing) in milliseconds. If not 
+    # set, the client is updated with the "updateInterval".
+    #"clientUpdateInterval": 500,
+
+    # Own update interval for all callbacks (display refresh and parameter requests) in milliseconds. Smaller values
+    # make displays react faster, larger values save processing power. If not set, callbacks are updated with the "updateInterval".
+    #"callbackUpdateInterval": 100,
+
     # Amount of bytes that must at least be free at the time processing starts (normally the program requires anther about
     # 10kB for character loading etc., default threshold for the warning is 15kB).
     #"memoryWarnLimitBytes": 1024 * 15,
@@ -43,6 +87,10 @@ Config = {
     #"ledBrightnessOn": 0.3,
     #"ledBrightnessOff": 0.02,
 
+    # Collect all LED changes of one processing tick in a frame buffer, and push them to the NeoPixels 
+    # at once at the end of the tick (only if anything changed). Default is False.
+    #"bufferedLeds": True,
+
     ## Development Options ###################################################################################################################
 
     # Debug output is printed to serial console via USB. 
@@ -51,6 +99,14 @@ Config = {
     #"debugStats": True,                              # Show info about runtime and memory usage periodically every update interval
     #"debugStatsInterval": 2000,                      # Update interval for runtime statistics (also affects the performance dot, default is 
                                                       # the "updateInterval" option)
+    #"debugProfiler": True,                           # Profile the run time of all components (updateables, inputs, client, MIDI, LEDs) and
+                                                      # periodically print the top ones
+    #"debugProfilerInterval": 5000,                   # Print interval for the profiler (default 5000ms)
+    #"debugProfilerTop": 10,                          # Number of components shown by the profiler (default 10)
+    #"debugLatency": True,                            # Measure the latency from switch actions to the next sent SET message and print 
+                                                      # a histogram summary (p50/p95/p99). Data can be exported with appl.latency.export().
+    #"debugLatencyInterval": 2000,                    # Print interval for the latency report (only printed if new samples came in)
+    #"debugLatencyBinMicros": 250,                    # Histogram bin width in microseconds (64 bins, plus overflow)
     #"debugBidirectionalProtocol": True,              # Debug the bidirectional protocol, if any
     #"debugUnparsedMessages": True,                   # Shows all incoming MIDI messages which have not been parsed by the application.
     #"debugSentMessages": True,                       # Shows all sent messages
@@ -5,7 +5,7 @@ from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.program_change import ProgramChange
 
 from ...misc import PeriodCounter, do_print, PYSWITCH_VERSION
-from ...colors import Colors
+from ...colors import Colors, dim_color
 from ...controller.callbacks import Callback
 from ...controller.client import ClientParameterMapping, ClientTwoPartParameterMapping
 from ...ui.elements import TunerDisplay
@@ -70,7 +70,8 @@ class KemperRigNameCallback(Callback):
 
     def __init__(self, 
                  show_name = True,     # Show the rig name in the label
-                 show_rig_id = False   # Show the rig ID (like 1-1) in the label
+                 show_rig_id = False,  # Show the rig ID (like 1-1) in the label
+                 stale_dim_factor = 0.5  # Values restored from the value cache (not confirmed by the device yet) are shown with the text color dimmed by this factor
     ):
         Callback.__init__(self)
 
@@ -88,6 +89,9 @@ class KemperRigNameCallback(Callback):
 
         self.__preselect_initialized = None    
 
+        self.__stale_dim_factor = stale_dim_factor
+        self.__text_color = None
+
     def init(self, appl, listener = None):
         super().init(appl, listener)
         self.__appl = appl
@@ -107,6 +111,8 @@ class KemperRigNameCallback(Callback):
             self.__preselect_initialized = None
 
     def update_label(self, label):
+        self.__update_text_color(label)
+
         if "preselectedBank" in self.__appl.shared:
             label.text = f"Bank { str(self.__appl.shared["preselectedBank"] + 1) }"
             return
@@ -126,6 +132,18 @@ class KemperRigNameCallback(Callback):
         elif self.__show_name:
             label.text = name
 
+    # Dims the text while the shown values are stale
+    def __update_text_color(self, label):
+        if self.__text_color == None:
+            self.__text_color = label.text_color
+
+            if self.__text_color == None:
+                return
+
+        stale = (self.__show_name and self.__mapping_name.stale) or (self.__show_rig_id and self.__mapping_id.stale)
+
+        label.text_color = dim_color(self.__text_color, self.__stale_dim_factor) if stale else self.__text_color
+
 
 ####################################################################################################################
 
@@ -153,8 +171,11 @@ class TunerDisplayCallback(Callback):
                                                            # The number will be divided by the amount of available switches to get the real max. frame rate (that's
                                                            # why it is called cumulative ;)
                  strobe_reverse = True,                    # If False, the strobe is rotating clockwise when too high / ccw when too low. If True, the other way round.
-                 process_overridden_actions = False        # If set, when in tuner mode, the underlying actions will also be processed after disabling the tuner. 
+                 process_overridden_actions = False,       # If set, when in tuner mode, the underlying actions will also be processed after disabling the tuner. 
                                                            # Also the LEDs keep their initial state (if strobe is disabled of course)
+                 frame_rate = 0                            # If set, the deviance display and strobe LEDs are redrawn with this frame rate (frames per second), 
+                                                           # showing the latest deviance received, instead of on every incoming message. This saves processing 
+                                                           # power while tuning (30 is a good value to start from).
         ):
         Callback.__init__(self)
 
@@ -180,7 +201,8 @@ class TunerDisplayCallback(Callback):
                 color_neutral = color_neutral,
                 calibration_high = calibration_high,
                 calibration_low = calibration_low,
-                note_names = note_names
+                note_names = note_names,
+                frame_rate = frame_rate
             )
 
         if strobe:
@@ -193,7 +215,8 @@ class TunerDisplayCallback(Callback):
                 speed = strobe_speed,
                 color = strobe_color,
                 max_fps = strobe_max_fps,
-                reverse = strobe_reverse
+                reverse = strobe_reverse,
+                frame_rate = frame_rate
             )
         else:
             self.__strobe_controller = None
@@ -408,143 +431,184 @@ class KemperMappings:
     # Effect slot enable/disable
     @staticmethod
     def EFFECT_STATE(slot_id):
-        return ClientParameterMapping.get(
-            name = f"Slot State { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
-            set = ControlChange(
-                KemperEffectSlot.CC_EFFECT_SLOT_ENABLE[slot_id], 
-                0    # Dummy value, will be overridden
-            ),
-            request = KemperNRPNMessage(               
-                NRPN_FUNCTION_REQUEST_SINGLE_PARAMETER, 
-                KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
-                _NRPN_EFFECT_PARAMETER_ADDRESS_STATE
-            ),
-            response = KemperNRPNMessage(
-                NRPN_FUNCTION_RESPONSE_SINGLE_PARAMETER,
-                KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
-                _NRPN_EFFECT_PARAMETER_ADDRESS_STATE
-            )
-        )
+        return ClientParameterMapping.get_keyed(_create_effect_state, slot_id)
     
     # Effect slot type (request only)
     @staticmethod
     def EFFECT_TYPE(slot_id):
-        return ClientParameterMapping.get(
-            name = f"Slot Type { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
-            request = KemperNRPNMessage(               
-                NRPN_FUNCTION_REQUEST_SINGLE_PARAMETER, 
-                KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
-                _NRPN_EFFECT_PARAMETER_ADDRESS_TYPE
-            ),
-            response = KemperNRPNMessage(               
-                NRPN_FUNCTION_RESPONSE_SINGLE_PARAMETER, 
-                KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
-                _NRPN_EFFECT_PARAMETER_ADDRESS_TYPE
-            )
-        )
+        return ClientParameterMapping.get_keyed(_create_effect_type, slot_id)
 
     # Rig date (request only)
     def RIG_DATE(): 
-        return ClientParameterMapping.get(
-            name = "Rig Date",
-            request = KemperNRPNMessage(               
-                NRPN_FUNCTION_REQUEST_STRING_PARAMETER, 
-                NRPN_ADDRESS_PAGE_STRINGS,
-                _NRPN_STRING_PARAMETER_ID_RIG_DATE
-            ),
-            response = KemperNRPNMessage(
-                NRPN_FUNCTION_RESPONSE_STRING_PARAMETER, 
-                NRPN_ADDRESS_PAGE_STRINGS,
-                _NRPN_STRING_PARAMETER_ID_RIG_DATE
-            ),
-            type = ClientParameterMapping.PARAMETER_TYPE_STRING
-        )
+        return ClientParameterMapping.get_keyed(_create_rig_date)
 
     # Rig name (request only)
     def RIG_NAME(): 
-        return ClientParameterMapping.get(
-            depends = KemperMappings.RIG_DATE(),
-            name = "Rig Name",
-            request = KemperNRPNMessage(               
-                NRPN_FUNCTION_REQUEST_STRING_PARAMETER,             
-                NRPN_ADDRESS_PAGE_STRINGS,
-                _NRPN_STRING_PARAMETER_ID_RIG_NAME
-            ),
-            response = KemperNRPNMessage(
-                NRPN_FUNCTION_RESPONSE_STRING_PARAMETER, 
-                NRPN_ADDRESS_PAGE_STRINGS,
-                _NRPN_STRING_PARAMETER_ID_RIG_NAME
-            ),
-            type = ClientParameterMapping.PARAMETER_TYPE_STRING
-        )
+        return ClientParameterMapping.get_keyed(_create_rig_name)
 
     # Switch tuner mode on/off (no receive possible when not in bidirectional mode)
     def TUNER_MODE_STATE(): 
-        return ClientParameterMapping.get(
-            name = "Tuner Mode",
-            set = ControlChange(
-                _CC_TUNER_MODE, 
-                0    # Dummy value, will be overridden
-            ),
-            response = KemperNRPNMessage(
-                0x01,
-                0x7f,
-                0x7e
-            )
-        )
+        return ClientParameterMapping.get_keyed(_create_tuner_mode_state)
 
     # Tuner note (only sent in bidirectional mode)
     def TUNER_NOTE(): 
-        return ClientParameterMapping.get(
-            name = "Tuner Note",
-            response = KemperNRPNMessage(
-                0x01,
-                0x7d,
-                0x54
-            )
-        )
+        return ClientParameterMapping.get_keyed(_create_tuner_note)
 
     # Tuner deviance from "in tune" (only sent in bidirectional mode)
     def TUNER_DEVIANCE(): 
-        return ClientParameterMapping.get(
-            name = "Tuner Deviance",
-            response = KemperNRPNMessage(
-                0x01,
-                0x7c,
-                0x0f
-            )
-        )
+        return ClientParameterMapping.get_keyed(_create_tuner_deviance)
 
     # Used for state sensing in bidirection communication
     def BIDIRECTIONAL_SENSING():
-        return ClientParameterMapping.get(
-            name = "Sense",
-            response = KemperNRPNExtendedMessage(
-                0x7e,
-                [
-                    0x7f
-                ]
-            )
-        ) 
+        return ClientParameterMapping.get_keyed(_create_bidirectional_sensing)
     
     # Rig ID
     def RIG_ID():
-        return ClientTwoPartParameterMapping.get(
-            name = "Rig ID",
-            response = [
-                ControlChange(
-                    _CC_RIG_INDEX_PART_1,
-                    0    # Dummy value, will be ignored
-                ),
-                ProgramChange(
-                    0    # Dummy value, will be ignored
-                )
+        return ClientTwoPartParameterMapping.get_keyed(_create_rig_id)
+
+####################################################################################################################
+
+
+# Factories for the KemperMappings (see ClientParameterMapping.get_keyed())
+def _create_effect_state(slot_id):
+    return ClientParameterMapping.get(
+        name = f"Slot State { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
+        set = ControlChange(
+            KemperEffectSlot.CC_EFFECT_SLOT_ENABLE[slot_id], 
+            0    # Dummy value, will be overridden
+        ),
+        request = KemperNRPNMessage(               
+            NRPN_FUNCTION_REQUEST_SINGLE_PARAMETER, 
+            KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
+            _NRPN_EFFECT_PARAMETER_ADDRESS_STATE
+        ),
+        response = KemperNRPNMessage(
+            NRPN_FUNCTION_RESPONSE_SINGLE_PARAMETER,
+            KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
+            _NRPN_EFFECT_PARAMETER_ADDRESS_STATE
+        ),
+        persist = True
+    )
+
+def _create_effect_type(slot_id):
+    return ClientParameterMapping.get(
+        depends = KemperMappings.RIG_DATE(),
+        name = f"Slot Type { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
+        request = KemperNRPNMessage(               
+            NRPN_FUNCTION_REQUEST_SINGLE_PARAMETER, 
+            KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
+            _NRPN_EFFECT_PARAMETER_ADDRESS_TYPE
+        ),
+        response = KemperNRPNMessage(               
+            NRPN_FUNCTION_RESPONSE_SINGLE_PARAMETER, 
+            KemperEffectSlot.NRPN_SLOT_ADDRESS_PAGE[slot_id],
+            _NRPN_EFFECT_PARAMETER_ADDRESS_TYPE
+        ),
+        persist = True
+    )
+
+def _create_rig_date():
+    return ClientParameterMapping.get(
+        name = "Rig Date",
+        request = KemperNRPNMessage(               
+            NRPN_FUNCTION_REQUEST_STRING_PARAMETER, 
+            NRPN_ADDRESS_PAGE_STRINGS,
+            _NRPN_STRING_PARAMETER_ID_RIG_DATE
+        ),
+        response = KemperNRPNMessage(
+            NRPN_FUNCTION_RESPONSE_STRING_PARAMETER, 
+            NRPN_ADDRESS_PAGE_STRINGS,
+            _NRPN_STRING_PARAMETER_ID_RIG_DATE
+        ),
+        type = ClientParameterMapping.PARAMETER_TYPE_STRING
+    )
+
+def _create_rig_name():
+    return ClientParameterMapping.get(
+        depends = KemperMappings.RIG_DATE(),
+        name = "Rig Name",
+        request = KemperNRPNMessage(               
+            NRPN_FUNCTION_REQUEST_STRING_PARAMETER,             
+            NRPN_ADDRESS_PAGE_STRINGS,
+            _NRPN_STRING_PARAMETER_ID_RIG_NAME
+        ),
+        response = KemperNRPNMessage(
+            NRPN_FUNCTION_RESPONSE_STRING_PARAMETER, 
+            NRPN_ADDRESS_PAGE_STRINGS,
+            _NRPN_STRING_PARAMETER_ID_RIG_NAME
+        ),
+        type = ClientParameterMapping.PARAMETER_TYPE_STRING,
+        persist = True
+    )
+
+def _create_tuner_mode_state():
+    return ClientParameterMapping.get(
+        name = "Tuner Mode",
+        set = ControlChange(
+            _CC_TUNER_MODE, 
+            0    # Dummy value, will be overridden
+        ),
+        response = KemperNRPNMessage(
+            0x01,
+            0x7f,
+            0x7e
+        )
+    )
+
+def _create_tuner_note():
+    return ClientParameterMapping.get(
+        name = "Tuner Note",
+        response = KemperNRPNMessage(
+            0x01,
+            0x7d,
+            0x54
+        ),
+        notify_always = True
+    )
+
+def _create_tuner_deviance():
+    return ClientParameterMapping.get(
+        name = "Tuner Deviance",
+        response = KemperNRPNMessage(
+            0x01,
+            0x7c,
+            0x0f
+        ),
+        notify_always = True
+    )
+
+def _create_bidirectional_sensing():
+    return ClientParameterMapping.get(
+        name = "Sense",
+        response = KemperNRPNExtendedMessage(
+            0x7e,
+            [
+                0x7f
             ]
         )
+    ) 
+
+def _create_rig_id():
+    return ClientTwoPartParameterMapping.get(
+        name = "Rig ID",
+        response = [
+            ControlChange(
+                _CC_RIG_INDEX_PART_1,
+                0    # Dummy value, will be ignored
+            ),
+            ProgramChange(
+                0    # Dummy value, will be ignored
+            )
+        ],
+        persist = True
+    )
 
 ####################################################################################################################
 
 
+# Parameter sets of the bidirectional protocol. Only set 2 is defined here, as this is the set PySwitch has always used
+# and whose contents are known. Further sets can be added to _PARAMETER_SETS (each containing the parameters of the 
+# previous one), the automatic selection then picks the smallest one covering the registered mappings.
 _PARAMETER_SET_2 = [
     KemperMappings.EFFECT_TYPE(KemperEffectSlot.EFFECT_SLOT_ID_A),
     KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
@@ -564,16 +628,17 @@ _PARAMETER_SET_2 = [
     KemperMappings.EFFECT_TYPE(KemperEffectSlot.EFFECT_SLOT_ID_MOD),
     KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_MOD),
 
-    KemperMappings.RIG_NAME(),
-
     KemperMappings.TUNER_MODE_STATE(),
     KemperMappings.TUNER_NOTE(),
-    KemperMappings.TUNER_DEVIANCE()
-]
+    KemperMappings.TUNER_DEVIANCE(),
 
-_SELECTED_PARAMETER_SET_ID = const(0x02)
-_SELECTED_PARAMETER_SET = _PARAMETER_SET_2
+    KemperMappings.RIG_NAME()
+]
 
+# Available parameter sets (ID and hashed set of mappings), ordered by size
+_PARAMETER_SETS = (
+    (0x02, set(_PARAMETER_SET_2)),
+)
 
 # Implements the internal Kemper bidirectional communication protocol
 class KemperBidirectionalProtocol: #(BidirectionalProtocol):
@@ -581,7 +646,12 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
     _STATE_OFFLINE = 10   # No commmunication initiated
     _STATE_RUNNING = 20   # Bidirectional communication established
 
-    def __init__(self, time_lease_seconds):
+    # time_lease_seconds:   When the controller is removed, the Profiler will stay in bidirectional mode for this amount of seconds.
+    # auto_parameter_set:   If enabled, the smallest parameter set is used which contains all registered mappings which can be
+    #                       bidirectional, so the Profiler does not send parameters not used by the configuration. The selection 
+    #                       is done again on every initial beacon, and mappings registered later which are not covered by the 
+    #                       set in use trigger a new initial beacon. If disabled, the largest set is used.
+    def __init__(self, time_lease_seconds, auto_parameter_set = False):
         self.state = self._STATE_OFFLINE
         self.__time_lease_encoded = self.__encode_time_lease(time_lease_seconds)
 
@@ -604,6 +674,16 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
         self.__count_relevant_messages = 0
         self.__has_been_running = False
         self.__init_sent = False
+
+        # Parameter set in use (the largest one, until the automatic selection has been done). All mappings of the largest
+        # set are regarded as bidirectional.
+        self.__parameter_set_id, self.__parameter_set = _PARAMETER_SETS[-1]
+        self.__parameter_set_all = self.__parameter_set
+
+        # Automatic parameter set selection: The mappings of the largest set registered so far, and a flag to send a
+        # new initial beacon when a mapping not covered by the set in use has been registered.
+        self.__registered = {} if auto_parameter_set else None
+        self.__reinit = False
         
     # Called before usage, with a midi handler.
     def init(self, midi, client):
@@ -612,7 +692,39 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
 
     # Must return (boolean) if the passed mapping is handled in the bidirectional protocol
     def is_bidirectional(self, mapping):
-        return mapping in _SELECTED_PARAMETER_SET
+        if not mapping in self.__parameter_set_all:
+            return False
+        
+        registered = self.__registered
+        
+        if registered != None and not mapping in registered:
+            registered[mapping] = True
+
+            if not mapping in self.__parameter_set:
+                self.__reinit = True
+
+        return True
+    
+    # ID of the parameter set in use
+    @property
+    def parameter_set_id(self):
+        return self.__parameter_set_id
+
+    # Selects the smallest parameter set containing all mappings registered so far
+    def __select_parameter_set(self):
+        registered = self.__registered
+        self.__reinit = False
+
+        for parameter_set in _PARAMETER_SETS:
+            for mapping in registered:
+                if not mapping in parameter_set[1]:
+                    break
+            else:
+                self.__parameter_set_id, self.__parameter_set = parameter_set
+                break
+
+        if self.debug:                     # pragma: no cover
+            self.__print(f"Using parameter set { self.__parameter_set_id } ({ len(registered) } parameters used)")
 
     # Must return a color representation for the current state
     def get_color(self):
@@ -643,6 +755,12 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
                 if self.debug:                     # pragma: no cover
                     self.__print("Lost connection")                
 
+            elif self.__reinit:
+                if self.debug:                     # pragma: no cover
+                    self.__print("Parameter set does not cover all registered mappings")
+
+                self.__send_beacon(init = True)
+
             elif self.resend_period.exceeded:
                 if self.debug:                     # pragma: no cover
                     self.__print("Send keep-alive message")
@@ -689,12 +807,15 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
 
     # Send beacon for bidirection communication
     def __send_beacon(self, init = False):
+        if init and self.__registered != None:
+            self.__select_parameter_set()
+
         self.__midi.send(
             KemperNRPNExtendedMessage(
                 0x7e,
                 [
                     0x40,
-                    _SELECTED_PARAMETER_SET_ID,
+                    self.__parameter_set_id,
                     self.__get_flags(
                         init = init,
                         tunemode = True
@@ -22,7 +22,8 @@ def BANK_UP(display = None,
             color_callback = None,                            # Optional callback for setting the color. Footprint: def callback(action, bank, rig) -> (r, g, b) where bank and rig are int starting from 0.
             display_mode = RIG_SELECT_DISPLAY_CURRENT_RIG,    # Display mode (same as for RIG_SELECT, see definitions above)
             preselect = False,                                # Preselect mode. If enabled, the bank is only pre-selected, the change will only take effect when you select a rig next time.
-            max_bank = None                                   # Highest bank available. Only relevant if preselct is enabled.
+            max_bank = None,                                  # Highest bank available. Only relevant if preselct is enabled.
+            rig_names = False                                 # If set True, the label shows the name of the rig (target rig if display_mode is RIG_SELECT_DISPLAY_TARGET_RIG) if known and no text callback is passed. Rig names are cached while the rigs are visited.
     ):
     return Action({
         "callback": KemperBankChangeCallback(
@@ -36,7 +37,8 @@ def BANK_UP(display = None,
             text = text,
             text_callback = text_callback,
             preselect = preselect,
-            max_bank = max_bank
+            max_bank = max_bank,
+            rig_names = rig_names
         ),
         "display": display,
         "id": id,
@@ -57,7 +59,8 @@ def BANK_DOWN(display = None,                                   # Reference to a
               color_callback = None,                            # Optional callback for setting the color. Footprint: def callback(action, bank, rig) -> (r, g, b) where bank and rig are int starting from 0.
               display_mode = RIG_SELECT_DISPLAY_CURRENT_RIG,    # Display mode (same as for RIG_SELECT, see definitions above)
               preselect = False,                                # Preselect mode
-              max_bank = None                                   # Highest bank available. Only relevant if preselct is enabled.
+              max_bank = None,                                  # Highest bank available. Only relevant if preselct is enabled.
+              rig_names = False                                 # If set True, the label shows the name of the rig (target rig if display_mode is RIG_SELECT_DISPLAY_TARGET_RIG) if known and no text callback is passed. Rig names are cached while the rigs are visited.
     ):
     return Action({
         "callback": KemperBankChangeCallback(
@@ -71,7 +74,8 @@ def BANK_DOWN(display = None,                                   # Reference to a
             text = text,
             text_callback = text_callback,
             preselect = preselect,
-            max_bank = max_bank
+            max_bank = max_bank,
+            rig_names = rig_names
         ),
         "display": display,
         "id": id,
@@ -94,6 +98,7 @@ class KemperBankChangeCallback(Callback):
                  text_callback,
                  preselect,
                  max_bank,
+                 rig_names = False,
                  preselect_blink_interval = 400
         ):            
         super().__init__(mappings = [mapping])
@@ -111,6 +116,7 @@ class KemperBankChangeCallback(Callback):
         self.__text_callback = text_callback
         self.__preselect = preselect
         self.__max_bank = max_bank
+        self.__rig_names = rig_names
 
         if preselect:
             self.__preselect_blink_period = PeriodCounter(preselect_blink_interval)
@@ -140,6 +146,12 @@ class KemperBankChangeCallback(Callback):
             self.__appl.shared["preselectBlinkState"] = False
             self.__appl.shared["preselectCallback"] = None
 
+        if self.__rig_names:
+            from ..rig_name_cache import KemperRigNameCache
+
+            self.__rig_name_cache = KemperRigNameCache.get(appl)
+            self.__rig_name_cache.add_listener(self)
+
     def push(self):
         if self.__preselect:
             if self.__mapping.value == None:
@@ -209,6 +221,16 @@ class KemperBankChangeCallback(Callback):
                     self.action.label.text = self.__text_callback(self.action, target_bank, rig)
                 else:
                     raise Exception() #"Invalid display mode: " + repr(display_mode))
+
+            elif self.__rig_names:
+                if self.__display_mode == RIG_SELECT_DISPLAY_CURRENT_RIG:
+                    name = self.__rig_name_cache.name(bank, rig)
+                elif self.__display_mode == RIG_SELECT_DISPLAY_TARGET_RIG:
+                    name = self.__rig_name_cache.name(target_bank, rig)
+                else:
+                    raise Exception() #"Invalid display mode: " + repr(display_mode))
+
+                self.action.label.text = name if name else self.__text
             else:
                 self.action.label.text = self.__text
 
@@ -106,40 +106,10 @@ class KemperEffectEnableCallback(EffectEnableCallback):
 
     # Must return the effect category for a mapping value
     def get_effect_category(self, kpp_effect_type):
-        # NOTE: The ranges are defined by Kemper with a lot of unused numbers, so the borders between types
-        # could need to be adjusted with future Kemper firmware updates!
-        if (kpp_effect_type == 0):
-            return self.CATEGORY_NONE
-        elif (0 < kpp_effect_type and kpp_effect_type <= 10) or kpp_effect_type == 12:
-            return self.CATEGORY_WAH
-        elif kpp_effect_type == 11 or kpp_effect_type == 13:
-            return self.CATEGORY_PITCH
-        elif (14 < kpp_effect_type and kpp_effect_type <= 45):
-            return self.CATEGORY_DISTORTION
-        elif (45 < kpp_effect_type and kpp_effect_type <= 55):
-            return self.CATEGORY_COMPRESSOR
-        elif (55 < kpp_effect_type and kpp_effect_type <= 60):
-            return self.CATEGORY_NOISE_GATE       
-        elif (60 < kpp_effect_type and kpp_effect_type <= 64):
-            return self.CATEGORY_SPACE            
-        elif (64 < kpp_effect_type and kpp_effect_type <= 80):
-            return self.CATEGORY_CHORUS
-        elif (80 < kpp_effect_type and kpp_effect_type <= 95):
-            return self.CATEGORY_PHASER_FLANGER
-        elif (95 < kpp_effect_type and kpp_effect_type <= 110):
-            return self.CATEGORY_EQUALIZER
-        elif (110 < kpp_effect_type and kpp_effect_type <= 120):
-            return self.CATEGORY_BOOSTER
-        elif (120 < kpp_effect_type and kpp_effect_type <= 125):
-            return self.CATEGORY_LOOPER
-        elif (125 < kpp_effect_type and kpp_effect_type <= 135):
-            return self.CATEGORY_PITCH
-        elif (135 < kpp_effect_type and kpp_effect_type <= 143):
-            return self.CATEGORY_DUAL
-        elif (143 < kpp_effect_type and kpp_effect_type <= 170):
-            return self.CATEGORY_DELAY
-        else:
-            return self.CATEGORY_REVERB
+        if kpp_effect_type < _NUM_EFFECT_TYPES:
+            return _EFFECT_CATEGORIES[kpp_effect_type]
+        
+        return self.CATEGORY_REVERB
         
     # Must return the color for a category    
     def get_effect_category_color(self, category, kpp_effect_type):
@@ -153,15 +123,56 @@ class KemperEffectEnableCallback(EffectEnableCallback):
         if self.__text:
             return self.__text
         
+        name = None
         if self.__extended_type_names:
-            if kpp_effect_type in self.__extended_type_names:
-                name = self.__extended_type_names[kpp_effect_type]
-            else:
-                name = self.CATEGORY_NAMES[category]
-        else:
+            name = self.__extended_type_names.get(kpp_effect_type, None)
+
+        if not name:
             name = self.CATEGORY_NAMES[category]
 
         if self.__slot_name:
             return self.__slot_name + " " + name
         
-        return name
\ No newline at end of file
+        return name
+
+
+# Size of the effect category table. Types above are reverbs.
+_NUM_EFFECT_TYPES = const(256)
+
+# Builds the table to look up effect categories by Kemper effect type. Types not covered by the ranges 
+# are reverbs.
+#
+# NOTE: The ranges are defined by Kemper with a lot of unused numbers, so the borders between types
+# could need to be adjusted with future Kemper firmware updates!
+def _build_effect_categories():
+    ranges = (
+        # (first, last, category)
+        (0, 0, KemperEffectEnableCallback.CATEGORY_NONE),
+        (1, 10, KemperEffectEnableCallback.CATEGORY_WAH),
+        (11, 11, KemperEffectEnableCallback.CATEGORY_PITCH),
+        (12, 12, KemperEffectEnableCallback.CATEGORY_WAH),
+        (13, 13, KemperEffectEnableCallback.CATEGORY_PITCH),
+        (15, 45, KemperEffectEnableCallback.CATEGORY_DISTORTION),
+        (46, 55, KemperEffectEnableCallback.CATEGORY_COMPRESSOR),
+        (56, 60, KemperEffectEnableCallback.CATEGORY_NOISE_GATE),
+        (61, 64, KemperEffectEnableCallback.CATEGORY_SPACE),
+        (65, 80, KemperEffectEnableCallback.CATEGORY_CHORUS),
+        (81, 95, KemperEffectEnableCallback.CATEGORY_PHASER_FLANGER),
+        (96, 110, KemperEffectEnableCallback.CATEGORY_EQUALIZER),
+        (111, 120, KemperEffectEnableCallback.CATEGORY_BOOSTER),
+        (121, 125, KemperEffectEnableCallback.CATEGORY_LOOPER),
+        (126, 135, KemperEffectEnableCallback.CATEGORY_PITCH),
+        (136, 143, KemperEffectEnableCallback.CATEGORY_DUAL),
+        (144, 170, KemperEffectEnableCallback.CATEGORY_DELAY),
+    )
+
+    table = bytearray([KemperEffectEnableCallback.CATEGORY_REVERB]) * _NUM_EFFECT_TYPES
+
+    for first, last, category in ranges:
+        for i in range(first, last + 1):
+            table[i] = category
+
+    return table
+
+# Effect category by Kemper effect type
+_EFFECT_CATEGORIES = _build_effect_categories()
@@ -1,9 +1,11 @@
+from array import array
+
 from ....controller.actions import PushButtonAction
 from .effect_state import KemperEffectEnableCallback
 
 # Switch an effect slot on / off. This variant has distinct names for each effect type. 
 # 
-# <b>Use with care:</b> This takes quite some RAM memory, so if you run a large configuration you might run into memory allocation failures. In this case, just use the normal Effect State action instead.
+# The names are stored in a compact table taking about 1.2kB of RAM, which is shared by all instances.
 def EFFECT_STATE_EXT(slot_id, 
                      display = None, 
                      mode = PushButtonAction.HOLD_MOMENTARY,
@@ -30,113 +32,48 @@ def EFFECT_STATE_EXT(slot_id,
     })
 
 
-_EFFECT_TYPE_NAMES = {
-    0: "Empty",
-    1: "Wah",
-    2: "LP",
-    3: "HP",
-    4: "Vowel",
-    6: "Wah Ph",  
-    7: "Wah Fl",
-    8: "Wah RR",
-    9: "Ring",
-    10: "FShift",
-    11: "Pitch",
-    12: "Wah Form",
-    13: "VinylStp",
-    
-    17: "Bit Shp",
-    18: "Octa Shp",
-    19: "Soft Shp",
-    20: "Hard Shp",
-    21: "Wave Shp",
-    32: "KDrive",
-    33: "Green",
-    34: "Plus DS",
-    35: "One DS",
-    36: "Muff",
-    37: "Mouse",
-    38: "KFuzz",
-    39: "Metal DS",
-    42: "Full OC",
+# Effect type names, looked up by Kemper effect type from one string holding all names (separated by "|", 
+# in order of the effect types, empty for unused types) instead of a dict of separate strings, to save RAM.
+class _EffectTypeNames:
+    def __init__(self, names):
+        self.__names = names
 
-    49: "Comp",
-    50: "Swell",
-    57: "Gate 2:1",
-    58: "Gate 4:1",
-    64: "Space",
-    
-    65: "VChorus",
-    66: "HChorus",
-    67: "Air Ch.",
-    68: "Vibrato",
-    69: "Rotary",
-    70: "Tremolo",
-    71: "MPitch",
+        # Start offset of each name (the last entry marks the end)
+        self.__offsets = array("H", [0])
 
-    81: "Phaser",
-    82: "Vibe",
-    83: "Ph 1way",
-    89: "Flanger",
-    90: "Fl 1way",
- 
-    97: "Graphic",
-    98: "StudioEQ",
-    99: "MetalEQ",
-    100: "Acoustic",
-    101: "Wide",
-    102: "WidePh",
-    103: "WideDLY",
-    104: "Double",
+        pos = names.find("|")
+        while pos >= 0:
+            self.__offsets.append(pos + 1)
+            pos = names.find("|", pos + 1)
 
-    113: "Treble",
-    114: "Lead",
-    115: "Boost",
-    116: "WahBoost",
+        self.__offsets.append(len(names) + 1)
 
-    121: "Loop",  # Mono
-    122: "Loop",  # Stereo
-    123: "LoopDist",
+    # Returns the name for the effect type, or default if not defined
+    def get(self, kpp_effect_type, default = None):
+        if kpp_effect_type < 0 or kpp_effect_type >= len(self.__offsets) - 1:
+            return default
+        
+        start = self.__offsets[kpp_effect_type]
+        end = self.__offsets[kpp_effect_type + 1] - 1
 
-    129: "Transp",
-    130: "ChromPtch",
-    131: "HarmPtch",
-    132: "Octave",
+        if start == end:
+            return default
 
-    137: "DualChrom",
-    138: "DualHarm",
-    139: "DualCryst",
-    140: "DualLoop",
+        return self.__names[start:end]
 
-    145: "LDelay",    # Legacy Delay
-    146: "SDelay",    # Single
-    147: "DualDly",
-    148: "2TpDelay",
-    149: "S2TDelay",
-    150: "Crystal",
-    151: "LoopPitch",
-    152: "FShiftDly",
-    161: "RhDelay",
-    162: "MeloChr",
-    163: "MeloHarm",
-    164: "QuadDly",
-    165: "QuadChrm",
-    166: "QuadHarm",
-    
-    177: "LReverb",
-    178: "NatRev",
-    179: "EasyRev",
-    180: "Echo",
-    181: "Cirrus",
-    182: "FormRev",
-    183: "Sphere",
-    193: "Spring",
 
-    # Undocumented:
-    75: "Tremolo",
-    76: "HarmTrem",
-    77: "Pulse",
-    78: "Saw",
-    79: "PulsePan",
-    80: "SawPan"
-}
+_EFFECT_TYPE_NAMES = _EffectTypeNames(
+    "Empty|Wah|LP|HP|Vowel||Wah Ph|Wah Fl|Wah RR|Ring|FShift|Pitch|Wah Form|VinylStp|||"                               # 0..15
+    "|Bit Shp|Octa Shp|Soft Shp|Hard Shp|Wave Shp|||||||||||"                                                          # 16..31
+    "KDrive|Green|Plus DS|One DS|Muff|Mouse|KFuzz|Metal DS|||Full OC||||||"                                            # 32..47
+    "|Comp|Swell|||||||Gate 2:1|Gate 4:1||||||"                                                                        # 48..63
+    "Space|VChorus|HChorus|Air Ch.|Vibrato|Rotary|Tremolo|MPitch||||Tremolo|HarmTrem|Pulse|Saw|PulsePan|"              # 64..79 (75..80 undocumented)
+    "SawPan|Phaser|Vibe|Ph 1way||||||Flanger|Fl 1way||||||"                                                            # 80..95
+    "|Graphic|StudioEQ|MetalEQ|Acoustic|Wide|WidePh|WideDLY|Double||||||||"                                            # 96..111
+    "|Treble|Lead|Boost|WahBoost|||||Loop|Loop|LoopDist|||||"                                                          # 112..127 (121: Mono, 122: Stereo)
+    "|Transp|ChromPtch|HarmPtch|Octave|||||DualChrom|DualHarm|DualCryst|DualLoop||||"                                  # 128..143
+    "|LDelay|SDelay|DualDly|2TpDelay|S2TDelay|Crystal|LoopPitch|FShiftDly||||||||"                                     # 144..159 (145: Legacy, 146: Single)
+    "|RhDelay|MeloChr|MeloHarm|QuadDly|QuadChrm|QuadHarm||||||||||"                                                    # 160..175
+    "|LReverb|NatRev|EasyRev|Echo|Cirrus|FormRev|Sphere|||||||||"                                                      # 176..191
+    "|Spring"                                                                                                          # 192..193
+)
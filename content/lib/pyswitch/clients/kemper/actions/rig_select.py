@@ -27,7 +27,8 @@ def RIG_SELECT(rig,                                            # Rig to select.
                text = None,                                    # Text override (if no text callback is passed)
                auto_exclude_rigs = None,                       # If rig_off is "auto", this can be filled with a tuple or list of rigs to exclude from "remembering" when disabled
                rig_btn_morph = False,                          # If set True, second press will trigger toggling the internal morphing state (no command is sent, just the displays are toggled). Only if no rig_off or bank_off are specified.
-               momentary_morph = False                         # If set true, the simulated morph state will operate in momentary mode. Use this if you have use momentary morph mode in your rigs.
+               momentary_morph = False,                        # If set true, the simulated morph state will operate in momentary mode. Use this if you have use momentary morph mode in your rigs.
+               rig_names = False                               # If set True, the rig name is shown instead of the rig ID if known (if no text or text callback is passed). Rig names are cached while the rigs are visited.
     ):
     
     # Finally we can create the action definition ;)
@@ -48,7 +49,8 @@ def RIG_SELECT(rig,                                            # Rig to select.
             text_callback = text_callback,
             auto_exclude_rigs = auto_exclude_rigs,
             rig_btn_morph = rig_btn_morph,
-            momentary_morph = momentary_morph
+            momentary_morph = momentary_morph,
+            rig_names = rig_names
         ),
         "enableCallback": enable_callback
     })  
@@ -67,7 +69,8 @@ class _KemperRigSelectCallback(Callback):
                  text_callback,
                  auto_exclude_rigs = None,
                  rig_btn_morph = False,
-                 momentary_morph = False
+                 momentary_morph = False,
+                 rig_names = False
         ):
         
         super().__init__()
@@ -99,6 +102,7 @@ class _KemperRigSelectCallback(Callback):
         self.__auto_exclude_rigs = auto_exclude_rigs
         self.__rig_btn_morph = rig_btn_morph
         self.__momentary_morph = momentary_morph
+        self.__rig_names = rig_names
 
         self.__last_blink_state = None
         self.__sent_rig_mapping = None
@@ -131,6 +135,12 @@ class _KemperRigSelectCallback(Callback):
 
         self.__appl = appl
 
+        if self.__rig_names:
+            from ..rig_name_cache import KemperRigNameCache
+
+            self.__rig_name_cache = KemperRigNameCache.get(appl)
+            self.__rig_name_cache.add_listener(self)
+
     def reset(self):
         if self.action.enabled:
             self.update_displays()
@@ -324,6 +334,11 @@ class _KemperRigSelectCallback(Callback):
         
         if self.__text:
             return self.__text
+        
+        if self.__rig_names:
+            name = self.__rig_name_cache.name(bank, rig)
+            if name:
+                return name
             
         return f"Rig { repr(bank + 1) }-{ repr(rig + 1) }"
     
\ No newline at end of file
@@ -12,6 +12,9 @@ _NRPN_STRING_PARAMETER_ID_AMP_NAME = const(0x10)
 
 # Amp name (request only)
 def MAPPING_AMP_NAME(): 
+    return ClientParameterMapping.get_keyed(_create_amp_name)
+
+def _create_amp_name():
     return ClientParameterMapping.get(
         depends = KemperMappings.RIG_DATE(),
         name = "Amp Name",
@@ -30,6 +33,9 @@ def MAPPING_AMP_NAME():
 
 # Amp on/off
 def MAPPING_AMP_STATE(): 
+    return ClientParameterMapping.get_keyed(_create_amp_state)
+
+def _create_amp_state():
     return ClientParameterMapping.get(
         name = "Amp State",
         set = KemperNRPNMessage(
@@ -51,6 +57,9 @@ def MAPPING_AMP_STATE():
 
 # Amp gain
 def MAPPING_AMP_GAIN(): 
+    return ClientParameterMapping.get_keyed(_create_amp_gain)
+
+def _create_amp_gain():
     return ClientParameterMapping.get(
         name = "Gain",
         set = KemperNRPNMessage(
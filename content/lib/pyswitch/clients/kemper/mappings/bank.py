@@ -10,6 +10,9 @@ _CC_RIG_INDEX_PART_1 = const(32) # The second part will be sent as program chang
 
 
 def MAPPING_NEXT_BANK(): 
+    return ClientTwoPartParameterMapping.get_keyed(_create_next_bank)
+
+def _create_next_bank():
     return ClientTwoPartParameterMapping.get(
         name = "Next Bank",
         set = ControlChange(
@@ -24,10 +27,14 @@ def MAPPING_NEXT_BANK():
             ProgramChange(
                 0    # Dummy value, will be ignored
             )
-        ]
+        ],
+        persist = True
     )
 
 def MAPPING_PREVIOUS_BANK():
+    return ClientTwoPartParameterMapping.get_keyed(_create_previous_bank)
+
+def _create_previous_bank():
     return ClientTwoPartParameterMapping.get(
         name = "Prev Bank",
         set = ControlChange(
@@ -42,5 +49,6 @@ def MAPPING_PREVIOUS_BANK():
             ProgramChange(
                 0    # Dummy value, will be ignored
             )
-        ]
+        ],
+        persist = True
     )
\ No newline at end of file
@@ -9,6 +9,9 @@ _NRPN_STRING_PARAMETER_ID_CABINET_NAME = const(0x20)
 
 # Cab name (request only)
 def MAPPING_CABINET_NAME(): 
+    return ClientParameterMapping.get_keyed(_create_cabinet_name)
+
+def _create_cabinet_name():
     return ClientParameterMapping.get(
         depends = KemperMappings.RIG_DATE(),
         name = "Cab Name",
@@ -27,6 +30,9 @@ def MAPPING_CABINET_NAME():
 
 # Cab on/off
 def MAPPING_CABINET_STATE(): 
+    return ClientParameterMapping.get_keyed(_create_cabinet_state)
+
+def _create_cabinet_state():
     return ClientParameterMapping.get(
         name = "Cab State",
         set = KemperNRPNMessage(
@@ -13,6 +13,9 @@ _NRPN_EFFECT_PARAMETER_ADDRESS_MIX_DLY_REV = const(0x45)  # 69
 
 # Effect Button I-IIII (set only). num must be a number (1 to 4).
 def MAPPING_EFFECT_BUTTON(num): 
+    return ClientParameterMapping.get_keyed(_create_effect_button, num)
+
+def _create_effect_button(num):
     return ClientParameterMapping.get(
         name = f"Effect Button { repr(num) }",
         set = ControlChange(
@@ -23,6 +26,9 @@ def MAPPING_EFFECT_BUTTON(num):
 
 
 def MAPPING_DLY_REV_MIX(slot_id):
+    return ClientParameterMapping.get_keyed(_create_dly_rev_mix, slot_id)
+
+def _create_dly_rev_mix(slot_id):
     return ClientParameterMapping.get(
         name = f"Mix { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
         set = KemperNRPNMessage(
@@ -41,6 +41,10 @@ def MAPPING_FIXED_DBL_TRACKER():
 
 # Common definition shared by all fixed fx mappings
 def _MAPPING_FIXED(name, param):
+    return ClientParameterMapping.get_keyed(_create_fixed, (name, param))
+
+def _create_fixed(key):
+    name, param = key
     return ClientParameterMapping.get(
         name = name,
         set = KemperNRPNMessage(
@@ -12,6 +12,9 @@ _NRPN_ADDRESS_PAGE_FREEZE = const(0x7d)
 
 # Freeze for slots
 def MAPPING_FREEZE(slot_id):
+    return ClientParameterMapping.get_keyed(_create_freeze, slot_id)
+
+def _create_freeze(slot_id):
     return ClientParameterMapping.get(
         name = f"Freeze { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
         set = KemperNRPNMessage(
@@ -33,6 +36,9 @@ def MAPPING_FREEZE(slot_id):
 
 # Freeze (global) for all reverb and delay modules (no feedback from kemper!)
 def MAPPING_FREEZE_ALL_GLOBAL():
+    return ClientParameterMapping.get_keyed(_create_freeze_all_global)
+
+def _create_freeze_all_global():
     return ClientParameterMapping.get(
         name = "Freeze",
         set = ControlChange(
@@ -15,6 +15,9 @@ _NRPN_LOOPER_PARAMETER_ERASE = const(94)
 
 
 def MAPPING_LOOPER_REC_PLAY_OVERDUB():
+    return ClientParameterMapping.get_keyed(_create_looper_rec_play_overdub)
+
+def _create_looper_rec_play_overdub():
     return ClientParameterMapping.get(
         name = "LoopRec",
         set = KemperNRPNMessage(
@@ -25,6 +28,9 @@ def MAPPING_LOOPER_REC_PLAY_OVERDUB():
     )
 
 def MAPPING_LOOPER_STOP():
+    return ClientParameterMapping.get_keyed(_create_looper_stop)
+
+def _create_looper_stop():
     return ClientParameterMapping.get(
         name = "LoopStop",
         set = KemperNRPNMessage(
@@ -35,6 +41,9 @@ def MAPPING_LOOPER_STOP():
     )
 
 def MAPPING_LOOPER_TRIGGER():
+    return ClientParameterMapping.get_keyed(_create_looper_trigger)
+
+def _create_looper_trigger():
     return ClientParameterMapping.get(
         name = "LoopTrig",
         set = KemperNRPNMessage(
@@ -45,6 +54,9 @@ def MAPPING_LOOPER_TRIGGER():
     )
 
 def MAPPING_LOOPER_REVERSE():
+    return ClientParameterMapping.get_keyed(_create_looper_reverse)
+
+def _create_looper_reverse():
     return ClientParameterMapping.get(
         name = "LoopRev",
         set = KemperNRPNMessage(
@@ -55,6 +67,9 @@ def MAPPING_LOOPER_REVERSE():
     )
 
 def MAPPING_LOOPER_HALF_SPEED():
+    return ClientParameterMapping.get_keyed(_create_looper_half_speed)
+
+def _create_looper_half_speed():
     return ClientParameterMapping.get(
         name = "Loop1/2",
         set = KemperNRPNMessage(
@@ -65,6 +80,9 @@ def MAPPING_LOOPER_HALF_SPEED():
     )
 
 def MAPPING_LOOPER_CANCEL():
+    return ClientParameterMapping.get_keyed(_create_looper_cancel)
+
+def _create_looper_cancel():
     return ClientParameterMapping.get(
         name = "LoopCanc",
         set = KemperNRPNMessage(
@@ -75,6 +93,9 @@ def MAPPING_LOOPER_CANCEL():
     )
 
 def MAPPING_LOOPER_ERASE():
+    return ClientParameterMapping.get_keyed(_create_looper_erase)
+
+def _create_looper_erase():
     return ClientParameterMapping.get(
         name = "LoopErase",
         set = KemperNRPNMessage(
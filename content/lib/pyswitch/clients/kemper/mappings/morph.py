@@ -11,6 +11,9 @@ _CC_MORPH_BUTTON = const(80)                     # Also includes ride/fall times
 _NRPN_ADDRESS_PAGE_ZERO = const(0x00)            # As of the notes of sumsar
 
 def MAPPING_MORPH_BUTTON(): 
+    return ClientParameterMapping.get_keyed(_create_morph_button)
+
+def _create_morph_button():
     return ClientParameterMapping.get(
         name = "Morph Button",
         set = ControlChange(
@@ -30,6 +33,9 @@ def MAPPING_MORPH_BUTTON():
     )
 
 def MAPPING_MORPH_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_morph_pedal)
+
+def _create_morph_pedal():
     return ClientParameterMapping.get(
         name = "Morph",
         set = ControlChange(
@@ -16,6 +16,9 @@ _CC_OUTPUT_VOLUME = const(73)
 
 
 def MAPPING_WAH_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_wah_pedal)
+
+def _create_wah_pedal():
     return ClientParameterMapping.get(
         name = "Wah",
         set = ControlChange(
@@ -25,6 +28,9 @@ def MAPPING_WAH_PEDAL():
     )
 
 def MAPPING_VOLUME_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_volume_pedal)
+
+def _create_volume_pedal():
     return ClientParameterMapping.get(
         name = "Vol",
         set = ControlChange(
@@ -34,6 +40,9 @@ def MAPPING_VOLUME_PEDAL():
     )
 
 def MAPPING_PITCH_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_pitch_pedal)
+
+def _create_pitch_pedal():
     return ClientParameterMapping.get(
         name = "Pitch",
         set = ControlChange(
@@ -43,6 +52,9 @@ def MAPPING_PITCH_PEDAL():
     )
 
 def MAPPING_DELAY_MIX_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_delay_mix_pedal)
+
+def _create_delay_mix_pedal():
     return ClientParameterMapping.get(
         name = "DlMix",
         set = ControlChange(
@@ -52,6 +64,9 @@ def MAPPING_DELAY_MIX_PEDAL():
     )
 
 def MAPPING_DELAY_FEEDBACK_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_delay_feedback_pedal)
+
+def _create_delay_feedback_pedal():
     return ClientParameterMapping.get(
         name = "Feed",
         set = ControlChange(
@@ -61,6 +76,9 @@ def MAPPING_DELAY_FEEDBACK_PEDAL():
     )
 
 def MAPPING_REVERB_MIX_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_reverb_mix_pedal)
+
+def _create_reverb_mix_pedal():
     return ClientParameterMapping.get(
         name = "RvMix",
         set = ControlChange(
@@ -70,6 +88,9 @@ def MAPPING_REVERB_MIX_PEDAL():
     )
 
 def MAPPING_REVERB_TIME_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_reverb_time_pedal)
+
+def _create_reverb_time_pedal():
     return ClientParameterMapping.get(
         name = "RvTime",
         set = ControlChange(
@@ -79,6 +100,9 @@ def MAPPING_REVERB_TIME_PEDAL():
     )
 
 def MAPPING_VOLUME_OUTPUT_PEDAL(): 
+    return ClientParameterMapping.get_keyed(_create_volume_output_pedal)
+
+def _create_volume_output_pedal():
     return ClientParameterMapping.get(
         name = "OutVol",
         set = ControlChange(
@@ -12,6 +12,9 @@ _NRPN_STRING_PARAMETER_ID_RIG_COMMENT = const(0x04)
 
 # Rig comment (request only)
 def MAPPING_RIG_COMMENT(): 
+    return ClientParameterMapping.get_keyed(_create_rig_comment)
+
+def _create_rig_comment():
     return ClientParameterMapping.get(
         depends = KemperMappings.RIG_DATE(),
         name = "Rig Comment",
@@ -30,6 +33,9 @@ def MAPPING_RIG_COMMENT():
 
 # Rig volume
 def MAPPING_RIG_VOLUME(): 
+    return ClientParameterMapping.get_keyed(_create_rig_volume)
+
+def _create_rig_volume():
     return ClientParameterMapping.get(
         name = "RigVol",
         set = KemperNRPNMessage(
@@ -51,6 +57,9 @@ def MAPPING_RIG_VOLUME():
 
 # Rig transpose
 def MAPPING_RIG_TRANSPOSE(): 
+    return ClientParameterMapping.get_keyed(_create_rig_transpose)
+
+def _create_rig_transpose():
     return ClientParameterMapping.get(
         name = "RigTrans",
         set = KemperNRPNMessage(
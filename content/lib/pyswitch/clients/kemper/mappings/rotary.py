@@ -10,6 +10,9 @@ _NRPN_EFFECT_PARAMETER_ADDRESS_ROTARY_SPEED = const(0x1e)  # 30
 
 # Rotary speed (fast/slow)
 def MAPPING_ROTARY_SPEED(slot_id):
+    return ClientParameterMapping.get_keyed(_create_rotary_speed, slot_id)
+
+def _create_rotary_speed(slot_id):
     return ClientParameterMapping.get(
         name = f"Rot. Speed { KemperEffectSlot.EFFECT_SLOT_NAME[slot_id] }",
         set = KemperNRPNMessage(
@@ -11,6 +11,9 @@ _CC_RIG_INDEX_PART_1 = const(32) # The second part will be sent as program chang
 
 # Selects a rig of the current bank. Rig index must be in range [0..4]
 def MAPPING_RIG_SELECT(rig):
+    return ClientTwoPartParameterMapping.get_keyed(_create_rig_select, rig)
+
+def _create_rig_select(rig):
     return ClientTwoPartParameterMapping.get(
         f"Select Rig { str(rig + 1) }",
         set = ControlChange(
@@ -31,6 +34,9 @@ def MAPPING_RIG_SELECT(rig):
 
 # Pre-selects a bank.
 def MAPPING_BANK_SELECT():
+    return ClientTwoPartParameterMapping.get_keyed(_create_bank_select)
+
+def _create_bank_select():
     return ClientTwoPartParameterMapping.get(
         name = "Select Bank",
         set = ControlChange(
@@ -12,6 +12,9 @@ _NRPN_SYS_PARAMETER_SPACE_INTENSITY = const(36)
 
 # Main volume
 def MAPPING_MAIN_VOLUME(): 
+    return ClientParameterMapping.get_keyed(_create_main_volume)
+
+def _create_main_volume():
     return ClientParameterMapping.get(
         name = "MainVol",
         set = KemperNRPNMessage(
@@ -33,6 +36,9 @@ def MAPPING_MAIN_VOLUME():
 
 # Monitor volume
 def MAPPING_MONITOR_VOLUME(): 
+    return ClientParameterMapping.get_keyed(_create_monitor_volume)
+
+def _create_monitor_volume():
     return ClientParameterMapping.get(
         name = "MonVol",
         set = KemperNRPNMessage(
@@ -54,6 +60,9 @@ def MAPPING_MONITOR_VOLUME():
 
 # Looper volume
 def MAPPING_LOOPER_VOLUME(): 
+    return ClientParameterMapping.get_keyed(_create_looper_volume)
+
+def _create_looper_volume():
     return ClientParameterMapping.get(
         name = "LoopVol",
         set = KemperNRPNMessage(
@@ -75,6 +84,9 @@ def MAPPING_LOOPER_VOLUME():
 
 # Space Intensity
 def MAPPING_SPACE_INTENSITY():
+    return ClientParameterMapping.get_keyed(_create_space_intensity)
+
+def _create_space_intensity():
     return ClientParameterMapping.get(
         name = "SpaceInt",
         set = KemperNRPNMessage(
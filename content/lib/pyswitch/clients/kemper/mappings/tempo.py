@@ -8,6 +8,9 @@ _CC_TAP_TEMPO = const(30)
 
 # Switch tuner mode on/off (no receive possible!)
 def MAPPING_TAP_TEMPO(): 
+    return ClientParameterMapping.get_keyed(_create_tap_tempo)
+
+def _create_tap_tempo():
     return ClientParameterMapping.get(
         name = "Tap Tempo",
         set = ControlChange(
@@ -17,6 +20,9 @@ def MAPPING_TAP_TEMPO():
     )
 
 def MAPPING_TEMPO_DISPLAY():
+    return ClientParameterMapping.get_keyed(_create_tempo_display)
+
+def _create_tempo_display():
     return ClientParameterMapping.get(
         name = "Tempo Pulse",
         response = KemperNRPNExtendedMessage(
@@ -26,7 +32,8 @@ def MAPPING_TEMPO_DISPLAY():
                 0x00,
                 0x00
             ]
-        )
+        ),
+        notify_always = True
     )
 
 # MIDI Clock message, sent 24x every beat
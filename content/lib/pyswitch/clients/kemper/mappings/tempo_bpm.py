@@ -9,6 +9,9 @@ _NRPN_PARAMETER_ID_BPM = 0x00
 
 # Tempo (BPM value)
 def MAPPING_TEMPO_BPM():
+    return ClientParameterMapping.get_keyed(_create_tempo_bpm)
+
+def _create_tempo_bpm():
     return ClientParameterMapping.get(
         name = "BPM",
         set = KemperNRPNMessage(
@@ -0,0 +1,137 @@
+from micropython import const
+from gc import mem_free
+
+from . import KemperMappings, NUM_RIGS_PER_BANK, NUM_BANKS
+from ...controller.callbacks import Callback
+from ...misc import get_current_millis
+
+# Estimated memory usage of one cache entry (name string, date, tuple and index)
+_ENTRY_BYTES = const(128)
+
+# Share of the free memory (at initialization) the cache may use at most (1 / x)
+_MEMORY_SHARE = const(8)
+
+
+# Cache for the names of rigs, by rig ID (bank * NUM_RIGS_PER_BANK + rig). This is used to show rig names
+# on target rig labels (RIG_SELECT with display_mode = RIG_SELECT_DISPLAY_TARGET_RIG, or BANK_UP/BANK_DOWN
+# with preselect), without having to wait for the device.
+#
+# The Kemper devices only report the name of the current rig, so the cache is filled while rigs are visited:
+# Whenever the rig ID, name or date have been stable for settle_millis, the current name is stored. Entries
+# are invalidated by the rig date: If the date of a rig has changed (rig has been saved), its name is replaced.
+# The least recently used entries are evicted when the cache is full.
+#
+# Use KemperRigNameCache.get(appl) to get the instance shared by all actions.
+class KemperRigNameCache(Callback):
+
+    # size:           Maximum amount of rigs cached. If None, the size is derived from the memory available.
+    # settle_millis:  Time the rig ID, name and date must be stable before the name is stored. This prevents
+    #                 storing a name for the wrong rig while a rig change is in progress.
+    def __init__(self, size = None, settle_millis = 500):
+        self.__mapping_id = KemperMappings.RIG_ID()
+        self.__mapping_name = KemperMappings.RIG_NAME()
+        self.__mapping_date = KemperMappings.RIG_DATE()
+
+        super().__init__(mappings = [
+            self.__mapping_id,
+            self.__mapping_name,
+            self.__mapping_date
+        ])
+
+        if size == None:
+            size = mem_free() // _MEMORY_SHARE // _ENTRY_BYTES
+
+        self.size = min(max(size, NUM_RIGS_PER_BANK), NUM_BANKS * NUM_RIGS_PER_BANK)
+        self.__settle = settle_millis
+
+        # Entries by rig ID: (name, date), and rig IDs in order of usage (least recently used first)
+        self.__entries = {}
+        self.__order = []
+
+        self.__changed_since = 0
+        self.__listeners = []
+
+    # Returns the shared instance for the application, creates and initializes it if not existing.
+    @staticmethod
+    def get(appl):
+        if not "rigNameCache" in appl.shared:
+            cache = KemperRigNameCache()
+            cache.init(appl)
+
+            appl.shared["rigNameCache"] = cache
+
+        return appl.shared["rigNameCache"]
+
+    # Adds a listener which is notified (parameter_changed) when a name has been stored.
+    def add_listener(self, listener):
+        self.__listeners.append(listener)
+
+    # Returns the cached name for the given bank and rig (both starting from 0), or None if not known.
+    def name(self, bank, rig):
+        rig_id = bank * NUM_RIGS_PER_BANK + rig
+
+        entry = self.__entries.get(rig_id, None)
+        if not entry:
+            return None
+
+        self.__touch(rig_id)
+        return entry[0]
+
+    # Number of cached rig names
+    def __len__(self):
+        return len(self.__entries)
+
+    def parameter_changed(self, mapping):
+        self.__changed_since = get_current_millis()
+
+    def request_terminated(self, mapping):
+        self.__changed_since = 0
+
+    def update(self):
+        super().update()
+
+        if not self.__changed_since:
+            return
+
+        if get_current_millis() - self.__changed_since < self.__settle:
+            return
+
+        self.__changed_since = 0
+        self.__store()
+
+    # Stores the name of the current rig
+    def __store(self):
+        rig_id = self.__mapping_id.value
+        name = self.__mapping_name.value
+        date = self.__mapping_date.value
+
+        if rig_id == None or name == None or date == None:
+            return
+
+        entry = self.__entries.get(rig_id, None)
+        if entry and entry[0] == name and entry[1] == date:
+            self.__touch(rig_id)
+            return
+
+        # New or outdated
+        self.__entries[rig_id] = (name, date)
+        self.__touch(rig_id)
+
+        # Evict least recently used entries
+        while len(self.__order) > self.size:
+            del self.__entries[self.__order.pop(0)]
+
+        for listener in self.__listeners:
+            listener.parameter_changed(self.__mapping_name)
+
+    # Marks the rig ID as most recently used
+    def __touch(self, rig_id):
+        order = self.__order
+
+        if order and order[-1] == rig_id:
+            return
+
+        if rig_id in order:
+            order.remove(rig_id)
+
+        order.append(rig_id)
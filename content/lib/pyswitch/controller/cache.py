@@ -0,0 +1,149 @@
+from ..misc import Updateable, get_current_millis, do_print
+
+# Snapshot of the last known mapping values, persisted on flash so the values can be shown directly after
+# booting, before the client device has answered. Restored values are marked as stale (see ClientParameterMapping)
+# until a live value has been received.
+#
+# Writes are debounced and limited in frequency to save flash wear, and the file is only written when the values
+# differ from the last written snapshot. The file system must be writable for the firmware, which boot.py sets
+# up when the USB drive is not mounted (if not, the cache is only read).
+class ValueCache(Updateable):
+
+    # path:                       File path of the snapshot
+    # write_delay_millis:         Time a changed value has to be stable before writing (debouncing)
+    # min_write_interval_millis:  Minimum time between two writes
+    # check_interval_millis:      Interval to check the watched mappings for changes
+    def __init__(self, path = "/.pyswitch_values", write_delay_millis = 5000, min_write_interval_millis = 60000, check_interval_millis = 1000):
+        self.update_interval_millis = check_interval_millis
+
+        self.path = path
+        self.__write_delay = write_delay_millis
+        self.__min_write_interval = min_write_interval_millis
+
+        # Watched mappings by name, and listeners to notify on restore (lists of tuples)
+        self.__mappings = {}
+        self.__listeners = []
+
+        # Values as on flash
+        self.__stored = {}
+
+        self.__changed_since = 0
+        self.__last_write = 0
+        self.__writable = True
+
+        self.num_writes = 0
+
+        self.__load()
+
+    # Read the snapshot from flash
+    def __load(self):
+        try:
+            from json import load
+
+            with open(self.path, "r") as f:
+                stored = load(f)
+
+            if isinstance(stored, dict):
+                self.__stored = stored
+
+        except (OSError, ValueError):
+            # No or invalid snapshot
+            pass
+
+    # Adds a mapping to the cache if it has the persist flag set. The listener will be notified when the value is restored.
+    def watch(self, mapping, listener = None):
+        # Only mappings with string names can be persisted. Mappings notifying about every value (tuner, tempo) are 
+        # never persisted, as this would write the snapshot permanently.
+        if not mapping.persist or mapping.notify_always or not isinstance(mapping.name, str):
+            return
+
+        self.__mappings[mapping.name] = mapping
+
+        if listener:
+            self.__listeners.append((mapping, listener))
+
+    # Sets the stored values on all watched mappings which have no value yet, and notifies the listeners.
+    # Restored mappings are marked stale.
+    def restore(self):
+        stored = self.__stored
+
+        for name, mapping in self.__mappings.items():
+            if mapping.value != None or not name in stored:
+                continue
+
+            mapping.value = stored[name]
+            mapping.stale = True
+
+        for mapping, listener in self.__listeners:
+            if mapping.stale:
+                listener.parameter_changed(mapping)
+
+    # Checks for changed values and writes the snapshot if due
+    def update(self):
+        stored = self.__stored
+        now = get_current_millis()
+
+        changed = False
+        for name, mapping in self.__mappings.items():
+            # Stale values are the stored ones anyway
+            if mapping.stale:
+                continue
+
+            value = mapping.value
+            if not isinstance(value, (int, str)):
+                continue
+
+            if stored.get(name, None) != value:
+                changed = True
+                break
+
+        if not changed:
+            self.__changed_since = 0
+            return
+
+        if not self.__changed_since:
+            self.__changed_since = now
+            return
+
+        # Debounce
+        if now - self.__changed_since < self.__write_delay:
+            return
+
+        # Limit write frequency
+        if self.__last_write and now - self.__last_write < self.__min_write_interval:
+            return
+
+        self.__write()
+
+        self.__changed_since = 0
+        self.__last_write = now
+
+    # Writes the current values to flash
+    def __write(self):
+        if not self.__writable:
+            return
+
+        snapshot = {}
+
+        # Keep stored values of mappings not known (yet)
+        for name, value in self.__stored.items():
+            snapshot[name] = value
+
+        for name, mapping in self.__mappings.items():
+            value = mapping.value
+            if not mapping.stale and isinstance(value, (int, str)):
+                snapshot[name] = value
+
+        try:
+            from json import dump
+
+            with open(self.path, "w") as f:
+                dump(snapshot, f)
+
+            self.__stored = snapshot
+            self.num_writes += 1
+
+        except OSError:
+            # File system is read-only (USB drive mounted)
+            do_print("Value cache: File system not writable")
+            self.__writable = False
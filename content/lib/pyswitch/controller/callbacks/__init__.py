@@ -31,6 +31,10 @@ class Callback(Updateable):
         for m in self.__mappings:
             self.__appl.client.register(m, self)
 
+        # Callbacks can be scheduled with an own interval (see Controller.add_updateable)
+        if not self.update_interval_millis:
+            self.update_interval_millis = get_option(appl.config, "callbackUpdateInterval", None)
+
         self.__appl.add_updateable(self)
 
         self.__initialized = True
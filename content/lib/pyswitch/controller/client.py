@@ -1,26 +1,97 @@
-from math import floor
 from micropython import const
-from ..misc import EventEmitter, PeriodCounter, Updateable, get_option, do_print
+from ..misc import EventEmitter, Fifo, PeriodCounter, Updateable, get_option, do_print, get_current_millis
 
 from adafruit_midi.control_change import ControlChange
 from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.program_change import ProgramChange
 
+from .midi import EncodedSystemExclusive
+
+
+# Dispatch keys for program change messages (control change keys are in range [-128..-1], SysEx keys are positive)
+_DISPATCH_KEY_PROGRAM_CHANGE = const(-129)
+
+# Returns a cheap integer key for a MIDI message, used to dispatch incoming messages only to the requests
+# whose response templates can match. Returns None for messages which cannot be dispatched.
+def get_dispatch_key(midi_message):
+    if isinstance(midi_message, SystemExclusive):
+        # Function code, instance ID, address page and address number (see ClientParameterMapping.parse_against()).
+        # The leading 1 encodes the length, so keys of different lengths do not collide.
+        data = midi_message.data
+        end = len(data) if len(data) < 6 else 6
+        
+        key = 1
+        for i in range(2, end):
+            key = (key << 8) | data[i]
+
+        return key
+    
+    elif isinstance(midi_message, ControlChange):
+        return -1 - midi_message.control
+    
+    elif isinstance(midi_message, ProgramChange):
+        return _DISPATCH_KEY_PROGRAM_CHANGE
+
+    return None
+
+
+# Precompiled matcher for a SysEx response template, built once per template. Checks if a message belongs to the
+# template without slicing the message data. The address (function code, instance ID, 
+# address page and address number, see ClientParameterMapping.parse_against()) is stored as separate integers.
+class SysexMatcher:
+    def __init__(self, response):
+        self.response = response
+        self.manufacturer_id = response.manufacturer_id
+
+        data = response.data
+
+        # Templates shorter than 6 bytes are rare, these are compared by slicing
+        self.__short = len(data) < 6
+        if self.__short:
+            self.__address = data[2:6]
+            return
+        
+        self.__a2 = data[2]
+        self.__a3 = data[3]
+        self.__a4 = data[4]
+        self.__a5 = data[5]
+
+    # Returns if the message matches the template
+    def matches(self, midi_message):
+        if midi_message.manufacturer_id != self.manufacturer_id:
+            return False
+        
+        data = midi_message.data
+
+        if self.__short:
+            return data[2:6] == self.__address
+        
+        return (len(data) >= 6 and 
+                data[5] == self.__a5 and 
+                data[4] == self.__a4 and 
+                data[3] == self.__a3 and 
+                data[2] == self.__a2)
+    
+    # Decodes the string value of a matching message (only the resulting string is allocated)
+    def decode_string(self, midi_message):
+        return str(memoryview(midi_message.data)[6:-1], "latin-1")
+
 
 # Midi mapping for a client command. Contains commands to set or request a parameter
 class ClientParameterMapping:
     
-    _mappings = []
+    _mappings = {}    # Mappings by name
+    _registry = {}    # Mappings by factory and key (see get_keyed())
 
     # Singleton factory
     @staticmethod
-    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None, notify_always = False, persist = False):
         if not name:
             raise Exception() # You must provide an unique name!
         
-        for m in ClientParameterMapping._mappings:
-            if m.name == name:
-                return m
+        m = ClientParameterMapping._mappings.get(name, None)
+        if m:
+            return m
             
         m = ClientParameterMapping(
             name = name,
@@ -30,10 +101,28 @@ class ClientParameterMapping:
             response = response,
             value = value,
             type = type,
-            depends = depends
+            depends = depends,
+            notify_always = notify_always,
+            persist = persist
         )
 
-        ClientParameterMapping._mappings.append(m)
+        ClientParameterMapping._mappings[name] = m
+        return m
+    
+    # Keyed singleton factory: Returns the mapping created by factory(key), or factory() if no key is passed. The factory
+    # is only called once per key: Later calls are just dict lookups, so no MIDI messages or names are created 
+    # (which would be thrown away by get() anyway). The key must be cheap to hash, for example an int or a tuple.
+    # Works for all mapping classes, as the factory is responsible for creating the mapping.
+    @staticmethod
+    def get_keyed(factory, key = None):
+        mappings = ClientParameterMapping._registry.get(factory, None)
+        if mappings == None:
+            mappings = ClientParameterMapping._registry[factory] = {}
+
+        m = mappings.get(key, None)
+        if m == None:
+            m = mappings[key] = factory() if key == None else factory(key)
+
         return m
             
     ##########################################################################################################################
@@ -43,7 +132,7 @@ class ClientParameterMapping:
     PARAMETER_TYPE_STRING = const(1)
 
     # Takes MIDI messages as argument (ControlChange or SystemExclusive)
-    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None, notify_always = False, persist = False):
         if create_key != ClientParameterMapping:
             raise Exception() # Use the get method exclusively to create mappings!
         
@@ -54,8 +143,25 @@ class ClientParameterMapping:
         self.value = value        # Value of the parameter (buffer). After receiving an answer, the value 
                                   # is buffered here.
         self.type = type          # Numeric or string
-        self.depends = depends    # If another mapping is set here, this mapping will only be requested when the dependency has changed value
-                                  # NOTE: In 2.4.1, this is prepared but not realized already
+        self.depends = depends    # If another mapping is set here, this mapping will only be requested when the dependency has changed value. 
+                                  # Dependencies can have dependencies themselves.
+        self.notify_always = notify_always  # If True, listeners are notified about every received value, even if it has not changed 
+                                            # (for example for the tuner or tempo display)
+        self.persist = persist    # If True, the value is stored in the value cache (see ValueCache) and restored on the next boot. Only
+                                  # use this for values which are displayed permanently, like rig names or effect states.
+
+        # Last notified value and the listeners which have been notified about it (used by ClientRequest to 
+        # only notify about changes). Values are compared by equality, so parse() must not change them in place.
+        self.notified_value = None
+        self.notified_listeners = []
+
+        # True if the value has been restored from the value cache and not confirmed by the client device yet
+        self.stale = False
+
+        # Compiled SysEx matchers (see SysexMatcher), created on first use for each response template. 
+        # The last used one is buffered separately.
+        self.__matchers = []
+        self.__matcher = None
 
     # Parse the incoming MIDI message and set its value on the mapping.
     # If the response template does not match, returns False, and
@@ -74,12 +180,8 @@ class ClientParameterMapping:
         if isinstance(midi_message, SystemExclusive):
             if not isinstance(response, SystemExclusive):
                 return None
-                     
-            # Compare manufacturer IDs
-            if midi_message.manufacturer_id != response.manufacturer_id:
-                return None
             
-            # Check if the message belongs to the mapping. The following have to match:
+            # Check if the message belongs to the mapping. The manufacturer IDs and the following have to match:
             #   2: function code, 
             #   3: instance ID, 
             #   4: address page, 
@@ -87,16 +189,21 @@ class ClientParameterMapping:
             #
             # The first two values are ignored (the Kemper MIDI specification implies this would contain the product type
             # and device ID as for the request, however the device just sends two zeroes)
-            if midi_message.data[2:6] != response.data[2:6]:
+            matcher = self.__matcher
+            if not matcher or matcher.response is not response:
+                matcher = self.__matcher = self.__get_matcher(response)
+
+            if not matcher.matches(midi_message):
                 return None
             
             # The values starting from index 6 are the value of the response.
             if self.type == self.PARAMETER_TYPE_STRING:
                 # Take as string
-                return ''.join(chr(int(c)) for c in list(midi_message.data[6:-1]))
+                return matcher.decode_string(midi_message)
             else:
                 # Decode 14-bit value to int
-                return midi_message.data[-2] * 128 + midi_message.data[-1]
+                data = midi_message.data
+                return data[-2] * 128 + data[-1]
 
         # CC Messages
         elif isinstance(midi_message, ControlChange):
@@ -137,14 +244,16 @@ class ClientParameterMapping:
 
         return None
     
-    # Set the passed value(s) on the SET message(s) of the mapping.
+    # Set the passed value(s) on the SET message(s) of the mapping. SysEx messages are replaced by pre-encoded ones
+    # on the first call (see EncodedSystemExclusive).
     def set_value(self, value):
         if isinstance(self.set, list):
             for i in range(len(self.set)):
-                self.__set_value(self.set[i], value[i])
+                self.set[i] = self.__set_value(self.set[i], value[i])
         else:
-            self.__set_value(self.set, value)
+            self.set = self.__set_value(self.set, value)
 
+    # Sets the value on the passed message, and returns the message to be sent
     def __set_value(self, midi_message, value):
         if self.type == self.PARAMETER_TYPE_STRING:
             raise Exception() # Setting strings is not implemented yet
@@ -154,26 +263,63 @@ class ClientParameterMapping:
             midi_message.value = value
 
         elif isinstance(midi_message, SystemExclusive):            
-            # Fill up message to appropriate length for the specification
-            data = list(midi_message.data)
-            while len(data) < 8:
-                data.append(0)
+            if not isinstance(midi_message, EncodedSystemExclusive):
+                # Fill up message to appropriate length for the specification (only done once)
+                data = list(midi_message.data)
+                while len(data) < 8:
+                    data.append(0)
+
+                midi_message = EncodedSystemExclusive(midi_message.manufacturer_id, data)
             
             # Set value as 14 bit
-            data[6] = int(floor(value / 128))
-            data[7] = int(value % 128)
-
-            midi_message.data = bytes(data)
+            value = int(value)
+            midi_message.set_data(6, (value >> 7) & 0x7f)
+            midi_message.set_data(7, value & 0x7f)
 
         elif isinstance(midi_message, ProgramChange):
             # Set patch
             midi_message.patch = value
 
+        return midi_message
+
+    # Returns the compiled matcher for the passed SysEx response template
+    def __get_matcher(self, response):
+        for matcher in self.__matchers:
+            if matcher.response is response:
+                return matcher
+            
+        matcher = SysexMatcher(response)
+        self.__matchers.append(matcher)
+        
+        return matcher
+
     # Returns if the mapping has finished receiving a result. Per default,
     # this returns True which is valid for mappings with one response.
     def result_finished(self):
         return True
     
+    # Returns a list of dispatch keys for the response template(s), used by the client to pass 
+    # only matching messages to parse(). If None is returned, all messages will be passed.
+    def dispatch_keys(self):
+        if not self.response:
+            return []
+        
+        responses = self.response if isinstance(self.response, list) else [self.response]
+        
+        ret = []
+        for response in responses:
+            if not response:
+                continue
+
+            key = get_dispatch_key(response)
+            if key == None:
+                return None
+            
+            if not key in ret:
+                ret.append(key)
+
+        return ret
+    
     # def __repr__(self):
     #     return self.name
     
@@ -184,10 +330,10 @@ class ClientTwoPartParameterMapping(ClientParameterMapping):
 
     # Singleton factory
     @staticmethod
-    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None):
-        for m in ClientParameterMapping._mappings:
-            if m.name == name:
-                return m
+    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None, notify_always = False, persist = False):
+        m = ClientParameterMapping._mappings.get(name, None)
+        if m:
+            return m
             
         m = ClientTwoPartParameterMapping(
             name = name,
@@ -197,16 +343,18 @@ class ClientTwoPartParameterMapping(ClientParameterMapping):
             response = response,
             value = value,
             type = type,
-            depends = depends
+            depends = depends,
+            notify_always = notify_always,
+            persist = persist
         )
 
-        ClientParameterMapping._mappings.append(m)
+        ClientParameterMapping._mappings[name] = m
         return m
 
     ##########################################################################################################################
 
-    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None):
-        super().__init__(name = name, create_key = create_key, set = set, request = request, response = response, value = value, type = type, depends = depends)
+    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None, notify_always = False, persist = False):
+        super().__init__(name = name, create_key = create_key, set = set, request = request, response = response, value = value, type = type, depends = depends, notify_always = notify_always, persist = persist)
 
         self.__value_1 = None
     
@@ -235,22 +383,49 @@ class ClientTwoPartParameterMapping(ClientParameterMapping):
 # Implements all MIDI communication to and from the client device
 class Client: #(ClientRequestListener):
 
-    # Listener for dependency mappings
-    class _DependencyListener:
-        def __init__(self, client, orig_mapping, listener = None):
+    # Node of the dependency graph: Listens to a mapping which other mappings depend on (for example the rig date). 
+    # When its value changes, all dependent mappings are invalidated and requested as a batch. Dependent mappings
+    # are not requested otherwise.
+    class _DependencyNode:
+        def __init__(self, client):
             self.__client = client
-            self.__orig_mapping = orig_mapping
             self.__last_value = None
-            self.__listener = listener
+
+            # Lists of listeners by dependent mappings
+            self.__dependents = {}
+
+        # Adds a dependent mapping. If the value of the dependency is known already, the mapping is requested directly.
+        def add(self, mapping, listener):
+            listeners = self.__dependents.get(mapping, None)
+            if listeners == None:
+                listeners = self.__dependents[mapping] = []
+            elif listener in listeners:
+                return
+                
+            listeners.append(listener)
+
+            if self.__last_value != None:
+                self.__client._register_mapping(mapping, listener, True)
 
         def parameter_changed(self, mapping):
-            if mapping.value != self.__last_value:
-                self.__last_value = mapping.value
+            if mapping.value == self.__last_value:
+                return
+            
+            self.__last_value = mapping.value
 
-                self.__client._register_mapping(self.__orig_mapping, self.__listener, True)           
+            # A dependency has changed (for example the rig date on rig changes): Poll all mappings fast again
+            self.__client.reset_polling()
+
+            # Request all dependent mappings (mappings with more than one listener are only requested once)
+            client = self.__client
+
+            for dependent, listeners in self.__dependents.items():
+                for listener in listeners:
+                    client._register_mapping(dependent, listener, True)
         
         def request_terminated(self, mapping):
-            pass
+            # Dependent mappings have to be requested again when the dependency is answered next time
+            self.__last_value = None
 
     ##########################################################################################################
 
@@ -266,33 +441,130 @@ class Client: #(ClientRequestListener):
         if self.__debug_stats:   # pragma: no cover 
             self.__stats_period = PeriodCounter(get_option(config, "debugStatsInterval", 2000))
 
-        # List of ClientRequest objects    
+        # List of ClientRequest objects. Each request knows its position in this list and in the dispatch index below 
+        # (see ClientRequest.index and ClientRequest.slots), so removing a request just moves the last entry to its place.
         self.__requests = []
 
-        # Dict of dependency listeners
+        # Dispatch index for incoming messages: Holds lists of requests per dispatch key. Requests of mappings 
+        # without dispatch keys are checked against all incoming messages.
+        self.__requests_indexed = {}
+        self.__requests_unindexed = []
+
+        # Fast path for values streamed by the client device at a high rate (like the tuner deviance): Requests of 
+        # mappings without request message which notify their listeners on every message, by dispatch key. Only
+        # set for keys with no other requests, so these messages can be passed to the request directly.
+        self.__streams = {}
+
+        # Requests by mapping
+        self.__requests_by_mapping = {}
+
+        # Dependency graph: Nodes by the mappings other mappings depend on (see _DependencyNode)
         self.__dependencies = {}
 
         self.__max_request_lifetime = get_option(config, "maxRequestLifetimeMillis", 2000)
 
+        # Sent requests with a restricted lifetime, in order of expiry (all have the same lifetime, so this is the 
+        # order of sending). Only the head has to be checked for expired requests. Removed requests stay in the queue 
+        # until they reach the head.
+        self.__expiry = Fifo()
+
         # Helper to only clean up hanging requests from time to time as this is not urgent at all
         self.__cleanup_terminated_period = PeriodCounter(self.__max_request_lifetime / 2)    
 
+        # Output priority: If enabled, request messages are queued and sent at the end of the tick (see flush()), so SET
+        # messages initiated by the user always go out first. Optionally, the number of request messages per tick can be limited.
+        self.__prioritize_set = get_option(config, "prioritizeSetMessages", False)
+        self.__max_request_messages = get_option(config, "maxRequestMessagesPerTick", 0)
+        self.__request_messages = Fifo()
+        self.__request_message_requests = Fifo()    # Requests the queued messages belong to (or None)
+
+        # Coalescing of continuous SET messages (expression pedals, encoders): Only the latest value per mapping is sent on flush(), 
+        # at most with the given rate (MIDI messages per second on the output, shared by all coalesced mappings, 0 for no limit).
+        self.__coalesce = get_option(config, "coalesceContinuousMessages", False)
+
+        coalesce_max_rate = get_option(config, "coalesceMaxRate", 0)
+        self.__coalesce_interval = 1000 / coalesce_max_rate if coalesce_max_rate else 0
+        self.__coalesce_budget = 1          # Number of messages which may be sent (grows by one per interval, up to one)
+        self.__coalesce_budget_time = 0     # Time the budget has been updated
+        self.__coalesce_keys = []           # Buffer for the pending mappings (reused to avoid allocations)
+        self.__pending_sets = {}
+
+        # Number of SET messages which have been coalesced away (statistics)
+        self.coalesced = 0
+
+        # Request window: Maximum number of sent requests waiting for an answer at the same time. Further requests
+        # are queued (FIFO) and sent when answered or terminated requests release their slots. 0 means no limit.
+        # Removed requests stay in the queue (with the queued flag cleared) and are skipped when they reach the head.
+        self.__max_in_flight = get_option(config, "maxRequestsInFlight", 0)
+        self.__num_in_flight = 0
+        self.__send_queue = Fifo()
+        self.__num_queued = 0
+
+        # Maximum queue depth since the last call of reset_queue_stats() (statistics)
+        self.max_queue_depth = 0
+
+        # Persistent cache of the last known values (see ValueCache, set by the controller if enabled). All 
+        # registered mappings with the persist flag set are watched.
+        self.cache = None
+
+        # Optional LatencyMeasurement instance which is notified about every SET message sent by set() (set by the Controller)
+        self.latency = None
+
+        # Adaptive polling: Mappings whose values have been stable are requested less often, backing off exponentially
+        # (starting at the update interval) up to this interval (milliseconds). 0 disables adaptive polling.
+        self.__poll_max_interval = get_option(config, "pollMaxIntervalMillis", 0)
+
+        if self.__poll_max_interval:
+            self.__poll_min_interval = get_option(config, "updateInterval", 200)
+            self.__poll_states = {}    # Polling state per mapping: [interval, next due time, epoch]
+            self.__poll_epoch = 0      # Incremented to reset all mappings to the fast rate
+
     @property
     def requests(self):
         return self.__requests
+    
+    # Number of sent requests waiting for an answer (only counted if maxRequestsInFlight is set)
+    @property
+    def requests_in_flight(self):
+        return self.__num_in_flight
+    
+    # Number of requests waiting to be sent
+    @property
+    def requests_queued(self):
+        return self.__num_queued
+    
+    # Resets the maximum queue depth
+    def reset_queue_stats(self):
+        self.max_queue_depth = self.__num_queued
 
     # Register the mapping and listener in advance (only plays a role for bidirectional parameters,
     # here this is redundant)
     def register(self, mapping, listener = None):
+        if self.cache:
+            self.cache.watch(mapping, listener)
+
         if not mapping.request and mapping.response:
             self._register_mapping(mapping, listener, False)
 
     # Sends the SET message of a mapping. Value has to be a list if the mapping's set field is a list, too!
-    def set(self, mapping, value):
+    # If coalesce is True and coalescing is enabled, the value is sent on the next flush(), and only the 
+    # latest value is sent if set() is called multiple times before (use this for continuous inputs).
+    def set(self, mapping, value, coalesce = False):
         if not mapping.set:
             return
         
+        if coalesce and self.__coalesce:
+            if mapping in self.__pending_sets:
+                self.coalesced += 1
+
+            self.__pending_sets[mapping] = value
+            return
+
         mapping.set_value(value)
+
+        # Poll the mapping fast again
+        if self.__poll_max_interval:
+            self.__poll_states.pop(mapping, None)
                 
         if isinstance(mapping.set, list):
             for m in mapping.set:
@@ -309,6 +581,80 @@ class Client: #(ClientRequestListener):
                 
             self.midi.send(mapping.set)
 
+        if self.latency:
+            self.latency.message_sent()
+
+    # Sends a request message. If SET messages are prioritized, the message is queued and sent on the next flush().
+    # If the request the message belongs to is passed, its lifetime starts when the message is actually sent.
+    def send_request_message(self, midi_message, request = None):
+        if self.__prioritize_set:
+            self.__request_messages.append(midi_message)
+            self.__request_message_requests.append(request)
+        else:
+            self.midi.send(midi_message)
+
+    # Sends the pending coalesced SET messages and then the queued request messages (up to maxRequestMessagesPerTick). 
+    # Called by the controller at the end of every tick.
+    def flush(self):
+        pending = self.__pending_sets
+        if pending:
+            if not self.__coalesce_interval:
+                for mapping in pending:
+                    Client.set(self, mapping, pending[mapping])
+
+                pending.clear()
+            else:
+                self.__flush_limited(pending)
+
+        queue = self.__request_messages
+        if not queue:
+            return
+        
+        num = len(queue)
+        if self.__max_request_messages and num > self.__max_request_messages:
+            num = self.__max_request_messages
+
+        requests = self.__request_message_requests
+
+        for i in range(num):
+            self.midi.send(queue.pop())
+
+            # The lifetime of the request starts when it is actually sent
+            request = requests.pop()
+            if request and request.lifetime:
+                request.lifetime.reset()
+
+    # Sends pending coalesced values within the message budget of the output. Mappings are sent in the order 
+    # they have been set, the rest stays pending. As newly set mappings are appended, all get their turn.
+    def __flush_limited(self, pending):
+        now = get_current_millis()
+
+        budget = self.__coalesce_budget + (now - self.__coalesce_budget_time) / self.__coalesce_interval
+        if budget > 1:
+            budget = 1
+
+        self.__coalesce_budget_time = now
+
+        keys = self.__coalesce_keys
+        keys.extend(pending)
+
+        for mapping in keys:
+            if budget < 1:
+                break
+
+            # A mapping may send more than one message: The budget can get negative then
+            budget -= len(mapping.set) if isinstance(mapping.set, list) else 1
+
+            Client.set(self, mapping, pending.pop(mapping))
+
+        keys.clear()
+        self.__coalesce_budget = budget
+
+    # Number of request messages waiting to be sent
+    @property
+    def request_messages_queued(self):
+        return len(self.__request_messages)
+
     # Send the request message of a mapping. Calls the passed listener when the answer has arrived.
     #@RuntimeStatistics.measure
     def request(self, mapping, listener = None):
@@ -316,13 +662,71 @@ class Client: #(ClientRequestListener):
             return
         
         if mapping.depends:
-            if not mapping in self.__dependencies:
-                self.__dependencies[mapping] = self._DependencyListener(self, mapping, listener)
+            dependency = mapping.depends
+
+            node = self.__dependencies.get(dependency, None)
+            if not node:
+                node = self.__dependencies[dependency] = self._DependencyNode(self)
+
+            node.add(mapping, listener)
 
-            # Register the dependency rather than the mapping itself
-            self._register_mapping(mapping.depends, self.__dependencies[mapping], True)
+            # Request the dependency rather than the mapping itself. Dependencies are always polled, except if they have 
+            # dependencies themselves.
+            if dependency.depends:
+                self.request(dependency, node)
+            else:
+                self._register_mapping(dependency, node, True)
         else:
+            # Adaptive polling: Skip the request if the mapping is not due yet
+            if self.__poll_max_interval and not self.__poll_due(mapping, listener):
+                return
+            
             self._register_mapping(mapping, listener, True)
+    
+    # Resets all mappings to the fast polling rate (for example on rig changes)
+    def reset_polling(self):
+        if self.__poll_max_interval:
+            self.__poll_epoch += 1
+
+    # Adaptive polling: Returns if the mapping has to be requested
+    def __poll_due(self, mapping, listener):
+        # Pending requests just get the listener added
+        if mapping in self.__requests_by_mapping:
+            return True
+        
+        state = self.__poll_states.get(mapping, None)
+        if not state or state[2] != self.__poll_epoch:
+            return True
+
+        # New listeners need the current value
+        if listener and not listener in mapping.notified_listeners:
+            return True
+        
+        return get_current_millis() >= state[1]
+    
+    # Adaptive polling: Called by the requests when an answer came in. Stable values double the polling 
+    # interval, changed values reset it. Internal use only.
+    def _poll_answered(self, mapping, changed):
+        if not self.__poll_max_interval:
+            return
+        
+        state = self.__poll_states.get(mapping, None)
+        if not state:
+            state = self.__poll_states[mapping] = [0, 0, self.__poll_epoch]
+
+        if changed or state[2] != self.__poll_epoch:
+            state[0] = 0
+            state[2] = self.__poll_epoch
+        else:
+            interval = state[0] * 2
+            if interval < self.__poll_min_interval:
+                interval = self.__poll_min_interval
+            if interval > self.__poll_max_interval:
+                interval = self.__poll_max_interval
+
+            state[0] = interval
+
+        state[1] = get_current_millis() + state[0]
         
     # Registers a mapping request or adds the listener to an existing one. Optionally sends the
     # request message. Internal use only.
@@ -337,17 +741,72 @@ class Client: #(ClientRequestListener):
                 req.add_listener(listener)
 
             # Add to list
-            self.__requests.append(req)
+            self.__add_request(req)
             
             # Send 
             if send:           
-                req.send()
+                self.__send_request(req)
 
         else:
             # Existing request: Add listener
             if listener:
                 req.add_listener(listener)
 
+    # Sends a request, or queues it if the request window is full. Only requests with a restricted 
+    # lifetime take part in the window (others would never release their slot).
+    def __send_request(self, request):
+        if self.__max_in_flight and request.lifetime and request.mapping.request:
+            if self.__num_in_flight >= self.__max_in_flight:
+                request.queued = True
+                self.__send_queue.append(request)
+                self.__num_queued += 1
+
+                if self.__num_queued > self.max_queue_depth:
+                    self.max_queue_depth = self.__num_queued
+
+                return
+            
+            request.in_flight = True
+            self.__num_in_flight += 1
+
+        if request.lifetime:
+            self.__expiry.append(request)
+
+        request.send()
+
+    # Releases the window slot of a request (answered or terminated), and sends the next queued 
+    # requests. Internal use only.
+    def _release_request(self, request):
+        if not request.in_flight:
+            return
+        
+        request.in_flight = False
+        self.__num_in_flight -= 1
+
+        queue = self.__send_queue
+        while queue and self.__num_in_flight < self.__max_in_flight:
+            next = queue.pop()
+
+            # Removed from the queue already
+            if not next.queued:
+                continue
+
+            next.queued = False
+            self.__num_queued -= 1
+
+            if next.finished:
+                continue
+
+            # The lifetime starts when the request is actually sent
+            next.lifetime.reset()
+
+            next.in_flight = True
+            self.__num_in_flight += 1
+
+            self.__expiry.append(next)
+            
+            next.send()
+
     # Create a new request
     def __create_request(self, mapping):
         return ClientRequest(              
@@ -356,6 +815,93 @@ class Client: #(ClientRequestListener):
             self.__max_request_lifetime if mapping.request else 0
         )
 
+    # Adds a request to the list and the dispatch index
+    def __add_request(self, request):
+        request.index = len(self.__requests)
+        self.__requests.append(request)
+        self.__requests_by_mapping[request.mapping] = request
+
+        request.dispatch_keys = request.mapping.dispatch_keys()
+
+        if request.dispatch_keys == None:
+            request.slots = [len(self.__requests_unindexed)]
+            self.__requests_unindexed.append(request)
+            return
+        
+        request.slots = []
+
+        for key in request.dispatch_keys:
+            bucket = self.__requests_indexed.get(key, None)
+            if bucket == None:
+                bucket = self.__requests_indexed[key] = []
+
+            request.slots.append(len(bucket))
+            bucket.append(request)
+
+            self.__update_stream(key)
+
+    # Removes a request from the list and the dispatch index
+    def __remove_request(self, request):
+        if request.removed:
+            return
+        
+        request.removed = True
+
+        # Request list
+        requests = self.__requests
+        last = requests.pop()
+        if request.index < len(requests):
+            requests[request.index] = last
+            last.index = request.index
+
+        if request.in_flight:
+            self._release_request(request)
+        elif request.queued:
+            request.queued = False
+            self.__num_queued -= 1
+
+        if self.__requests_by_mapping.get(request.mapping, None) == request:
+            del self.__requests_by_mapping[request.mapping]
+
+        if request.dispatch_keys == None:
+            self.__remove_slot(self.__requests_unindexed, request.slots[0], None)
+            return
+        
+        for i in range(len(request.dispatch_keys)):
+            key = request.dispatch_keys[i]
+            bucket = self.__requests_indexed[key]
+
+            self.__remove_slot(bucket, request.slots[i], key)
+
+            if not bucket:
+                del self.__requests_indexed[key]
+
+            self.__update_stream(key)
+
+    # Removes the request at the passed slot from a dispatch list (the list of the key, or the unindexed 
+    # list if key is None) by moving the last request there
+    def __remove_slot(self, requests, slot, key):
+        last = requests.pop()
+        if slot >= len(requests):
+            return
+        
+        requests[slot] = last
+
+        if key == None:
+            last.slots[0] = slot
+        else:
+            last.slots[last.dispatch_keys.index(key)] = slot
+
+    # Updates the fast path for a dispatch key
+    def __update_stream(self, key):
+        bucket = self.__requests_indexed.get(key, None)
+
+        if bucket and len(bucket) == 1 and bucket[0].mapping.notify_always and not bucket[0].mapping.request:
+            self.__streams[key] = bucket[0]
+
+        elif key in self.__streams:
+            del self.__streams[key]
+
     # Receive MIDI messages
     #@RuntimeStatistics.measure
     def receive(self, midi_message):
@@ -363,27 +909,57 @@ class Client: #(ClientRequestListener):
             self.__cleanup_hanging_requests()
 
         if self.__debug_stats and self.__stats_period.exceeded:  # pragma: no cover 
-            do_print(f"    { len(self.__requests) } requests pending:")
+            do_print(f"    { len(self.requests) } requests pending ({ self.__num_in_flight } in flight, { self.__num_queued } queued, max. queue depth { self.max_queue_depth }):")
+            self.reset_queue_stats()
+
             for r in self.__requests:
                 do_print(f"{ r.mapping.name }: { repr([l.__class__.__name__ for l in r.listeners]) }")
 
         if not midi_message:
             return False
         
-        # See if one of the waiting requests matches
-        do_cleanup = False
+        key = get_dispatch_key(midi_message)
 
+        # Fast path for streamed values (no other request can use the message)
+        if key in self.__streams and not self.__requests_unindexed:
+            if self.__streams[key].parse(midi_message):
+                return True
+            
+            if self.debug_unparsed_messages:           # pragma: no cover
+                self.print_message(midi_message)
+
+            return False
+
+        # See if one of the waiting requests matches (only the requests indexed for the 
+        # message's dispatch key, and the ones which could not be indexed)
+        do_cleanup = False
         parsed = False
-        for request in self.__requests:
+
+        bucket = None
+
+        if key != None and key in self.__requests_indexed:
+            bucket = self.__requests_indexed[key]
+            
+            for request in bucket:
+                if request.parse(midi_message):
+                    parsed = True
+
+                if request.finished:
+                    do_cleanup = True
+
+        for request in self.__requests_unindexed:
             if request.parse(midi_message):
                 parsed = True
 
             if request.finished:
                 do_cleanup = True
 
-        # Check for finished requests
+        # Remove finished requests
         if do_cleanup:
-            self.__cleanup_requests()
+            if bucket:
+                self.__cleanup_requests(bucket)
+
+            self.__cleanup_requests(self.__requests_unindexed)
 
         # Debug unparsed messages
         if not parsed and self.debug_unparsed_messages:           # pragma: no cover
@@ -395,24 +971,38 @@ class Client: #(ClientRequestListener):
     # request has been found.
     #@RuntimeStatistics.measure
     def get_matching_request(self, mapping):
-        for request in self.__requests:
-            if request.mapping == mapping:
-                return request
+        return self.__requests_by_mapping.get(mapping, None)
+
+    # Remove all finished requests of the passed list (in place, iterating backwards as removing a request 
+    # moves the last one of the list to its place)
+    def __cleanup_requests(self, requests):
+        i = len(requests) - 1
+        while i >= 0:
+            if i < len(requests) and requests[i].finished:
+                self.__remove_request(requests[i])
             
-        return None
-
-    # Remove all finished requests, and terminate the ones which took too long already
-    def __cleanup_requests(self):
-        self.__requests = [i for i in self.__requests if not i.finished]
+            i -= 1
             
-    # Terminate any requests which took too long from time to time
+    # Terminate any requests which took too long from time to time. Only the expired 
+    # requests at the head of the expiry list are visited.
     def __cleanup_hanging_requests(self):
-        # Terminate requests if they waited too long
-        for request in self.__requests:
-            if request.lifetime and request.lifetime.exceeded:
+        expiry = self.__expiry
+
+        while expiry:
+            request = expiry.peek()
+
+            if not request.removed:
+                if not request.lifetime.exceeded:
+                    break
+
                 request.terminate()
+                self.__remove_request(request)
+
+            expiry.pop()
 
-        self.__cleanup_requests()
+    # Called by requests when terminated. Internal use only.
+    def _request_terminated(self, request):
+        self.__remove_request(request)
 
     # Print info about the passed message
     def print_message(self, midi_message):  # pragma: no cover
@@ -434,6 +1024,21 @@ class ClientRequest(EventEmitter):
         
         self.client = client
         self.mapping = mapping
+
+        # Dispatch keys of the mapping (set by the client)
+        self.dispatch_keys = None
+
+        # State in the request window of the client
+        self.in_flight = False
+        self.queued = False
+
+        # Position in the request list of the client, and positions in the dispatch lists (one per dispatch key, 
+        # or the position in the list of unindexed requests). Set by the client.
+        self.index = -1
+        self.slots = None
+
+        # Set when removed from the client
+        self.removed = False
         
         self.lifetime = self.__init_lifetime(max_request_lifetime)
 
@@ -456,9 +1061,9 @@ class ClientRequest(EventEmitter):
             for m in self.mapping.request:
                 if not m:
                     continue
-                self.client.midi.send(m)    
+                self.client.send_request_message(m, self)    
         else:
-            self.client.midi.send(self.mapping.request)
+            self.client.send_request_message(self.mapping.request, self)
 
     # Returns if the request is finished
     @property
@@ -477,6 +1082,8 @@ class ClientRequest(EventEmitter):
         # Clear listeners
         self.listeners = None
 
+        self.client._request_terminated(self)
+
     # Parses an incoming MIDI message. If the message belongs to the mapping's request,
     # calls the listener with the received value. Returns if the message has been used.
     def parse(self, midi_message):
@@ -494,13 +1101,41 @@ class ClientRequest(EventEmitter):
         if not mapping.result_finished():
             return
 
+        # Live value received
+        mapping.stale = False
+
         if self.client.debug_mapping == mapping:    # pragma: no cover
             from ..debug_tools import stringify_midi_message
             do_print(f"{ mapping.name }: Received value '{ repr(mapping.value) }' from { stringify_midi_message(midi_message) }")
 
         # Call the listeners (the mapping has the values set already). Do not use notify_listeners() to keep the stack short.
-        for listener in self.listeners:
-            listener.parameter_changed(self.mapping)
+        # Listeners are only called if the value has changed, or if they have not been notified about the current value yet.
+        if mapping.notify_always:
+            changed = True
+
+            for listener in self.listeners:
+                listener.parameter_changed(mapping)
+        else:
+            notified = mapping.notified_listeners
+
+            changed = (mapping.value != mapping.notified_value)
+            if changed:
+                mapping.notified_value = mapping.value
+                notified.clear()
+
+            for listener in self.listeners:
+                if listener in notified:
+                    continue
+
+                notified.append(listener)
+                listener.parameter_changed(mapping)
+
+        if mapping.request:
+            self.client._poll_answered(mapping, changed)
+
+        # Free the slot in the request window
+        if self.in_flight:
+            self.client._release_request(self)
 
         # Clear listeners (only if the request has a restricted life time)
         if self.lifetime:
@@ -508,11 +1143,22 @@ class ClientRequest(EventEmitter):
 
         return True
 
+    # Notifies all listeners, regardless if the value has changed
     def notify_listeners(self):
+        mapping = self.mapping
+
+        mapping.notified_value = mapping.value
+        mapping.notified_listeners.clear()
+
         for listener in self.listeners:
-            listener.parameter_changed(self.mapping)
+            mapping.notified_listeners.append(listener)
+            listener.parameter_changed(mapping)
 
     def notify_terminated(self):
+        # Listeners have to be notified about the next value again
+        self.mapping.notified_listeners.clear()
+        self.mapping.stale = False
+
         for listener in self.listeners:
             listener.request_terminated(self.mapping)
 
@@ -561,8 +1207,8 @@ class BidirectionalClient(Client, Updateable):
         return parsed
 
     # In case of bidirectional parammeters, "simulate" a parameter change directly after the MIDI message
-    def set(self, mapping, value):
-        Client.set(self, mapping, value)
+    def set(self, mapping, value, coalesce = False):
+        Client.set(self, mapping, value, coalesce)
 
         # Notify listeners of the mapping with the set value (we do not use echoing, so the actions
         # will not reflect the state change if we just do nothing)
@@ -572,6 +1218,7 @@ class BidirectionalClient(Client, Updateable):
                 raise Exception() #"No request for mapping: " + repr(mapping))
             
             req.mapping.value = value
+            req.mapping.stale = False
             req.notify_listeners()
 
     # Update the protocol state
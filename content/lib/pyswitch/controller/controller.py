@@ -1,11 +1,16 @@
 from gc import collect, mem_free
+from micropython import const
 
 from .inputs import SwitchController, ContinuousController
 from .client import Client, BidirectionalClient
-from ..misc import Updater, PeriodCounter, get_option, do_print, format_size, fill_up_to
+from ..misc import Updater, Updateable, UpdateScheduler, PeriodCounter, get_current_millis, get_option, do_print, format_size, fill_up_to
 from ..stats import Memory #, RuntimeStatistics
 
 
+# Maximum factor by which the MIDI time budget is increased when the MIDI input reports a backlog
+_MAX_MIDI_BUDGET_FACTOR = const(4)
+
+
 # Main application class (controls the processing)    
 class Controller(Updater): #ClientRequestListener
 
@@ -34,6 +39,11 @@ class Controller(Updater): #ClientRequestListener
     def __init__(self, led_driver, midi, protocol = None, config = {}, inputs = [], ui = None, period_counter = None):
         Updater.__init__(self)
 
+        # Updateables which are updated every "updateInterval", and the scheduler for all updateables 
+        # which define their own interval (see Updateable.update_interval_millis)
+        self.__periodic = []
+        self.__scheduler = None
+
         # Flag which is used by display elements to show the user there is not enough memory left
         self.low_memory_warning = False
 
@@ -50,6 +60,28 @@ class Controller(Updater): #ClientRequestListener
         # Max. number of MIDI messages being parsed before the next switch state evaluation
         self.__max_consecutive_midi_msgs = get_option(config, "maxConsecutiveMidiMessages", 10)   
 
+        # Time budget (microseconds) for parsing MIDI messages before the next switch state evaluation. If set,
+        # this replaces maxConsecutiveMidiMessages.
+        self.__midi_budget_ns = get_option(config, "midiTimeBudgetMicros", 0) * 1000
+
+        if self.__midi_budget_ns:
+            from time import monotonic_ns
+            self.__monotonic_ns = monotonic_ns
+
+            self.__midi_budget_factor = 1
+            self.__midi_has_backlog = hasattr(midi, "backlog")
+
+        # Profiler for the run time of all components (optional)
+        self.__profiler = None
+        if get_option(config, "debugProfiler", False):
+            from .measure import TickProfiler
+
+            self.__profiler = TickProfiler(
+                interval_millis = get_option(config, "debugProfilerInterval", 5000),
+                top = get_option(config, "debugProfilerTop", 10)
+            )
+            self.add_updateable(self.__profiler)
+
         # Print debug info        
         self.__debug_stats = get_option(config, "debugStats", False)        
 
@@ -61,11 +93,25 @@ class Controller(Updater): #ClientRequestListener
             self.__measurement_process_jitter.add_listener(self)
             self.add_updateable(self.__measurement_process_jitter)            
 
+        # Latency measurement from switch state changes to the next outgoing MIDI message
+        self.latency = None
+        if get_option(config, "debugLatency", False):
+            from .measure import LatencyMeasurement
+
+            self.latency = LatencyMeasurement(
+                interval_millis = get_option(config, "debugLatencyInterval", 2000),
+                bin_width_micros = get_option(config, "debugLatencyBinMicros", 250)
+            )
+            self.add_updateable(self.latency)
+
         # Limit of minimum free memory before low_memory_warning is set to True (the check is done before ticks
         # are running so this should be enough to operate all configurations imaginable. Normally you need about 
         # 10-15k from there, so 25k is enough headroom)
         self.__memory_warn_limit = get_option(config, "memoryWarnLimitBytes", 1024 * 15)  # 15kB
 
+        # Request messages and coalesced SET messages are queued by the client and sent at the end of every tick 
+        self.__flush_client = get_option(config, "prioritizeSetMessages", False) or get_option(config, "coalesceContinuousMessages", False)
+
         # Clear MIDI buffers on startup
         self.__clear_buffer = get_option(config, "clearBuffers", True)
 
@@ -87,6 +133,9 @@ class Controller(Updater): #ClientRequestListener
             return ret
         
         self.led_driver.init(get_num_pixels(inputs))
+
+        # Buffered LED drivers collect all changes of a tick and push them at the end of the tick
+        self.__show_leds = hasattr(self.led_driver, "show")
         
         # Periodic update handler (the client is only asked when a certain time has passed)
         self.period = period_counter
@@ -97,16 +146,31 @@ class Controller(Updater): #ClientRequestListener
         # is passed, bidirectional communication is used according to the protocol.
         if protocol:
             self.client = BidirectionalClient(self.__midi, config, protocol)
+            self.client.update_interval_millis = get_option(config, "clientUpdateInterval", None)
             self.add_updateable(self.client)
         else:
             self.client = Client(self.__midi, config)
 
+        self.client.latency = self.latency
+
+        # Persistent cache of the last known values, shown directly after booting until the client device has answered
+        if get_option(config, "valueCache", False):
+            from .cache import ValueCache
+
+            self.client.cache = ValueCache(
+                path = get_option(config, "valueCacheFile", "/.pyswitch_values"),
+                write_delay_millis = get_option(config, "valueCacheWriteDelayMillis", 5000),
+                min_write_interval_millis = get_option(config, "valueCacheMinWriteIntervalMillis", 60000)
+            )
+            self.add_updateable(self.client.cache)
+
         # Set up inputs
         self.inputs = []
         for sw_def in inputs:
             if hasattr(sw_def["assignment"]["model"], "pushed"):
                 # It is a switch
                 self.inputs.append(SwitchController(self, sw_def))
+                self.inputs[-1].latency = self.latency
             else:
                 # It is a continuous input or rotary encoder. 
                 self.inputs.append(ContinuousController(self, sw_def))
@@ -116,8 +180,48 @@ class Controller(Updater): #ClientRequestListener
             self.ui.init(self)
             self.add_updateable(ui)
 
+        if self.__profiler:
+            self.__setup_profiler()
+
+    # Adds an updateable. If it defines an own update interval, it is scheduled separately instead
+    # of being updated every "updateInterval".
+    def add_updateable(self, u):
+        if not isinstance(u, Updateable) or u in self.updateables:
+            return
+        
+        Updater.add_updateable(self, u)
+
+        if self.__profiler and u != self.__profiler:
+            u.update = self.__profiler.wrap(u.update, _get_profiler_name(u))
+
+        if u.update_interval_millis:
+            if not self.__scheduler:
+                self.__scheduler = UpdateScheduler()
+
+            self.__scheduler.add(u, u.update_interval_millis, get_current_millis())
+        else:
+            self.__periodic.append(u)
+
+    # Wraps the functions of all components which are not updateables for profiling
+    def __setup_profiler(self):
+        profiler = self.__profiler
+
+        for i in range(len(self.inputs)):
+            input = self.inputs[i]
+            input.process = profiler.wrap(input.process, f"{ _get_profiler_name(input) } { i + 1 }")
+
+        self.client.receive = profiler.wrap(self.client.receive, "Client.receive", num_args = 1)
+        self.__midi.receive = profiler.wrap(self.__midi.receive, "MIDI.receive")
+
+        if self.__show_leds:
+            self.led_driver.show = profiler.wrap(self.led_driver.show, "LEDs.show")
+
     # Prepare to run the processing loop
     def init(self):
+        # Restore cached values
+        if self.client.cache:
+            self.client.cache.restore()
+
         # Show user interface
         if self.ui:            
             Memory.watch("Showing UI")
@@ -143,7 +247,7 @@ class Controller(Updater): #ClientRequestListener
     def tick(self):
         # Update all Updateables in periodic intervals, less frequently than every tick.        
         if self.period.exceeded:
-            for u in self.updateables:
+            for u in self.__periodic:
                 # Receive MIDI messages in between updates, too
                 self.__receive_midi_messages()
 
@@ -151,9 +255,21 @@ class Controller(Updater): #ClientRequestListener
 
             Memory.watch("Controller: update", only_if_changed = True)
 
+        # Update all scheduled Updateables which are due
+        if self.__scheduler:
+            self.__update_scheduled()
+
         # Receive all available MIDI messages
         self.__receive_midi_messages()
 
+        # Send queued messages
+        if self.__flush_client:
+            self.client.flush()
+
+        # Push LED changes (only has an effect for buffered LED drivers)
+        if self.__show_leds:
+            self.led_driver.show()
+
         return True
 
     # Resets all actions (which refreshes their buffer memories, triggering re-rendering of LEDs and displays)
@@ -162,8 +278,29 @@ class Controller(Updater): #ClientRequestListener
             for action in input.actions:
                 action.reset()
 
+    # Updates all scheduled updateables which are due (receiving MIDI messages in between)
+    def __update_scheduled(self):
+        scheduler = self.__scheduler
+        now = get_current_millis()
+
+        if scheduler.next_due > now:
+            return
+
+        while True:
+            u = scheduler.pop_due(now)
+            if u == None:
+                break
+
+            self.__receive_midi_messages()
+
+            u.update()
+
     # Receive MIDI messages, and in between check for switch state changes
     def __receive_midi_messages(self):
+        if self.__midi_budget_ns:
+            self.__receive_midi_messages_budget()
+            return
+
         cnt = 0
         
         while True:            
@@ -188,8 +325,52 @@ class Controller(Updater): #ClientRequestListener
 
         #self._measurement_midi_jitter.start()
 
+    # Receive MIDI messages until the time budget is used up (switch states are checked before). If the MIDI input 
+    # reports a backlog (input buffer close to overflowing) when the budget is used up, the budget is increased 
+    # for the next calls (up to _MAX_MIDI_BUDGET_FACTOR times), until all messages have been drained.
+    def __receive_midi_messages_budget(self):
+        if self.__debug_stats:
+            self.__measurement_process_jitter.finish()
+        
+        # Detect switch state changes
+        for input in self.inputs:
+            input.process()
+        
+        if self.__debug_stats:
+            self.__measurement_process_jitter.start()
+
+        monotonic_ns = self.__monotonic_ns
+        deadline = monotonic_ns() + self.__midi_budget_ns * self.__midi_budget_factor
+
+        while True:
+            midimsg = self.__midi.receive()
+            self.client.receive(midimsg)
+
+            if not midimsg:
+                self.__midi_budget_factor = 1
+                return
+            
+            if monotonic_ns() >= deadline:
+                break
+
+        # Budget used up: Apply back pressure if the input is close to overflowing
+        if self.__midi_has_backlog and self.__midi.backlog:
+            if self.__midi_budget_factor < _MAX_MIDI_BUDGET_FACTOR:
+                self.__midi_budget_factor += 1
+        else:
+            self.__midi_budget_factor = 1
+
     # Callback called when the measurement wants to show something
     def measurement_updated(self, measurement):
         collect()
         do_print(f"{ fill_up_to(str(measurement.name), 30, '.') }: Max { repr(measurement.value) }ms, Avg { repr(measurement.average) }ms, Calls: { repr(measurement.calls) }, Free: { format_size(mem_free()) }")
 
+
+# Returns the name of a component for the profiler output
+def _get_profiler_name(obj):
+    name = obj.__class__.__name__
+    
+    if hasattr(obj, "id") and obj.id:
+        return f"{ name } { obj.id }"
+    
+    return name
@@ -66,6 +66,9 @@ class SwitchController:
 
         # Sort order for the strobe tuner
         self.strobe_order = get_option(config["assignment"], "strobeOrder", 0)
+
+        # Optional LatencyMeasurement instance which is notified about all state changes triggering actions (set by the Controller)
+        self.latency = None
         
     # Process the switch: Check if it is currently pushed, set state accordingly
     def process(self):
@@ -88,6 +91,10 @@ class SwitchController:
                             self.__hold_was_active = False
                             return
 
+                    # In hold mode, the actions are triggered on release
+                    if self.latency and self.__actions_hold:
+                        self.latency.input_edge()
+
                     for action in self.__actions:
                         if not action.enabled:
                             continue
@@ -117,6 +124,10 @@ class SwitchController:
         # Mark as pushed (prevents redundant messages in the following ticks, when the switch can still be down)
         self.__pushed_state = True
 
+        # In hold mode, the push does not trigger any actions (except for override actions)
+        if self.latency and (self.override_action or not self.__actions_hold):
+            self.latency.input_edge()
+
         if self.override_action:
             if not self.override_action.push():
                 return
@@ -1,4 +1,5 @@
-from ..misc import EventEmitter, Updateable, get_current_millis
+from array import array
+from ..misc import EventEmitter, Updateable, get_current_millis, do_print, fill_up_to
 
 # Measurement of runtimes 
 class RuntimeMeasurement(EventEmitter, Updateable):  
@@ -76,3 +77,251 @@ class RuntimeMeasurement(EventEmitter, Updateable):
 #    def measurement_updated(self, measurement):
 #        pass
 
+
+
+################################################################################
+
+
+# Measures the latency from switch state changes which trigger actions (input edges) until the next SET message 
+# has been sent, and collects the results in a fixed size histogram. The SwitchControllers call input_edge(), 
+# the Client calls message_sent() for all SET messages (only if set, so this has no cost when not used). Requests 
+# and other messages are not regarded.
+class LatencyMeasurement(Updateable):
+
+    # interval_millis:   Interval for printing the report (only if new samples came in)
+    # bin_width_micros:  Width of one histogram bin
+    # num_bins:          Number of bins. Latencies exceeding num_bins * bin_width_micros are counted in an overflow bin.
+    # timeout_millis:    Input edges not followed by a sent message within this time are counted as unmatched.
+    def __init__(self, interval_millis = 2000, bin_width_micros = 250, num_bins = 64, timeout_millis = 1000):
+        from time import monotonic_ns
+        self.__monotonic_ns = monotonic_ns
+
+        self.update_interval_millis = interval_millis
+
+        self.bin_width_micros = bin_width_micros
+        self.__bin_width_ns = bin_width_micros * 1000
+        self.__timeout_ns = timeout_millis * 1000000
+        
+        # Last bin is the overflow bin
+        self.bins = array('L', (0 for i in range(num_bins + 1)))
+        
+        self.__edge_ns = 0
+        self.__reported = 0
+
+        self.clear()
+
+    # Clears all samples
+    def clear(self):
+        bins = self.bins
+        for i in range(len(bins)):
+            bins[i] = 0
+
+        self.count = 0
+        self.unmatched = 0
+        self.min = 0                   # Microseconds
+        self.max = 0                   # Microseconds
+
+        self.__reported = 0
+
+    # Called by the switches on every state change
+    def input_edge(self):
+        if self.__edge_ns:
+            # Previous edge did not cause any MIDI output
+            self.unmatched += 1
+
+        self.__edge_ns = self.__monotonic_ns()
+
+    # Called after a MIDI message has been sent
+    def message_sent(self):
+        edge = self.__edge_ns
+        if not edge:
+            return
+        
+        self.__edge_ns = 0
+
+        diff = self.__monotonic_ns() - edge
+        if diff > self.__timeout_ns:
+            self.unmatched += 1
+            return
+
+        self.add(diff // 1000)
+
+    # Adds a latency sample (microseconds)
+    def add(self, micros):
+        bins = self.bins
+        index = (micros * 1000) // self.__bin_width_ns
+
+        if index >= len(bins):
+            index = len(bins) - 1
+
+        bins[index] += 1
+
+        if not self.count or micros < self.min:
+            self.min = micros
+
+        if micros > self.max:
+            self.max = micros
+
+        self.count += 1
+
+    # Returns the given percentile (0-100) in microseconds. The result is the upper bound of the bin
+    # containing the percentile (or the maximum if it is in the overflow bin).
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        
+        # Rank of the sample (rounded up)
+        rank = (self.count * p + 99) // 100
+        if rank < 1:
+            rank = 1
+
+        bins = self.bins
+        last = len(bins) - 1
+        aggr = 0
+
+        for i in range(last):
+            aggr += bins[i]
+            if aggr >= rank:
+                bound = (i + 1) * self.bin_width_micros
+                return bound if bound < self.max else self.max
+
+        return self.max
+
+    # Returns all data as a dict (for example for JSON export). All times in microseconds.
+    def export(self):
+        return {
+            "count": self.count,
+            "unmatched": self.unmatched,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "binWidth": self.bin_width_micros,
+            "bins": list(self.bins)
+        }
+    
+    # Returns a one-line report
+    def report(self):
+        return f"Latency (switch to MIDI out): p50 { self.percentile(50) }us, p95 { self.percentile(95) }us, p99 { self.percentile(99) }us, Max { self.max }us, Samples: { self.count }, Unmatched: { self.unmatched }"
+
+    # Prints the report if new samples have come in since the last output
+    def update(self):
+        if self.count == self.__reported:
+            return
+        
+        self.__reported = self.count
+        do_print(self.report())
+
+
+################################################################################
+
+
+# Profiler which attributes run time to components (updateables, inputs, client etc.). Functions are wrapped once 
+# at setup (see wrap()), and all data is stored in preallocated arrays, so measuring does not allocate memory.
+# Components with the same name share a slot. A top-N table is printed periodically.
+class TickProfiler(Updateable):
+
+    # interval_millis:   Interval for printing the report
+    # top:               Number of components to show in the report
+    # max_slots:         Maximum number of distinct components. The last slot is reserved for all components exceeding this.
+    def __init__(self, interval_millis = 5000, top = 10, max_slots = 48):
+        from time import monotonic_ns
+        self.__monotonic_ns = monotonic_ns
+
+        self.update_interval_millis = interval_millis
+        self.top = top
+
+        self.names = []
+        self.__max_slots = max_slots
+
+        # All times in microseconds
+        self.sums = array('L', (0 for i in range(max_slots)))
+        self.maxs = array('L', (0 for i in range(max_slots)))
+        self.calls = array('L', (0 for i in range(max_slots)))
+
+        self.__start = monotonic_ns()
+
+    # Returns the slot index for the given name (adds a new slot if not existing)
+    def slot(self, name):
+        if name in self.names:
+            return self.names.index(name)
+        
+        # Full: The remaining ones share the last slot, which is reserved for them
+        if len(self.names) >= self.__max_slots - 1:
+            if len(self.names) < self.__max_slots:
+                self.names.append("(Other)")
+
+            return self.__max_slots - 1
+        
+        self.names.append(name)
+        return len(self.names) - 1
+
+    # Returns a wrapper for func, which measures the run time of every call. Only functions with 0 or 1 
+    # arguments are supported (no argument packing to avoid allocations).
+    def wrap(self, func, name, num_args = 0):
+        slot = self.slot(name)
+        monotonic_ns = self.__monotonic_ns
+        add = self.add
+
+        if num_args == 0:
+            def wrapper():
+                start = monotonic_ns()
+                ret = func()
+                add(slot, monotonic_ns() - start)
+                return ret
+            
+        elif num_args == 1:
+            def wrapper(arg):
+                start = monotonic_ns()
+                ret = func(arg)
+                add(slot, monotonic_ns() - start)
+                return ret
+            
+        else:
+            raise Exception() # Only up to one argument supported
+
+        return wrapper
+
+    # Adds a measurement (nanoseconds) to the slot
+    def add(self, slot, nanos):
+        micros = nanos // 1000
+
+        self.sums[slot] += micros
+        self.calls[slot] += 1
+
+        if micros > self.maxs[slot]:
+            self.maxs[slot] = micros
+
+    # Resets all measurements
+    def clear(self):
+        for i in range(self.__max_slots):
+            self.sums[i] = 0
+            self.maxs[i] = 0
+            self.calls[i] = 0
+
+        self.__start = self.__monotonic_ns()
+
+    # Returns the report as list of lines (top N components by run time)
+    def report(self):
+        elapsed = (self.__monotonic_ns() - self.__start) // 1000
+        
+        slots = sorted(range(len(self.names)), key = lambda i: self.sums[i], reverse = True)
+        ret = [f"Profiler: Top { self.top } of { len(self.names) } in { elapsed // 1000 }ms"]
+
+        for i in slots[:self.top]:
+            calls = self.calls[i]
+            if not calls:
+                break
+
+            share = (self.sums[i] * 100 // elapsed) if elapsed else 0
+            ret.append(f"{ fill_up_to(self.names[i], 30, '.') }: Sum { self.sums[i] // 1000 }ms ({ share }%), Max { self.maxs[i] }us, Avg { self.sums[i] // calls }us, Calls: { calls }")
+
+        return ret
+
+    # Prints the report and starts a new measurement period
+    def update(self):
+        for line in self.report():
+            do_print(line)
+
+        self.clear()
@@ -1,3 +1,5 @@
+from micropython import const
+
 # MIDI Message types: These are all needed to be imported, despite not used: If not, no messages
 # will go through the MIDI routings. If you encounter that messages are not forwarded, the type 
 # might perhaps miss here. (not all are enabled by default to minimize RAM usage).
@@ -31,13 +33,54 @@ from adafruit_midi.system_exclusive import SystemExclusive
 ##################################################################################################
 
 
+# SysEx message which is encoded only once: The raw message (including status bytes) is held in a buffer, and data bytes 
+# are patched in place (see set_data()). MIDI devices write the buffer directly instead of encoding the message on every 
+# send (see AdafruitUsbMidiDevice.send()). For all other purposes, this is a normal SystemExclusive message.
+class EncodedSystemExclusive(SystemExclusive):
+    def __init__(self, manufacturer_id, data):
+        super().__init__(manufacturer_id, data)
+
+        self.data = bytearray(data)
+        
+        self.encoded = bytearray(len(self.manufacturer_id) + len(self.data) + 2)
+        self.encoded[0] = 0xf0
+        self.encoded[-1] = 0xf7
+
+        self.__offset = len(self.manufacturer_id) + 1
+
+        for i in range(len(self.manufacturer_id)):
+            self.encoded[1 + i] = self.manufacturer_id[i]
+
+        for i in range(len(self.data)):
+            self.encoded[self.__offset + i] = self.data[i]
+
+    # Sets a data byte (in the data and the encoded buffer)
+    def set_data(self, index, value):
+        self.data[index] = value
+        self.encoded[self.__offset + index] = value
+
+    def __bytes__(self):
+        return bytes(self.encoded)
+
+
+##################################################################################################
+
+
 # Describes a routing from source to target, which must be MidiDevices definitions.
 class MidiRouting:
 
     # Used as source/target for routings to/from the application itself
     APPLICATION = 1
 
-    def __init__(self, source, target):
+    # raw:            Forward raw byte chunks instead of decoded messages (external routings only). This is much faster
+    #                 and does not drop messages which adafruit_midi does not know. Chunks are cut at message boundaries
+    #                 (see RawMidiForwarder), so the targets can receive messages from other routings, too. Only applied 
+    #                 if all routings from the source are raw and both devices support it (see MidiController). If the 
+    #                 source is also routed to the application, the application gets the messages parsed from the same 
+    #                 bytes (this needs the streaming parser on the source device). Otherwise, messages are routed as usual.
+    # exclude_status: List of status bytes to be filtered out. Channel messages are addressed by their status 
+    #                 without channel (0x80 to 0xe0), system messages by their exact status (for example 0xf8 for MIDI clock).
+    def __init__(self, source, target, raw = False, exclude_status = None):
         # Source MIDI device (can be either a AdafruitXXXMidiDevice or 
         # MidiController.PYSWITCH for the application itself)
         self.source = source    
@@ -45,11 +88,185 @@ class MidiRouting:
         # Target MIDI device (can be either a AdafruitXXXMidiDevice or 
         # MidiController.PYSWITCH for the application itself)
         self.target = target    
+
+        self.raw = raw
+
+        # Lookup table for the status filter: 1 for all status bytes which pass (computed once)
+        self.status_table = None
+
+        if exclude_status:
+            self.status_table = bytearray(256)
+            
+            for status in range(0x80, 0x100):
+                self.status_table[status] = 0 if (status & 0xf0 if status < 0xf0 else status) in exclude_status else 1
+
+            # End of SysEx follows the SysEx status
+            self.status_table[0xf7] = self.status_table[0xf0]
+
+        self.__passing = 1   # Filter state for raw data: Does the current message pass?
+
+    # Copies num bytes from data to out, leaving out all messages filtered by status. Returns the number of bytes
+    # written to out. The status is remembered, so messages can be split between chunks.
+    def filter_raw(self, data, num, out):
+        table = self.status_table
+        passing = self.__passing
+        num_out = 0
+
+        for i in range(num):
+            b = data[i]
+
+            if b >= 0xf8:
+                # Realtime messages can occur anywhere, even inside other messages
+                if table[b]:
+                    out[num_out] = b
+                    num_out += 1
+                continue
+
+            if b & 0x80:
+                passing = table[b]
+
+            if passing:
+                out[num_out] = b
+                num_out += 1
+
+        self.__passing = passing
+        return num_out
         
 
 ##################################################################################################
 
 
+# Size of the buffers used for raw routings
+_RAW_BUFFER_SIZE = const(64)
+
+
+# Returns the number of data bytes following a status byte (-1 for SysEx, which is terminated by 0xf7)
+def _raw_data_length(status):
+    if status < 0xc0 or (status >= 0xe0 and status < 0xf0) or status == 0xf2:
+        return 2
+    
+    if status < 0xe0 or status == 0xf1 or status == 0xf3:
+        return 1
+    
+    if status == 0xf0:
+        return -1
+    
+    return 0
+
+
+# Forwards raw MIDI data of one source to the targets of its raw routings. Data is only written up to the end of the 
+# last complete message: An incomplete message at the end of a chunk is carried over and written with the next chunk, 
+# so other messages sent to the targets in between (from the application or other sources) do not end up inside 
+# a message. Only messages longer than the carry buffer (large SysEx) are written in parts.
+class RawMidiForwarder:
+
+    def __init__(self, routings, carry_size = _RAW_BUFFER_SIZE):
+        self.__routings = routings
+
+        self.__carry = bytearray(carry_size)
+        self.__num_carry = 0
+
+        self.__out = bytearray(_RAW_BUFFER_SIZE)    # Buffer for filtered data (grown if larger chunks are passed)
+
+        # Parser state (kept between chunks)
+        self.__status = 0       # Running status (channel messages only)
+        self.__remaining = 0    # Number of data bytes missing for the current message (-1 inside SysEx)
+
+    # Forwards num bytes of data
+    def forward(self, data, num):
+        end = self.__find_end(data, num)
+
+        carry = self.__carry
+        num_carry = self.__num_carry
+        
+        if end == 0 and num_carry + num <= len(carry):
+            # No message completed: Just carry over
+            for i in range(num):
+                carry[num_carry + i] = data[i]
+
+            self.__num_carry += num
+            return
+        
+        if num - end > len(carry):
+            # Incomplete message does not fit into the carry buffer: Write all
+            end = num
+
+        if num_carry:
+            self.__write(carry, num_carry)
+        
+        if end:
+            self.__write(data, end)
+
+        # Carry over the incomplete message
+        for i in range(end, num):
+            carry[i - end] = data[i]
+
+        self.__num_carry = num - end
+
+    # Returns the end position of the last complete message in data
+    def __find_end(self, data, num):
+        status = self.__status
+        remaining = self.__remaining
+        end = 0
+
+        for i in range(num):
+            b = data[i]
+
+            if b >= 0xf8:
+                # Realtime messages can occur anywhere, even inside other messages
+                if remaining == 0:
+                    end = i + 1
+                continue
+
+            if b & 0x80:
+                # A status byte ends all previous messages (also incomplete ones)
+                end = i
+
+                if b == 0xf7 and remaining < 0:
+                    # End of SysEx
+                    remaining = 0
+                    end = i + 1
+                    continue
+
+                status = b if b < 0xf0 else 0
+                remaining = _raw_data_length(b)
+
+                if remaining == 0:
+                    end = i + 1
+                continue
+
+            # Data bytes
+            if remaining > 0:
+                remaining -= 1
+
+            elif remaining == 0 and status:
+                # Running status
+                remaining = _raw_data_length(status) - 1
+
+            if remaining == 0:
+                end = i + 1
+
+        self.__status = status
+        self.__remaining = remaining
+
+        return end
+    
+    # Writes num bytes of buffer to all targets
+    def __write(self, buffer, num):
+        for r in self.__routings:
+            if not r.status_table:
+                r.target.write_raw(buffer, num)
+                continue
+                
+            if len(self.__out) < num:
+                self.__out = bytearray(num)
+            
+            num_filtered = r.filter_raw(buffer, num, self.__out)
+            if num_filtered:
+                r.target.write_raw(self.__out, num_filtered)
+
+
+
 # MIDI Communication wrapper. Can distribute/merge from/to application and external MIDI
 # controllers, as defined ba routings. Remember that you have to define routes from and to
 # the application manually!
@@ -59,7 +276,47 @@ class MidiController:
     def __init__(self, routings):
         self.__routings_from_appl = [x for x in routings if x.source == MidiRouting.APPLICATION]
         self.__routings_to_appl = [x for x in routings if x.target == MidiRouting.APPLICATION]
-        self.__routings_external = [x for x in routings if x.source != MidiRouting.APPLICATION and x.target != MidiRouting.APPLICATION]
+
+        routings_external = [x for x in routings if x.source != MidiRouting.APPLICATION and x.target != MidiRouting.APPLICATION]
+        sources_to_appl = [x.source for x in self.__routings_to_appl]
+
+        # Routing tables for external routings (computed once): Lists of (source, [routings]) tuples for decoded
+        # messages, and (source, RawMidiForwarder) tuples for raw routings
+        self.__sources_external = []
+        self.__sources_raw = []
+
+        sources = []
+        for r in routings_external:
+            if r.source in sources:
+                continue
+
+            sources.append(r.source)
+            source_routings = [x for x in routings_external if x.source == r.source]
+
+            to_appl = r.source in sources_to_appl
+
+            raw = (
+                hasattr(r.source, "tee_raw" if to_appl else "read_raw") and
+                len([x for x in source_routings if not x.raw or not hasattr(x.target, "write_raw")]) == 0
+            )
+
+            if raw:
+                forwarder = RawMidiForwarder(source_routings)
+
+                if to_appl:
+                    # The device passes all bytes it reads for the application to the forwarder
+                    raw = r.source.tee_raw(forwarder.forward)
+                else:
+                    self.__sources_raw.append((r.source, forwarder))
+
+            if not raw:
+                self.__sources_external.append((r.source, source_routings))
+
+        if self.__sources_raw:
+            self.__raw_buffer = bytearray(_RAW_BUFFER_SIZE)
+
+        # Sources routed to the application which can report a backlog
+        self.__backlog_sources = [x.source for x in self.__routings_to_appl if hasattr(x.source, "backlog")]
 
     def send(self, midi_message):
         # Send to all routings which have APPLICATION as source
@@ -78,40 +335,252 @@ class MidiController:
                 # Return first message for APPLICATION in the queue (next ticks will deliver the next messages)
                 return msg                
     
-    # Process all routings where APPLICATION is not involved (this processes one message of each source every time)
-    def __process_external_routings(self):
-        routings = self.__routings_external
-        if not routings:
-            return
-        
-        # Get all sources messages
-        sources = []
-        results = []
+    # Returns if any source routed to the application reports a backlog (input buffer close to overflowing)
+    @property
+    def backlog(self):
+        for source in self.__backlog_sources:
+            if source.backlog:
+                return True
+            
+        return False
 
-        for r in routings:
-            if r.source in sources:
+    # Process all routings where APPLICATION is not involved (this processes one message (or raw chunk) 
+    # of each source every time)
+    def __process_external_routings(self):
+        for source, routings in self.__sources_external:
+            msg = source.receive()
+    
+            if not msg:
+                continue
+            
+            if isinstance(msg, MIDIUnknownEvent):
+                continue
+            
+            status = getattr(msg, "_STATUS", None)
+            if status is None:
                 continue
-
-            sources.append(r.source)
-            results.append(r.source.receive())
             
-        # Distribute messages
-        for r in routings:
-            for i in range(len(sources)):
-                if sources[i] != r.source:
+            for r in routings:
+                if r.status_table and not r.status_table[status]:
                     continue
 
-                msg = results[i]
+                r.target.send(msg)
+
+        for source, forwarder in self.__sources_raw:
+            buffer = self.__raw_buffer
+            
+            num = source.read_raw(buffer)
+            if not num:
+                continue
+
+            forwarder.forward(buffer, num)
+
+
+##################################################################################################
+
+
+# Status lookup table (shared by all parsers): Message class and length for all 256 status bytes (length 0 means
+# variable length, terminated by the message class's ENDSTATUS). Built from the message types registered 
+# in adafruit_midi, and rebuilt when new types have been registered.
+_status_classes = None
+_status_lengths = bytearray(256)
+_num_registered_types = -1
+
+def _update_status_table():
+    global _status_classes, _num_registered_types
+
+    registered = MIDIMessage._statusandmask_to_class
+    if len(registered) == _num_registered_types:
+        return
+    
+    _status_classes = [None] * 256
+    
+    for status in range(0x80, 0x100):
+        # The registered list is ordered by specificity (most specific masks first), so the first match wins
+        for status_and_mask, message_class in registered:
+            if status & status_and_mask[1] == status_and_mask[0]:
+                _status_classes[status] = message_class
+                _status_lengths[status] = message_class.LENGTH if message_class.LENGTH > 0 else 0
+                break
+
+    _num_registered_types = len(registered)
+
+
+# Streaming MIDI parser, used by the MIDI devices instead of adafruit_midi.MIDI.receive(). Bytes are read from the
+# port into a fixed buffer and fed through a state machine one by one, so no buffer copies are made per message.
+# Status bytes are looked up in a 256 entry table. SysEx messages are reassembled in a separate buffer, so they can be
+# larger than the input buffer. Supports running status and realtime messages between the bytes of other messages.
+#
+# NOTE: The from_bytes() methods of the message classes get passed reused buffers, so they must not keep references 
+# to them (which is the case for all adafruit_midi message types).
+class MidiStreamParser:
+
+    # port:           Input port. Must provide readinto(buffer) returning the number of bytes read (or None).
+    # in_buf_size:    Size of the input buffer
+    # in_channel:     Channel filter (as for adafruit_midi: None for all channels, an int or a tuple of channels)
+    # max_sysex_size: Maximum length of SysEx messages (including start and end status). Longer messages are dropped.
+    def __init__(self, port, in_buf_size = 100, in_channel = None, max_sysex_size = 512):
+        self.__port = port
         
-                if not msg:
-                    continue
-                
-                if isinstance(msg, MIDIUnknownEvent):
-                    continue
+        self.__buffer = bytearray(in_buf_size)
+        self.__pos_buffer = 0            # Read position
+        self.__count = 0                 # Number of unparsed bytes in the buffer
+
+        # Buffers for the fixed length messages, by length
+        self.__messages = (None, bytearray(1), bytearray(2), bytearray(3))
+        self.__message = None            # Message being assembled
+        self.__status = 0                # Status of the message being assembled (0 if none)
+        self.__pos = 0                   # Next position to write in self.__message
+
+        self.__sysex = bytearray(max_sysex_size)
+        self.__sysex_pos = -1            # Length of the SysEx message being assembled (-1 if none)
+        
+        # Bit mask of accepted channels
+        if in_channel == None:
+            self.__channel_mask = 0xffff
+        elif isinstance(in_channel, int):
+            self.__channel_mask = 1 << in_channel
+        else:
+            self.__channel_mask = 0
+            for c in in_channel:
+                self.__channel_mask |= 1 << c
+
+        self.backlog = False             # True if the last read has filled the whole input buffer (more data is likely waiting)
+        self.skipped_bytes = 0           # Number of data bytes without status
+        self.dropped_sysex = 0           # Number of SysEx messages which have been too long or have been interrupted
+
+        # Optional callback(buffer, num) which gets all bytes read from the port (used by raw MIDI routings)
+        self.tee = None
+
+        _update_status_table()
+
+    # Returns the next message, or None if no complete message is available. Reads from the port at most once.
+    def receive(self):
+        msg = self.__parse()
+        if msg:
+            return msg
+
+        # All bytes have been parsed: Read what the port has to offer
+        num_read = self.__port.readinto(self.__buffer)
+        if not num_read:
+            self.backlog = False
+            return None
+        
+        self.backlog = (num_read == len(self.__buffer))
+
+        if self.tee:
+            self.tee(self.__buffer, num_read)
+        
+        self.__pos_buffer = 0
+        self.__count = num_read
+
+        return self.__parse()
+    
+    # Feeds the buffered bytes to the state machine until a message is complete
+    def __parse(self):
+        buffer = self.__buffer
+
+        while self.__count > 0:
+            b = buffer[self.__pos_buffer]
+
+            self.__pos_buffer += 1
+            self.__count -= 1
+
+            msg = self.__feed(b)
+            if msg:
+                return msg
+
+        return None
+
+    # State machine: Takes one byte, returns a message if complete
+    def __feed(self, b):
+        if b >= 0xf8:
+            # Realtime messages can occur anywhere, even inside other messages
+            return self.__create(b, self.__messages[1])
+        
+        if b & 0x80:
+            return self.__feed_status(b)
+        
+        # Data byte
+        if self.__sysex_pos >= 0:
+            if self.__sysex_pos < len(self.__sysex):
+                self.__sysex[self.__sysex_pos] = b
                 
-                if getattr(msg, "_STATUS", None) is None:
-                    continue
+            self.__sysex_pos += 1
+            return None
+        
+        if not self.__status:
+            self.skipped_bytes += 1
+            return None
+
+        message = self.__message
+        message[self.__pos] = b
+        self.__pos += 1
+
+        if self.__pos < len(message):
+            return None
+        
+        # Message complete: Keep the status for running status (channel messages only)
+        status = self.__status
+        if status < 0xf0:
+            self.__pos = 1
+        else:
+            self.__status = 0
+
+        return self.__create(status, message)
+    
+    # Status bytes (except realtime)
+    def __feed_status(self, status):
+        if self.__sysex_pos >= 0:
+            sysex_len = self.__sysex_pos
+            self.__sysex_pos = -1
+
+            sysex_class = _status_classes[self.__sysex[0]]
+            if status == sysex_class.ENDSTATUS:
+                if sysex_len < len(self.__sysex):
+                    self.__sysex[sysex_len] = status
+                    return sysex_class.from_bytes(self.__sysex[:sysex_len + 1])
                 
-                r.target.send(msg)
+                self.dropped_sysex += 1
+                return None
+            
+            # Interrupted by another status
+            self.dropped_sysex += 1
+                    
+        self.__status = 0
 
-                break
+        message_class = _status_classes[status]
+        if not message_class:
+            return MIDIUnknownEvent(status)
+        
+        length = _status_lengths[status]
+
+        if length == 0:
+            # Variable length message (SysEx)
+            self.__sysex[0] = status
+            self.__sysex_pos = 1
+            return None
+        
+        message = self.__messages[length]
+        message[0] = status
+
+        if length == 1:
+            return self.__create(status, message)
+        
+        self.__status = status
+        self.__message = message
+        self.__pos = 1
+
+        return None
+
+    # Creates a message (filtered by channel)
+    def __create(self, status, data):
+        if status < 0xf0 and not (self.__channel_mask & (1 << (status & 0x0f))):
+            return None
+        
+        message_class = _status_classes[status]
+        if not message_class:
+            return MIDIUnknownEvent(status)
+        
+        data[0] = status
+        return message_class.from_bytes(data)
@@ -1,7 +1,15 @@
-from ..misc import PeriodCounter
+from micropython import const
+from ..misc import PeriodCounter, Updateable
 from ..colors import Colors
 
-class StrobeController:
+# Resolution of the strobe phase (steps per revolution, must be a power of two)
+_PHASE_STEPS = const(512)
+
+# Number of brightness levels (the brightness is quantized to avoid flickering)
+_BRIGHTNESS_LEVELS = const(16)
+
+
+class StrobeController(Updateable):
 
     def __init__(self,
                  mapping_state,                     # Mapping for tuner mode state (1 == enabled)
@@ -13,34 +21,50 @@ class StrobeController:
                  max_fps = 120,                     # Maximum cumulative frame rate for update of strobe tuner LEDs. Reduce this to save processing power.
                                                     # The number will be divided by the amount of available switches to get the real max. frame rate (that's
                                                     # why it is called cumulative ;)
-                 reverse = False                    # By default, the strobe is rotating clockwise when too high / ccw when too low. 
+                 reverse = False,                   # By default, the strobe is rotating clockwise when too high / ccw when too low.
                                                     # Set this to True to reverse this.
+                 frame_rate = 0                     # If set, the strobe LEDs are updated with this frame rate (frames per second) using the latest
+                                                    # deviance received, instead of on every incoming message (max_fps still applies).
         ):
         self.__mapping_state = mapping_state
         self.__mapping_deviance = mapping_deviance
 
-        self.__speed = speed * 2000                 # Determined empirically
-        self.__width = width
+        self.__speed = int(speed * 2000)            # Determined empirically
         self.__color = color
-        self.__dim_factor = dim_factor
         self.__max_fps = max_fps
-        
+
         self.__switches = None               # List of switches ordered for strobe
-        self.__period = None        
-        self.__strobe_pos = 0
+        self.__period = None
+        self.__strobe_pos = 0                # Position in range [0..speed)
         self.__last_deviance = 8192
         self.__reverse = reverse
 
         self.__enabled = False
+        self.__color_set = False
+
+        # Divisor to get the phase step from the strobe position
+        self.__phase_divisor = max(1, self.__speed // _PHASE_STEPS)
+
+        # Lookup tables: Brightness level by phase step (starts with full brightness, goes to zero in the middle
+        # and goes up to full brightness again at the end), and output brightness by level (using the square of
+        # the brightness to accomodate for the non-linear NeoPixels)
+        self.__phase_levels = _create_phase_levels(width)
+        self.__level_brightnesses = tuple([(i / _BRIGHTNESS_LEVELS) * (i / _BRIGHTNESS_LEVELS) * dim_factor for i in range(_BRIGHTNESS_LEVELS + 1)])
+
+        # With a frame rate, the LEDs are only updated in update()
+        self.__use_frame_rate = bool(frame_rate)
+
+        if frame_rate:
+            self.update_interval_millis = int(1000 / frame_rate)
 
     def init(self, appl):
         # Register mappings
         appl.client.register(self.__mapping_state, self)
         appl.client.register(self.__mapping_deviance, self)
-        
+
         # Bring the switches into the correct order for strobe
         self.__switches = [s for s in appl.inputs if hasattr(s, "pixels")]
-        self.__current_strobe_brightnesses = [0 for s in self.__switches]
+        self.__current_strobe_brightnesses = [-1 for s in self.__switches]
 
         # Period counter for saving LED updates (restricts the updates to a certain frame rate)
         period = int(1000 / self.__max_fps * len(self.__switches))
@@ -53,17 +77,29 @@ class StrobeController:
 
         # Numer of switches: If this equals the amount of switches, you get one dot
         # running in the circle. If this equals half the available switches, it will show
-        # two dots and so on. 
+        # two dots and so on.
         self.__num_switches = len(self.__switches)
         # if self.__num_switches > 4:
         #     self.__num_switches = self.__num_switches / 2
 
+        # Phase offsets of the switches. These are even, so two switches never get the same brightness from 
+        # both sides of the highlight (see _create_phase_levels()).
+        self.__switch_offsets = [int(i * _PHASE_STEPS / self.__num_switches / 2) * 2 for i in range(self.__num_switches)]
+
+        # Update periodically, so the strobe keeps moving between incoming deviance values. If no frame rate
+        # is set, the maximum frame rate is used.
+        if self.__num_switches > 1:
+            if not self.update_interval_millis:
+                self.update_interval_millis = max(1, period)
+
+            appl.add_updateable(self)
+
     # Listen to client value returns
     def parameter_changed(self, mapping):
         if self.__num_switches <= 1:
             self.__enabled = False
             return
-        
+
         value = mapping.value
 
         if mapping == self.__mapping_state:
@@ -71,31 +107,40 @@ class StrobeController:
                 # Tuner on
                 self.__enabled = True
                 self.__period.reset()
+
+                # Color and all brightnesses have to be set on the next frame
+                self.__color_set = False
+                for i in range(self.__num_switches):
+                    self.__current_strobe_brightnesses[i] = -1
             else:
                 # Tuner off
                 self.__enabled = False
 
         if mapping == self.__mapping_deviance:
             if value != self.__last_deviance:
-                self.__last_deviance = value               
+                self.__last_deviance = value
 
-            self.__update_strobe()
+            if not self.__use_frame_rate:
+                self.__update_strobe()
 
     # Called when the client is offline (requests took too long)
     def request_terminated(self, mapping):
         pass                                       # pragma: no cover
 
+    # Updates the strobe LEDs periodically (the phase moves on with the last deviance received)
+    def update(self):
+        self.__update_strobe()
+
     # Update the strobe LEDs
     def __update_strobe(self):
         if not self.__enabled:
             return
-        
+
         passed = self.__period.passed
         if not self.__period.exceeded:
             return
 
         speed = self.__speed
-        width = self.__width
 
         # Accumulate deviances and restrict range
         delta = (8191 - self.__last_deviance) if self.__reverse else (self.__last_deviance - 8191)
@@ -105,48 +150,56 @@ class StrobeController:
             delta = threshold
         if delta < -threshold:
             delta = -threshold
-        
-        self.__strobe_pos -= delta * passed
-
-        while self.__strobe_pos > speed:
-            self.__strobe_pos -= speed
-        while self.__strobe_pos < -speed:
-            self.__strobe_pos += speed
-        
-        # Put to range [0..1], regarding speed
-        pos = (self.__strobe_pos % speed) / speed
-
-        # Defines the period function in range [0..1] for inputs in range [0..1] 
-        # (starts with 1, goes to zero in the middle and goes up to 1 again at the end)
-        def b(p, width):
-            if p <= width:
-                return 1 - p * (1 / width)
-            elif p >= 1 - width:
-                return (p - 1 + width) * (1 / width)
-            else:
-                return 0
-
-        # Color each switch
-        for switch_num in range(len(self.__switches)):
-            switch = self.__switches[switch_num]
-            
-            # Position inside the period [0..1]
-            p = pos + switch_num / self.__num_switches
-
-            while p > 1:
-                p -= 1
-            while p < 0:
-                p += 1
-
-            # Brightness [0..1]
-            brightness = b(p, width)
-            brightness = int(brightness * 16) / 16
-            
-            # Use the square of the calculated brightness to accomodate for the non-linear NeoPixels
-            switch.color = self.__color
-            brightness_out = (brightness * brightness) * self.__dim_factor
-
-            if self.__current_strobe_brightnesses[switch_num] != brightness_out:
-                self.__current_strobe_brightnesses[switch_num] = brightness_out
-
-                switch.brightness = brightness_out
\ No newline at end of file
+
+        # Position in range [0..speed) (the result of the modulo is always positive)
+        self.__strobe_pos = (self.__strobe_pos - delta * passed) % speed
+
+        # Phase step of the first switch
+        phase = self.__strobe_pos // self.__phase_divisor
+
+        phase_levels = self.__phase_levels
+        level_brightnesses = self.__level_brightnesses
+        current = self.__current_strobe_brightnesses
+        switches = self.__switches
+        offsets = self.__switch_offsets
+
+        set_color = not self.__color_set
+        self.__color_set = True
+
+        # Set brightness of each switch
+        for switch_num in range(self.__num_switches):
+            switch = switches[switch_num]
+
+            if set_color:
+                switch.color = self.__color
+
+            brightness_out = level_brightnesses[phase_levels[(phase + offsets[switch_num]) & (_PHASE_STEPS - 1)]]
+
+            if current[switch_num] != brightness_out:
+                current[switch_num] = brightness_out
+
+                switch.brightness = brightness_out
+
+
+# Creates the table of brightness levels by phase step for the given width of the highlight in range [0..1]. Each
+# step is sampled at its border closest to the center of the highlight, so both sides are exact mirrors with an odd 
+# distance (see the switch offsets).
+def _create_phase_levels(width):
+    ret = bytearray(_PHASE_STEPS)
+
+    for i in range(_PHASE_STEPS):
+        if i < _PHASE_STEPS / 2:
+            p = i / _PHASE_STEPS
+        else:
+            p = (i + 1) / _PHASE_STEPS
+
+        if p <= width:
+            b = 1 - p * (1 / width)
+        elif p >= 1 - width:
+            b = (p - 1 + width) * (1 / width)
+        else:
+            b = 0
+
+        ret[i] = int(b * _BRIGHTNESS_LEVELS)
+
+    return ret
@@ -2,6 +2,8 @@ from adafruit_midi import MIDI as _MIDI
 from adafruit_midi.midi_message import MIDIUnknownEvent as _MIDIUnknownEvent
 from busio import UART as _UART
 
+from ...controller.midi import MidiStreamParser as _MidiStreamParser, EncodedSystemExclusive as _EncodedSystemExclusive
+
 # DIN MIDI Device
 class AdafruitDinMidiDevice:
     def __init__(self, 
@@ -12,6 +14,8 @@ class AdafruitDinMidiDevice:
                  timeout,
                  in_channel = None,   # All
                  out_channel = 0, 
+                 non_blocking = True, # Only read the bytes already waiting in the UART, instead of waiting for the timeout
+                 stream_parser = True # Use the PySwitch streaming parser instead of adafruit_midi for receiving
         ):
 
         midi_uart = _UART(
@@ -21,14 +25,30 @@ class AdafruitDinMidiDevice:
             timeout = timeout
         ) 
 
+        # Idle detection (see receive()) is only done with the streaming parser: adafruit_midi returns None for messages 
+        # dropped by the channel filter, too, while further messages can still be waiting in its own input buffer.
+        self.__uart = midi_uart if (non_blocking and stream_parser) else None
+        self.__idle = False
+
+        port_in = _NonBlockingUartPort(midi_uart) if non_blocking else midi_uart
+
+        self.__port_in = port_in
+        self.__port_out = midi_uart
+
         self.__midi = _MIDI(
             midi_out = midi_uart, 
             out_channel = out_channel,
-            midi_in = midi_uart, 
+            midi_in = port_in if not stream_parser else None, 
             in_channel = in_channel,
             in_buf_size = in_buf_size
         )
 
+        self.__receiver = _MidiStreamParser(
+            port = port_in,
+            in_buf_size = in_buf_size,
+            in_channel = in_channel
+        ) if stream_parser else self.__midi
+
     # def __repr__(self):
     #     return "DIN"
 
@@ -36,7 +56,69 @@ class AdafruitDinMidiDevice:
         if isinstance(midi_message, _MIDIUnknownEvent):
             return
         
+        # Pre-encoded messages are written directly
+        if isinstance(midi_message, _EncodedSystemExclusive):
+            self.__port_out.write(midi_message.encoded, len(midi_message.encoded))
+            return
+        
         self.__midi.send(midi_message)
 
     def receive(self):
-        return self.__midi.receive()
\ No newline at end of file
+        if not self.__uart:
+            return self.__receiver.receive()
+        
+        # If the last call did not return a message and the UART had no more bytes waiting, the input buffer does 
+        # not contain any complete message, so we only have to parse again if new bytes are waiting.
+        if self.__idle and not self.__uart.in_waiting:
+            return None
+
+        msg = self.__receiver.receive()
+        self.__idle = (msg == None and not self.__uart.in_waiting)
+        return msg
+    
+    # True if the input buffer is close to overflowing (only supported by the streaming parser)
+    @property
+    def backlog(self):
+        return getattr(self.__receiver, "backlog", False)
+
+    # Raw data interface (used by raw MIDI routings). Reads available bytes into buffer, returns the amount read.
+    def read_raw(self, buffer):
+        return self.__port_in.readinto(buffer)
+
+    # Raw data interface (used by raw MIDI routings). Passes all bytes read for receive() to callback(buffer, num), too.
+    # Returns if supported (only with the streaming parser).
+    def tee_raw(self, callback):
+        if not isinstance(self.__receiver, _MidiStreamParser):
+            return False
+        
+        self.__receiver.tee = callback
+        return True
+
+    # Raw data interface (used by raw MIDI routings). Writes num bytes of buffer.
+    def write_raw(self, buffer, num):
+        self.__port_out.write(buffer, num)
+
+
+# Port wrapper for the UART which never waits for the read timeout: Only the bytes already waiting
+# are read (the receivers always request to fill up their whole input buffer, which blocks
+# until the UART timeout when less bytes are available).
+class _NonBlockingUartPort:
+    def __init__(self, uart):
+        self.__uart = uart
+
+    def read(self, num_bytes):
+        available = self.__uart.in_waiting
+        if not available:
+            return None
+        
+        return self.__uart.read(available if available < num_bytes else num_bytes)
+    
+    def readinto(self, buffer):
+        available = self.__uart.in_waiting
+        if not available:
+            return None
+        
+        if available < len(buffer):
+            return self.__uart.readinto(memoryview(buffer)[:available])
+        
+        return self.__uart.readinto(buffer)
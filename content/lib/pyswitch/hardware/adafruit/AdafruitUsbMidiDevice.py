@@ -1,24 +1,36 @@
 from adafruit_midi import MIDI as _MIDI
 from adafruit_midi.midi_message import MIDIUnknownEvent as _MIDIUnknownEvent
 
+from ...controller.midi import MidiStreamParser as _MidiStreamParser, EncodedSystemExclusive as _EncodedSystemExclusive
+
 # USB MIDI Device
 class AdafruitUsbMidiDevice:
     def __init__(self, 
                  port_in,
                  port_out,
                  in_buf_size,
-                 in_channel = None,  # All
+                 in_channel = None,    # All
                  out_channel = 0,                 
+                 stream_parser = True  # Use the PySwitch streaming parser instead of adafruit_midi for receiving
         ):
 
+        self.__port_in = port_in
+        self.__port_out = port_out
+
         self.__midi = _MIDI(
             midi_out = port_out,
             out_channel = out_channel,
-            midi_in = port_in,
+            midi_in = port_in if not stream_parser else None,
             in_channel = in_channel,
             in_buf_size = in_buf_size
         )
 
+        self.__receiver = _MidiStreamParser(
+            port = port_in,
+            in_buf_size = in_buf_size,
+            in_channel = in_channel
+        ) if stream_parser else self.__midi
+
     # def __repr__(self):
     #     return "USB"
 
@@ -26,7 +38,34 @@ class AdafruitUsbMidiDevice:
         if isinstance(midi_message, _MIDIUnknownEvent):
             return
         
+        # Pre-encoded messages are written directly
+        if isinstance(midi_message, _EncodedSystemExclusive):
+            self.__port_out.write(midi_message.encoded, len(midi_message.encoded))
+            return
+        
         self.__midi.send(midi_message)
 
     def receive(self):
-        return self.__midi.receive()
\ No newline at end of file
+        return self.__receiver.receive()
+    
+    # True if the input buffer is close to overflowing (only supported by the streaming parser)
+    @property
+    def backlog(self):
+        return getattr(self.__receiver, "backlog", False)
+
+    # Raw data interface (used by raw MIDI routings). Reads available bytes into buffer, returns the amount read.
+    def read_raw(self, buffer):
+        return self.__port_in.readinto(buffer)
+
+    # Raw data interface (used by raw MIDI routings). Passes all bytes read for receive() to callback(buffer, num), too.
+    # Returns if supported (only with the streaming parser).
+    def tee_raw(self, callback):
+        if not isinstance(self.__receiver, _MidiStreamParser):
+            return False
+        
+        self.__receiver.tee = callback
+        return True
+
+    # Raw data interface (used by raw MIDI routings). Writes num bytes of buffer.
+    def write_raw(self, buffer, num):
+        self.__port_out.write(buffer, num)
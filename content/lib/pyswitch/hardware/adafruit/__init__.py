@@ -14,6 +14,8 @@ except ImportError:
 # Font loader
 from adafruit_bitmap_font import bitmap_font as _bitmap_font
 
+from ...misc import LedFrame as _LedFrame
+
 # TFT driver class
 class AdafruitST7789DisplayDriver:
 
@@ -96,14 +98,31 @@ class AdafruitFontLoader:
 # Implements communication with an array of NeoPixels
 class AdafruitNeoPixelDriver:
 
-    def __init__(self, port = _board.GP7):
+    # buffered: If enabled, LED colors are collected in a frame buffer and only pushed to the 
+    #           NeoPixels once per tick (when show() is called), and only if anything has changed.
+    def __init__(self, port = _board.GP7, buffered = False):
         self.__port = port
+        self.__buffered = buffered
+        self.__pixels = None
         self.leds = None
         
     # Initialize NeoPixel array. Neopixel documentation:
     # https://docs.circuitpython.org/projects/neopixel/en/latest/
     # https://learn.adafruit.com/adafruit-neopixel-uberguide/python-circuitpython
     def init(self, num_leds):
-        self.leds = _NeoPixel(self.__port, num_leds)
-
+        if self.__buffered:
+            self.__pixels = _NeoPixel(self.__port, num_leds, auto_write = False)
+            self.leds = _LedFrame(num_leds)
+        else:
+            self.leds = _NeoPixel(self.__port, num_leds)
+
+    # Pushes all changed pixels to the NeoPixels (buffered mode only)
+    def show(self):
+        if not self.__buffered:
+            return
+        
+        if self.leds.flush(self.__write_pixel):
+            self.__pixels.show()
 
+    def __write_pixel(self, index, color):
+        self.__pixels[index] = color
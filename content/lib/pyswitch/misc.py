@@ -48,6 +48,10 @@ def fill_up_to(str, num_spaces_at_right, fill_char = " "):
 
 # Base class for everything that needs to be updated regularily
 class Updateable:
+    # If set (milliseconds), the Controller schedules the updateable with this own interval 
+    # instead of the global "updateInterval" (see UpdateScheduler).
+    update_interval_millis = None
+
     def update(self):
         pass   # pragma: no cover
 
@@ -87,6 +91,105 @@ class Updater:
 #####################################################################################################################################
 
 
+# Schedules updateables with individual intervals. The entries are held in a binary min-heap ordered by 
+# the next due time, so determining if anything is due is O(1) and rescheduling is O(log n).
+class UpdateScheduler:
+    def __init__(self):
+        # Heap entries: [due time (millis), sequence number, interval (millis), updateable]
+        self.__heap = []
+
+        # Sequence counter for FIFO ordering of entries with the same due time
+        self.__seq = 0
+
+    def __len__(self):
+        return len(self.__heap)
+
+    # Adds an updateable, which will be due first after the interval has passed (starting at now).
+    def add(self, u, interval_millis, now = 0):
+        for entry in self.__heap:
+            if entry[3] == u:
+                return
+        
+        self.__heap.append([now + interval_millis, self.__seq, interval_millis, u])
+        self.__seq += 1
+
+        self.__sift_up(len(self.__heap) - 1)
+
+    # Next due time in milliseconds (None if nothing is scheduled)
+    @property
+    def next_due(self):
+        return self.__heap[0][0] if self.__heap else None
+
+    # Returns the next updateable which is due at the given time (or None), and reschedules it. 
+    # If the updateable is late by more than one interval, it is rescheduled relative to now 
+    # (no catching up of missed updates).
+    def pop_due(self, now):
+        heap = self.__heap
+        if not heap:
+            return None
+        
+        entry = heap[0]
+        if entry[0] > now:
+            return None
+        
+        due = entry[0] + entry[2]
+        if due <= now:
+            due = now + entry[2]
+
+        entry[0] = due
+        entry[1] = self.__seq
+        self.__seq += 1
+
+        self.__sift_down(0)
+
+        return entry[3]
+    
+    # Returns if entry a is due before entry b
+    def __less(self, a, b):
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    def __sift_up(self, pos):
+        heap = self.__heap
+        entry = heap[pos]
+
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+
+            if not self.__less(entry, parent):
+                break
+
+            heap[pos] = parent
+            pos = parent_pos
+
+        heap[pos] = entry
+
+    def __sift_down(self, pos):
+        heap = self.__heap
+        size = len(heap)
+        entry = heap[pos]
+
+        while True:
+            child_pos = 2 * pos + 1
+            if child_pos >= size:
+                break
+
+            right_pos = child_pos + 1
+            if right_pos < size and self.__less(heap[right_pos], heap[child_pos]):
+                child_pos = right_pos
+
+            if not self.__less(heap[child_pos], entry):
+                break
+
+            heap[pos] = heap[child_pos]
+            pos = child_pos
+
+        heap[pos] = entry
+
+
+#####################################################################################################################################
+
+
 # Base class for event distributors (who call listeners)
 class EventEmitter:
     def __init__(self): 
@@ -104,6 +207,131 @@ class EventEmitter:
 ###############################################################################################################
 
 
+# FIFO queue on a list with a head index, so taking the first item does not have to move all others (as list.pop(0) 
+# would). The consumed part of the list is only dropped when the queue runs empty or the head has moved far enough.
+class Fifo:
+    def __init__(self):
+        self.__items = []
+        self.__head = 0
+
+    def __len__(self):
+        return len(self.__items) - self.__head
+    
+    def append(self, item):
+        self.__items.append(item)
+
+    # Returns the first item without removing it
+    def peek(self):
+        return self.__items[self.__head]
+
+    # Removes and returns the first item
+    def pop(self):
+        items = self.__items
+        head = self.__head
+
+        item = items[head]
+        items[head] = None
+        head += 1
+
+        if head == len(items):
+            items.clear()
+            head = 0
+
+        elif head >= 32 and head * 2 >= len(items):
+            del items[:head]
+            head = 0
+
+        self.__head = head
+        return item
+    
+    def clear(self):
+        self.__items.clear()
+        self.__head = 0
+
+
+###############################################################################################################
+
+
+# Converts a color component to int and clamps it to [0..255]
+def _to_byte(value):
+    value = int(value)
+    
+    if value < 0:
+        return 0
+    if value > 255:
+        return 255
+    return value
+
+
+# Compact frame buffer for LED colors (3 bytes per pixel). Writes only mark the pixels as dirty, 
+# the LED driver pushes all changed pixels to the hardware at once when flushed.
+class LedFrame:
+    def __init__(self, num_leds):
+        self.__frame = bytearray(num_leds * 3)
+        self.__dirty = bytearray(num_leds)
+
+        # True if any pixel has been changed since the last flush
+        self.changed = False
+
+    def __len__(self):
+        return len(self.__dirty)
+
+    def __getitem__(self, index):
+        i = index * 3
+        frame = self.__frame
+        return (frame[i], frame[i + 1], frame[i + 2])
+
+    def __setitem__(self, index, color):
+        i = index * 3
+        frame = self.__frame
+
+        r = _to_byte(color[0])
+        g = _to_byte(color[1])
+        b = _to_byte(color[2])
+
+        if frame[i] == r and frame[i + 1] == g and frame[i + 2] == b:
+            return
+        
+        frame[i] = r
+        frame[i + 1] = g
+        frame[i + 2] = b
+
+        self.__dirty[index] = 1
+        self.changed = True
+
+    def fill(self, color):
+        for i in range(len(self.__dirty)):
+            self[i] = color
+
+    # Marks all pixels as changed, so the next flush writes the whole frame
+    def invalidate(self):
+        dirty = self.__dirty
+        for i in range(len(dirty)):
+            dirty[i] = 1
+
+        self.changed = True
+
+    # Calls write(index, color) for all pixels changed since the last flush. Returns 
+    # if anything has been written.
+    def flush(self, write):
+        if not self.changed:
+            return False
+        
+        dirty = self.__dirty
+        for i in range(len(dirty)):
+            if not dirty[i]:
+                continue
+
+            dirty[i] = 0
+            write(i, self[i])
+
+        self.changed = False
+        return True
+
+
+###############################################################################################################
+
+
 # Periodic update helper    
 class PeriodCounter:
     def __init__(self, interval_millis):
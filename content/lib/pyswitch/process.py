@@ -54,7 +54,9 @@ if not _get_option(_Config, "exploreMode"):
 
         # Controller instance (runs the processing loop and keeps everything together)
         _controller = _Controller(
-            led_driver = _NeoPixelDriver(), 
+            led_driver = _NeoPixelDriver(
+                buffered = _get_option(_Config, "bufferedLeds")
+            ), 
             protocol = _get_option(_Communication, "protocol", None),
             midi = _midi,
             config = _Config, 
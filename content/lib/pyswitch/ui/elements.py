@@ -310,6 +310,18 @@ class TunerDisplay(DisplayElement):
             self.__marker.fill = color
 
 
+    # Redraws the deviance with the frame rate. This is registered with the controller only, and not part
+    # of the display element tree, so the UiController does not update it in addition.
+    class _TunerFrame(Updateable):
+
+        def __init__(self, interval_millis, draw):
+            self.update_interval_millis = interval_millis
+            self.__draw = draw
+
+        def update(self):
+            self.__draw()
+
+
     ##################################################################################################
 
 
@@ -327,7 +339,9 @@ class TunerDisplay(DisplayElement):
                  color_neutral = Colors.WHITE,
                  calibration_high = 8192 + 350,            # Threshold value above which the note is out of tune
                  calibration_low = 8192 - 350,             # Threshold value above which the note is out of tune
-                 note_names = None                         # If set, this must be a tuple or list of 12 note name strings starting at C.
+                 note_names = None,                        # If set, this must be a tuple or list of 12 note name strings starting at C.
+                 frame_rate = 0                            # If set, the deviance display is redrawn with this frame rate (frames per second), showing 
+                                                           # the latest deviance received, instead of on every incoming message. 
         ):
         DisplayElement.__init__(self, bounds = bounds)
 
@@ -367,6 +381,11 @@ class TunerDisplay(DisplayElement):
         self.__last_note = None
         self.__last_deviance = 8192
 
+        # Latest deviance received, not drawn yet (only used with a frame rate)
+        self.__pending_deviance = None
+
+        self.frame = self._TunerFrame(int(1000 / frame_rate), self.__draw_pending) if frame_rate else None
+
     # We need access to the client, so we store appl here
     def init(self, ui, appl):
         DisplayElement.init(self, ui, appl)
@@ -378,10 +397,15 @@ class TunerDisplay(DisplayElement):
         if self.__mapping_deviance:
             self.__appl.client.register(self.__mapping_deviance, self)
 
+        # Redraw with the frame rate
+        if self.frame:
+            appl.add_updateable(self.frame)
+
     # Reset the display
     def reset(self):
         self.__last_note = None
         self.__last_deviance = 8192
+        self.__pending_deviance = None
         
         self.label_note.text = "-"
         self.label_note.text_color = self.__color_neutral
@@ -395,18 +419,39 @@ class TunerDisplay(DisplayElement):
 
             self.label_note.text = self.__note_names[value % 12]            
 
-        if mapping == self.__mapping_deviance and value != self.__last_deviance:
-            self.__last_deviance = value               
-            
-            self.deviance.set(self.__last_deviance)            
+        if mapping == self.__mapping_deviance:
+            if self.frame:
+                # Only keep the latest value until the next frame
+                self.__pending_deviance = value
+            else:
+                self.__set_deviance(value)
 
-            # Uncomment this for calibration.
-            #self._debug_calibration(mapping.value)            
+    # Draws the latest deviance received (only used with a frame rate)
+    def __draw_pending(self):
+        if self.__pending_deviance == None:
+            return
+        
+        value = self.__pending_deviance
+        self.__pending_deviance = None
 
-            if self.deviance.in_tune:
-                self.label_note.text_color = self.__color_in_tune
-            else:
-                self.label_note.text_color = self.__color_out_of_tune
+        self.__set_deviance(value)
+
+    # Shows the deviance
+    def __set_deviance(self, value):
+        if value == self.__last_deviance:
+            return
+        
+        self.__last_deviance = value               
+        
+        self.deviance.set(self.__last_deviance)            
+
+        # Uncomment this for calibration.
+        #self._debug_calibration(value)            
+
+        if self.deviance.in_tune:
+            self.label_note.text_color = self.__color_in_tune
+        else:
+            self.label_note.text_color = self.__color_out_of_tune
         
     # Called when the client is offline (requests took too long)
     def request_terminated(self, mapping):
@@ -120,9 +120,8 @@ def _check_unique_mapping_names(function):
         else:
             name = kwargs["name"]
 
-        for m in ClientParameterMapping._mappings:
-            if m.name == name:
-                raise Exception("Mapping already defined: " + repr(name))
+        if name in ClientParameterMapping._mappings:
+            raise Exception("Mapping already defined: " + repr(name))
 
         return function(*args, **kwargs)
     return wrapper
@@ -130,7 +129,7 @@ def _check_unique_mapping_names(function):
 ClientParameterMapping.__init__ = _check_unique_mapping_names(ClientParameterMapping.__init__)
 
 class MockParameterMapping(ClientParameterMapping):
-    def __init__(self, name = None, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def __init__(self, name = None, set = None, request = None, response = None, value = None, type = 0, depends = None, notify_always = False, persist = False):
         super().__init__(
             name = name if name != None else uuid4(), 
             create_key = ClientParameterMapping, 
@@ -139,7 +138,9 @@ class MockParameterMapping(ClientParameterMapping):
             response = response, 
             value = value, 
             type = type, 
-            depends = depends
+            depends = depends,
+            notify_always = notify_always,
+            persist = persist
         )
 
         self.outputs_parse = []
@@ -173,6 +174,10 @@ class MockParameterMapping(ClientParameterMapping):
     def set_value(self, value):
         self.set_value_calls.append(value)
 
+    # parse() is mocked, so all messages have to be passed to it
+    def dispatch_keys(self):
+        return None
+
     def result_finished(self):
         if self.output_result_finished != None:
             return self.output_result_finished
@@ -314,7 +319,7 @@ class MockClient:
     def last_sent_message(self):
         return self.set_calls[len(self.set_calls)-1] if self.set_calls else None
 
-    def set(self, mapping, value):
+    def set(self, mapping, value, coalesce = False):
         self.set_calls.append({
             "mapping": mapping,
             "value": value
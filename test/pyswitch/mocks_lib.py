@@ -14,6 +14,9 @@ class MockTime:
     def monotonic():
         return MockTime.mock["monotonicReturn"]
 
+    def monotonic_ns():
+        return int(MockTime.mock["monotonicReturn"] * 1000000000)
+
     def localtime():
         return MockTime.mock["localtimeReturn"]
     
@@ -46,6 +49,47 @@ class MockAdafruitMIDI:
             self.messages_sent.append(midi_message)
             
 
+class MockBusIO:
+    class UART:
+        def __init__(self, rx = None, tx = None, baudrate = 9600, timeout = 1):
+            self.baudrate = baudrate
+            self.timeout = timeout
+
+            self.incoming = bytearray()
+            self.outgoing = bytearray()
+
+            self.num_reads = 0
+            self.stalled = 0    # Simulated time (seconds) spent waiting for the read timeout
+
+        @property
+        def in_waiting(self):
+            return len(self.incoming)
+
+        def read(self, nbytes = None):
+            self.num_reads += 1
+
+            # The real UART waits for the timeout when less bytes than requested are available
+            if nbytes == None or nbytes > len(self.incoming):
+                self.stalled += self.timeout
+                nbytes = len(self.incoming)
+
+            ret = bytes(self.incoming[:nbytes])
+            del self.incoming[:nbytes]
+            
+            return ret if ret else None
+
+        def readinto(self, buf):
+            data = self.read(len(buf))
+            if not data:
+                return None
+            
+            buf[:len(data)] = data
+            return len(data)
+
+        def write(self, buf, num = None):
+            self.outgoing.extend(buf)
+            
+
 class MockAdafruitMIDIControlChange:
     class ControlChange:
         def __init__(self, control = 0, value = 0):
@@ -66,6 +110,11 @@ class MockAdafruitMIDISystemExclusive:
             self.data = data
             self._STATUS = 0xF0
 
+# SystemExclusive which stores its data as bytes like adafruit_midi does (for testing pre-encoded messages)
+class MockBytesSystemExclusive(MockAdafruitMIDISystemExclusive.SystemExclusive):
+    def __init__(self, manufacturer_id = [0x00, 0x00, 0x00], data = []):
+        super().__init__(bytes(manufacturer_id), bytes(data))
+
 #class MockAdafruitMIDIStart:
 #    class Start:
 #        pass
@@ -77,6 +126,8 @@ class MockAdafruitMIDIMessage:
             self.status = status
 
     class MIDIMessage:
+        _statusandmask_to_class = []
+
         @staticmethod
         def register_message_type():
             pass
@@ -31,6 +31,8 @@ class MockMisc:
     Updater = misc.Updater
     Updateable = misc.Updateable
     EventEmitter = misc.EventEmitter
+    Fifo = misc.Fifo
     PeriodCounter = misc.PeriodCounter
+    UpdateScheduler = misc.UpdateScheduler
 
     PYSWITCH_VERSION = misc.PYSWITCH_VERSION
@@ -1,3 +1,4 @@
+from uuid import uuid4
 import sys
 import unittest
 from unittest.mock import patch   # Necessary workaround! Needs to be separated.
@@ -17,7 +18,7 @@ with patch.dict(sys.modules, {
 }):
     from adafruit_midi.system_exclusive import SystemExclusive
     from adafruit_midi.control_change import ControlChange
-    from lib.pyswitch.controller.client import Client
+    from lib.pyswitch.controller.client import Client, ClientParameterMapping
 
     from.mocks_appl import *
 
@@ -58,6 +59,53 @@ class TestClient(unittest.TestCase):
         self.assertEqual(mapping_1.set_value_calls, [33])
 
 
+    def test_set_latency(self):
+        class MockLatency:
+            def __init__(self):
+                self.num_sent = 0
+
+            def message_sent(self):
+                self.num_sent += 1
+
+        midi = MockAdafruitMIDI.MIDI()
+        
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        mapping_1 = MockParameterMapping(
+            set = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x01, 0x02, 0x03, 0x04]
+            ),
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x09]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        self.assertEqual(client.latency, None)
+
+        # Must not throw without latency measurement
+        client.set(mapping_1, 1)
+
+        client.latency = MockLatency()
+
+        client.set(mapping_1, 2)
+        self.assertEqual(client.latency.num_sent, 1)
+
+        # Requests are not regarded
+        client.request(mapping_1, MockClientRequestListener())
+
+        self.assertEqual(len(midi.messages_sent), 3)
+        self.assertEqual(client.latency.num_sent, 1)
+
+
 ##############################################################################################
 
 
@@ -464,6 +512,93 @@ class TestClient(unittest.TestCase):
         self.assertTrue(req in client.requests)
 
 
+    def _test_request_unchanged(self, notify_always):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        mapping_1 = MockParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x09]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            ),
+            notify_always = notify_always
+        )
+
+        answer_msg_1 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x45]
+        )
+
+        answer_msg_2 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x46]
+        )
+        
+        mapping_1.outputs_parse = [
+            {
+                "message": answer_msg_1,
+                "value": 34
+            },
+            {
+                "message": answer_msg_2,
+                "value": 35
+            }
+        ]
+
+        listener_1 = MockClientRequestListener()
+        listener_2 = MockClientRequestListener()
+
+        def poll(listeners, answer_msg):
+            for l in listeners:
+                client.request(mapping_1, l)
+
+            client.receive(answer_msg)
+
+        poll([listener_1], answer_msg_1)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 1)
+
+        # Same value again
+        poll([listener_1], answer_msg_1)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 2 if notify_always else 1)
+
+        # New listener is notified about the current value once
+        poll([listener_1, listener_2], answer_msg_1)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 3 if notify_always else 1)
+        self.assertEqual(len(listener_2.parameter_changed_calls), 1)
+
+        poll([listener_1, listener_2], answer_msg_1)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 4 if notify_always else 1)
+        self.assertEqual(len(listener_2.parameter_changed_calls), 2 if notify_always else 1)
+
+        # Changed value
+        poll([listener_1, listener_2], answer_msg_2)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 5 if notify_always else 2)
+        self.assertEqual(len(listener_2.parameter_changed_calls), 3 if notify_always else 2)
+
+        # After termination, listeners are notified about the next value again (like on connection loss)
+        client.request(mapping_1, listener_1)
+        client.requests[0].notify_terminated()
+        self.assertEqual(len(listener_1.request_terminated_calls), 1)
+
+        poll([listener_1], answer_msg_2)
+        self.assertEqual(len(listener_1.parameter_changed_calls), 6 if notify_always else 3)
+
+    def test_request_unchanged(self):
+        self._test_request_unchanged(False)
+
+    def test_request_unchanged_notify_always(self):
+        self._test_request_unchanged(True)
+
+
+
 ##############################################################################################
 
 
@@ -601,96 +736,1132 @@ class TestClient(unittest.TestCase):
         client.receive(None)
 
         self.assertEqual(req.finished, True)
-        
-
-##############################################################################################
 
 
-    def test_request_dependency(self):        
+    def test_request_timeout_expiry_order(self):        
         midi = MockAdafruitMIDI.MIDI()
 
         client = Client(
             midi = midi,
-            config = {},
+            config = {}
         )
 
-        mapping_dep = MockParameterMapping(
-            request = SystemExclusive(
-                manufacturer_id = [0x00, 0x10, 0x20],
-                data = [0x05, 0x07, 0x09]
-            ),
-            response = SystemExclusive(
-                manufacturer_id = [0x00, 0x10, 0x20],
-                data = [0x00, 0x00, 0x09]
+        def create_mapping(num):
+            return MockParameterMapping(
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num]
+                )
             )
-        )
+        
+        mappings = [create_mapping(i) for i in range(3)]
+        listener = MockClientRequestListener()
 
-        mapping_1 = MockParameterMapping(
-            depends = mapping_dep,
-            request = SystemExclusive(
-                manufacturer_id = [0x00, 0x10, 0x20],
-                data = [0x05, 0x07, 0x19]
-            ),
-            response = SystemExclusive(
-                manufacturer_id = [0x00, 0x10, 0x20],
-                data = [0x00, 0x00, 0x19]
-            )
-        )
+        for m in mappings:
+            client.request(m, listener)
 
-        listener = MockClientRequestListener()
+        reqs = [client.get_matching_request(m) for m in mappings]
 
-        client.request(mapping_1, listener)
+        for r in reqs:
+            r.lifetime = MockPeriodCounter()
 
-        self.assertEqual(len(midi.messages_sent), 1)
-        self.assertEqual(midi.messages_sent[0], mapping_dep.request)
-        
-        # Receive dependency message
-        req = client.requests[0]
+        client._Client__cleanup_terminated_period = MockPeriodCounter()
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+
+        # Only the head of the expiry queue is checked: As the first request has not expired, 
+        # the later ones are not visited.
+        reqs[1].lifetime.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual([r.finished for r in reqs], [False, False, False])
+        self.assertEqual(len(client.requests), 3)
+
+        # Expire the first two
+        reqs[0].lifetime.exceed_next_time = True
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual([r.finished for r in reqs], [True, True, False])
+        self.assertEqual(client.requests, [reqs[2]])
+        self.assertEqual(len(listener.request_terminated_calls), 2)
+
+        # Answered requests are dropped from the expiry queue lazily, when they reach the head
         answer_msg = SystemExclusive(
             manufacturer_id = [0x00, 0x10, 0x20],
-            data = [0x00, 0x00, 0x07, 0x45]
+            data = [0x00, 0x00, 0x02]
         )
 
-        mapping_dep.outputs_parse = [
+        mappings[2].outputs_parse = [
             {
                 "message": answer_msg,
-                "value": 34
+                "value": 2
             }
         ]
 
         client.receive(answer_msg)
-        self.assertEqual(listener.parameter_changed_calls, [])
-        self.assertEqual(mapping_dep.value, 34)
-        self.assertEqual(mapping_1.value, None)
-        self.assertEqual(req.finished, True)
 
-        # Receive dependency message
-        self.assertEqual(len(client.requests), 1)
-        req2 = client.requests[0]
+        self.assertEqual(reqs[2].removed, True)
+        self.assertEqual(client.requests, [])
+        self.assertEqual(len(client._Client__expiry), 1)
 
-        mapping_1.outputs_parse = [
-            {
-                "message": answer_msg,
-                "value": 12
-            }
-        ]
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual(len(client._Client__expiry), 0)
+        self.assertEqual(len(listener.request_terminated_calls), 2)
+        
+
+    def test_request_slots(self):        
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        # Some mappings share their dispatch keys, some can not be indexed
+        def create_mapping(num):
+            return MockParameterMapping(
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num % 3]
+                ) if num % 4 else [
+                    SystemExclusive(
+                        manufacturer_id = [0x00, 0x10, 0x20],
+                        data = [0x00, 0x00, num % 3]
+                    ),
+                    SystemExclusive(
+                        manufacturer_id = [0x00, 0x10, 0x20],
+                        data = [0x00, 0x01, num]
+                    )
+                ]
+            )
+        
+        mappings = [create_mapping(i) for i in range(12)]
+        
+        for m in mappings:
+            client.request(m, MockClientRequestListener())
+
+        reqs = [client.get_matching_request(m) for m in mappings]
+
+        def check():
+            for r in client.requests:
+                self.assertIs(client.requests[r.index], r)
+
+                if r.dispatch_keys == None:
+                    self.assertIs(client._Client__requests_unindexed[r.slots[0]], r)
+                else:
+                    for i in range(len(r.dispatch_keys)):
+                        self.assertIs(client._Client__requests_indexed[r.dispatch_keys[i]][r.slots[i]], r)
+
+        check()
+
+        # Remove requests in mixed order: The positions of the moved requests are updated
+        for i in [4, 0, 11, 5, 6, 1]:
+            reqs[i].terminate()
+
+            self.assertNotIn(reqs[i], client.requests)
+            check()
+
+        self.assertEqual(len(client.requests), 6)
+        self.assertEqual(set(client.requests), set([reqs[i] for i in [2, 3, 7, 8, 9, 10]]))
+
+        for r in reqs:
+            r.terminate()
 
-        client.receive(answer_msg)
-        self.assertEqual(listener.parameter_changed_calls, [mapping_1])
-        self.assertEqual(mapping_1.value, 12)
-        self.assertEqual(req2.finished, True)
         self.assertEqual(client.requests, [])
+        self.assertEqual(client._Client__requests_indexed, {})
 
-        # Receive dependency (no value change)
-        mapping_1.outputs_parse = [
-            {
-                "message": answer_msg,
-                "value": 12
+
+##############################################################################################
+
+
+    def test_request_window(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {
+                "maxRequestsInFlight": 2
             }
-        ]
+        )
+
+        def create_mapping(num):
+            m = MockParameterMapping(
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num]
+                )
+            )
+
+            answer = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, num, 0x45]
+            )
+
+            m.outputs_parse = [
+                {
+                    "message": answer,
+                    "value": num
+                }
+            ]
+
+            return (m, answer)
+
+        mapping_1, answer_1 = create_mapping(1)
+        mapping_2, answer_2 = create_mapping(2)
+        mapping_3, answer_3 = create_mapping(3)
+        mapping_4, answer_4 = create_mapping(4)
+
+        listener = MockClientRequestListener()
+
+        client._Client__cleanup_terminated_period = MockPeriodCounter()
+
+        client.request(mapping_1, listener)
+        client.request(mapping_2, listener)
+        client.request(mapping_3, listener)
+        client.request(mapping_4, listener)
+
+        # Requesting again does not send or queue anything
+        client.request(mapping_3, listener)
+
+        self.assertEqual(midi.messages_sent, [mapping_1.request, mapping_2.request])
+        self.assertEqual(client.requests_in_flight, 2)
+        self.assertEqual(client.requests_queued, 2)
+        self.assertEqual(client.max_queue_depth, 2)
+
+        # Answer releases the slot
+        client.receive(answer_1)
 
-        client.receive(answer_msg)
         self.assertEqual(listener.parameter_changed_calls, [mapping_1])
-        self.assertEqual(mapping_1.value, 12)
+        self.assertEqual(midi.messages_sent, [mapping_1.request, mapping_2.request, mapping_3.request])
+        self.assertEqual(client.requests_in_flight, 2)
+        self.assertEqual(client.requests_queued, 1)
+
+        # Queued requests do not time out
+        req_2 = client.get_matching_request(mapping_2)
+        req_4 = client.get_matching_request(mapping_4)
+        self.assertEqual(req_4.queued, True)
+
+        req_4.lifetime = MockPeriodCounter()
+        req_4.lifetime.exceed_next_time = True
+
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual(req_4.finished, False)
+
+        # Termination releases the slot
+        req_2.lifetime = MockPeriodCounter()
+        req_2.lifetime.exceed_next_time = True
+        
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual(req_2.finished, True)
+        self.assertEqual(listener.request_terminated_calls, [mapping_2])
+
+        self.assertEqual(midi.messages_sent, [mapping_1.request, mapping_2.request, mapping_3.request, mapping_4.request])
+        self.assertEqual(client.requests_in_flight, 2)
+        self.assertEqual(client.requests_queued, 0)
+        self.assertEqual(req_4.queued, False)
+        self.assertEqual(req_4.in_flight, True)
+
+        client.receive(answer_3)
+        client.receive(answer_4)
+
+        self.assertEqual(listener.parameter_changed_calls, [mapping_1, mapping_3, mapping_4])
+        self.assertEqual(client.requests_in_flight, 0)
         self.assertEqual(client.requests, [])
 
+        self.assertEqual(client.max_queue_depth, 2)
+        client.reset_queue_stats()
+        self.assertEqual(client.max_queue_depth, 0)
+
+    def test_request_window_unlimited(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        for i in range(10):
+            client.request(
+                MockParameterMapping(
+                    request = SystemExclusive(
+                        manufacturer_id = [0x00, 0x10, 0x20],
+                        data = [0x05, 0x07, i]
+                    ),
+                    response = SystemExclusive(
+                        manufacturer_id = [0x00, 0x10, 0x20],
+                        data = [0x00, 0x00, i]
+                    )
+                ),
+                MockClientRequestListener()
+            )
+
+        self.assertEqual(len(midi.messages_sent), 10)
+        self.assertEqual(client.requests_in_flight, 0)
+        self.assertEqual(client.requests_queued, 0)
+
+
+##############################################################################################
+
+
+    def test_prioritize_set(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {
+                "prioritizeSetMessages": True,
+                "maxRequestMessagesPerTick": 2
+            }
+        )
+
+        def create_mapping(num):
+            return MockParameterMapping(
+                set = ControlChange(num, 0),
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num]
+                )
+            )
+
+        mappings = [create_mapping(i) for i in range(3)]
+
+        for m in mappings:
+            client.request(m, MockClientRequestListener())
+
+        # Requests are queued
+        self.assertEqual(midi.messages_sent, [])
+        self.assertEqual(client.request_messages_queued, 3)
+
+        # SET messages are sent immediately
+        client.set(mappings[2], 1)
+        self.assertEqual(midi.messages_sent, [mappings[2].set])
+
+        # Flush sends the requests (limited per tick)
+        client.flush()
+        self.assertEqual(midi.messages_sent, [mappings[2].set, mappings[0].request, mappings[1].request])
+        self.assertEqual(client.request_messages_queued, 1)
+
+        client.set(mappings[1], 1)
+
+        client.flush()
+        self.assertEqual(midi.messages_sent, [mappings[2].set, mappings[0].request, mappings[1].request, mappings[1].set, mappings[2].request])
+        self.assertEqual(client.request_messages_queued, 0)
+
+        client.flush()
+        self.assertEqual(len(midi.messages_sent), 5)
+
+    def test_prioritize_set_lifetime(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        self.current_millis = 0
+        
+        def get_current_millis():
+            return self.current_millis
+
+        client = Client(
+            midi = midi,
+            config = {
+                "prioritizeSetMessages": True,
+                "maxRequestMessagesPerTick": 1,
+                "maxRequestLifetimeMillis": 100
+            }
+        )
+
+        def create_mapping(num):
+            return MockParameterMapping(
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num]
+                )
+            )
+
+        mappings = [create_mapping(i) for i in range(3)]
+        listener = MockClientRequestListener()
+
+        misc_globals = Client.request.__globals__["PeriodCounter"].reset.__globals__
+
+        with patch.dict(misc_globals, { "get_current_millis": get_current_millis }):
+            for m in mappings:
+                client.request(m, listener)
+
+            # One request message per tick, every 80ms
+            for i in range(3):
+                self.current_millis += 80
+                client.flush()
+                client.receive(None)
+
+            self.assertEqual(midi.messages_sent, [m.request for m in mappings])
+
+            # The last request has been queued 290ms ago, but only been sent 50ms ago, so it is not terminated
+            self.current_millis += 50
+            client._Client__cleanup_terminated_period = MockPeriodCounter()
+            client._Client__cleanup_terminated_period.exceed_next_time = True
+            client.receive(None)
+
+            self.assertEqual([client.get_matching_request(m) != None for m in mappings], [False, False, True])
+            self.assertEqual(len(listener.request_terminated_calls), 2)
+
+    def test_prioritize_set_disabled(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        mapping = MockParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x01]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01]
+            )
+        )
+
+        client.request(mapping, MockClientRequestListener())
+
+        self.assertEqual(midi.messages_sent, [mapping.request])
+        self.assertEqual(client.request_messages_queued, 0)
+
+
+##############################################################################################
+
+
+    def test_coalesce(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {
+                "coalesceContinuousMessages": True,
+                "coalesceMaxRate": 10
+            }
+        )
+
+        mapping_1 = MockParameterMapping(
+            set = ControlChange(1, 0)
+        )
+
+        mapping_2 = MockParameterMapping(
+            set = ControlChange(2, 0)
+        )
+
+        self.current_millis = 1000
+        
+        def get_current_millis():
+            return self.current_millis
+
+        with patch.dict(Client.flush.__globals__, { "get_current_millis": get_current_millis }):
+            # Non-continuous messages are sent immediately
+            client.set(mapping_1, 3)
+            self.assertEqual(midi.messages_sent, [mapping_1.set])
+            self.assertEqual(mapping_1.set_value_calls, [3])
+
+            midi.messages_sent = []
+
+            client.set(mapping_1, 4, coalesce = True)
+            client.set(mapping_1, 5, coalesce = True)
+            client.set(mapping_2, 6, coalesce = True)
+            client.set(mapping_1, 7, coalesce = True)
+
+            self.assertEqual(midi.messages_sent, [])
+            self.assertEqual(client.coalesced, 2)
+
+            # Only the latest values are sent, one message per 100ms on the output
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set])
+            self.assertEqual(mapping_1.set_value_calls, [3, 7])
+
+            self.current_millis = 1099
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set])
+
+            self.current_millis = 1100
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set, mapping_2.set])
+            self.assertEqual(mapping_2.set_value_calls, [6])
+
+            midi.messages_sent = []
+            self.current_millis = 1200
+            client.flush()
+            self.assertEqual(midi.messages_sent, [])
+
+            # Budget is not saved up for more than one message
+            self.current_millis = 2000
+
+            client.set(mapping_1, 8, coalesce = True)
+            client.set(mapping_2, 9, coalesce = True)
+
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set])
+
+            # The mappings take turns: A newly set mapping is sent after the ones which are pending already
+            client.set(mapping_1, 10, coalesce = True)
+
+            self.current_millis = 2100
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set, mapping_2.set])
+            self.assertEqual(mapping_2.set_value_calls, [6, 9])
+
+            self.current_millis = 2200
+            client.flush()
+            self.assertEqual(midi.messages_sent, [mapping_1.set, mapping_2.set, mapping_1.set])
+            self.assertEqual(mapping_1.set_value_calls, [3, 7, 8, 10])
+            self.assertEqual(client.coalesced, 2)
+
+    def test_coalesce_disabled(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {}
+        )
+
+        mapping_1 = MockParameterMapping(
+            set = ControlChange(1, 0)
+        )
+
+        client.set(mapping_1, 4, coalesce = True)
+        client.set(mapping_1, 5, coalesce = True)
+
+        self.assertEqual(midi.messages_sent, [mapping_1.set, mapping_1.set])
+        self.assertEqual(mapping_1.set_value_calls, [4, 5])
+        self.assertEqual(client.coalesced, 0)
+
+
+##############################################################################################
+
+
+    def test_request_dependency(self):        
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {},
+        )
+
+        mapping_dep = MockParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x09]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        mapping_1 = MockParameterMapping(
+            depends = mapping_dep,
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x19]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x19]
+            )
+        )
+
+        listener = MockClientRequestListener()
+
+        client.request(mapping_1, listener)
+
+        self.assertEqual(len(midi.messages_sent), 1)
+        self.assertEqual(midi.messages_sent[0], mapping_dep.request)
+        
+        # Receive dependency message
+        req = client.requests[0]
+        answer_msg = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x45]
+        )
+
+        mapping_dep.outputs_parse = [
+            {
+                "message": answer_msg,
+                "value": 34
+            }
+        ]
+
+        client.receive(answer_msg)
+        self.assertEqual(listener.parameter_changed_calls, [])
+        self.assertEqual(mapping_dep.value, 34)
+        self.assertEqual(mapping_1.value, None)
+        self.assertEqual(req.finished, True)
+
+        # Receive dependency message
+        self.assertEqual(len(client.requests), 1)
+        req2 = client.requests[0]
+
+        mapping_1.outputs_parse = [
+            {
+                "message": answer_msg,
+                "value": 12
+            }
+        ]
+
+        client.receive(answer_msg)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_1])
+        self.assertEqual(mapping_1.value, 12)
+        self.assertEqual(req2.finished, True)
+        self.assertEqual(client.requests, [])
+
+        # Receive dependency (no value change)
+        mapping_1.outputs_parse = [
+            {
+                "message": answer_msg,
+                "value": 12
+            }
+        ]
+
+        client.receive(answer_msg)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_1])
+        self.assertEqual(mapping_1.value, 12)
+        self.assertEqual(client.requests, [])
+
+
+
+    def test_request_dependency_graph(self):        
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {},
+        )
+
+        def create_mapping(num, depends = None):
+            return MockParameterMapping(
+                depends = depends,
+                request = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x05, 0x07, num]
+                ),
+                response = SystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, num]
+                )
+            )
+        
+        def answer(mapping, value):
+            msg = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, mapping.response.data[2], value]
+            )
+
+            mapping.outputs_parse = [
+                {
+                    "message": msg,
+                    "value": value
+                }
+            ]
+
+            client.receive(msg)
+
+        mapping_dep = create_mapping(0x01)
+        mapping_1 = create_mapping(0x02, mapping_dep)
+        mapping_2 = create_mapping(0x03, mapping_dep)
+        mapping_3 = create_mapping(0x04, mapping_1)      # Depends on a dependent mapping
+
+        listener_1 = MockClientRequestListener()
+        listener_2 = MockClientRequestListener()
+
+        def request_all():
+            midi.messages_sent = []
+
+            client.request(mapping_1, listener_1)
+            client.request(mapping_1, listener_2)
+            client.request(mapping_2, listener_1)
+            client.request(mapping_3, listener_1)
+
+        # Only the dependency is requested, once
+        request_all()
+        self.assertEqual(midi.messages_sent, [mapping_dep.request])
+
+        # Dependency answers: All dependent mappings are requested as a batch (each mapping once)
+        answer(mapping_dep, 1)
+        self.assertEqual(midi.messages_sent, [mapping_dep.request, mapping_1.request, mapping_2.request])
+
+        midi.messages_sent = []
+        answer(mapping_1, 10)
+        answer(mapping_2, 20)
+
+        self.assertEqual(listener_1.parameter_changed_calls, [mapping_1, mapping_2])
+        self.assertEqual(listener_2.parameter_changed_calls, [mapping_1])
+
+        # Second level dependent is requested when its dependency has a value
+        self.assertEqual(midi.messages_sent, [mapping_3.request])
+
+        answer(mapping_3, 30)
+        self.assertEqual(listener_1.parameter_changed_calls, [mapping_1, mapping_2, mapping_3])
+        self.assertEqual(client.requests, [])
+
+        # Steady state: Only the dependency is polled
+        for i in range(3):
+            request_all()
+            self.assertEqual(midi.messages_sent, [mapping_dep.request])
+
+            answer(mapping_dep, 1)
+            self.assertEqual(midi.messages_sent, [mapping_dep.request])
+
+        # Dependency changes: All dependents are invalidated
+        request_all()
+        answer(mapping_dep, 2)
+        self.assertEqual(midi.messages_sent, [mapping_dep.request, mapping_1.request, mapping_2.request])
+
+        # Unchanged value of the dependent mapping: Its dependents are not invalidated
+        midi.messages_sent = []
+        answer(mapping_1, 10)
+        answer(mapping_2, 21)
+
+        self.assertEqual(midi.messages_sent, [])
+        self.assertEqual(mapping_2.value, 21)
+
+        # Changed value: Dependents are invalidated
+        request_all()
+        answer(mapping_dep, 3)
+        
+        midi.messages_sent = []
+        answer(mapping_1, 11)
+        self.assertEqual(midi.messages_sent, [mapping_3.request])
+
+        answer(mapping_3, 31)
+        answer(mapping_2, 22)
+
+        # Termination of the dependency request: Dependents are requested again on the next answer, even if unchanged
+        request_all()
+
+        req = client.get_matching_request(mapping_dep)
+        req.terminate()
+        
+        client._Client__cleanup_terminated_period = MockPeriodCounter()
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual(client.requests, [])
+
+        request_all()
+        answer(mapping_dep, 3)
+        self.assertEqual(midi.messages_sent, [mapping_dep.request, mapping_1.request, mapping_2.request])
+
+
+##############################################################################################
+
+
+    def test_adaptive_polling(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {
+                "updateInterval": 200,
+                "pollMaxIntervalMillis": 1000
+            }
+        )
+
+        mapping_1 = MockParameterMapping(
+            set = ControlChange(3, 0),
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x09]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        answer_msg_1 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x45]
+        )
+
+        answer_msg_2 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x46]
+        )
+
+        mapping_1.outputs_parse = [
+            {
+                "message": answer_msg_1,
+                "value": 34
+            },
+            {
+                "message": answer_msg_2,
+                "value": 35
+            }
+        ]
+
+        listener_1 = MockClientRequestListener()
+        listener_2 = MockClientRequestListener()
+
+        self.current_millis = 0
+        
+        def get_current_millis():
+            return self.current_millis
+
+        # Returns if the request has been sent, and answers it
+        def poll(millis, listener = listener_1, answer_msg = answer_msg_1):
+            self.current_millis = millis
+            midi.messages_sent = []
+
+            client.request(mapping_1, listener)
+            if not midi.messages_sent:
+                return False
+            
+            client.receive(answer_msg)
+            return True
+
+        with patch.dict(Client.request.__globals__, { "get_current_millis": get_current_millis }):
+            self.assertEqual(poll(0), True)
+            self.assertEqual(poll(10), True)
+
+            # Stable: Backs off exponentially, beginning with the update interval
+            self.assertEqual(poll(100), False)
+            self.assertEqual(poll(209), False)
+            self.assertEqual(poll(210), True)
+
+            self.assertEqual(poll(609), False)
+            self.assertEqual(poll(610), True)
+
+            self.assertEqual(poll(1409), False)
+            self.assertEqual(poll(1410), True)
+
+            # Ceiling
+            self.assertEqual(poll(2409), False)
+            self.assertEqual(poll(2410), True)
+            self.assertEqual(poll(3409), False)
+            self.assertEqual(poll(3410), True)
+
+            # New listeners get the value immediately
+            self.assertEqual(poll(3500, listener = listener_2), True)
+            self.assertEqual(poll(3600, listener = listener_2), False)
+
+            # Set: Snaps back
+            client.set(mapping_1, 34)
+            self.assertEqual(poll(3700), True)
+            self.assertEqual(poll(3800), False)
+            self.assertEqual(poll(3900), True)
+            self.assertEqual(poll(4100), False)
+
+            # Reset (for example on rig changes)
+            client.reset_polling()
+            self.assertEqual(poll(4200), True)
+            self.assertEqual(poll(4300), True)
+            self.assertEqual(poll(4400), False)
+
+            # Changed value: Snaps back
+            self.assertEqual(poll(4500, answer_msg = answer_msg_2), True)
+            self.assertEqual(poll(4500, answer_msg = answer_msg_2), True)
+            self.assertEqual(poll(4600, answer_msg = answer_msg_2), False)
+            self.assertEqual(poll(4700, answer_msg = answer_msg_2), True)
+
+    def test_adaptive_polling_dependency(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {
+                "pollMaxIntervalMillis": 1000
+            }
+        )
+
+        mapping_dep = MockParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x08]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x08]
+            )
+        )
+
+        mapping_1 = MockParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x05, 0x07, 0x09]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            ),
+            depends = mapping_dep
+        )
+
+        answer_dep_1 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x08, 0x01]
+        )
+        
+        answer_dep_2 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x08, 0x02]
+        )
+
+        mapping_dep.outputs_parse = [
+            {
+                "message": answer_dep_1,
+                "value": 1
+            },
+            {
+                "message": answer_dep_2,
+                "value": 2
+            }
+        ]
+
+        listener = MockClientRequestListener()
+
+        # Dependencies are always polled
+        for i in range(3):
+            midi.messages_sent = []
+            client.request(mapping_1, listener)
+            self.assertEqual(midi.messages_sent, [mapping_dep.request])
+
+            client.receive(answer_dep_1)
+
+        # Dependency changes: All mappings are reset to the fast rate
+        with patch.object(client, "reset_polling") as reset_polling:
+            client.request(mapping_1, listener)
+            client.receive(answer_dep_2)
+
+            reset_polling.assert_called_once()
+
+
+    def test_dispatch_index(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {},
+        )
+
+        class CountingParameterMapping(ClientParameterMapping):
+            def __init__(self, request, response):
+                super().__init__(
+                    name = uuid4(),
+                    create_key = ClientParameterMapping,
+                    request = request,
+                    response = response
+                )
+                self.num_parse_calls = 0
+
+            def parse(self, midi_message):
+                self.num_parse_calls += 1
+                return super().parse(midi_message)
+
+        mapping_1 = CountingParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x41, 0x00, 0x32, 0x03]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03]
+            )
+        )
+
+        mapping_2 = CountingParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x41, 0x00, 0x33, 0x03]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03]
+            )
+        )
+
+        mapping_3 = CountingParameterMapping(
+            request = ControlChange(20, 0),
+            response = ControlChange(20, 0)
+        )
+
+        listener = MockClientRequestListener()
+
+        client.request(mapping_1, listener)
+        client.request(mapping_2, listener)
+        client.request(mapping_3, listener)
+
+        self.assertEqual(len(client.requests), 3)
+
+        # Message for mapping 2 only reaches mapping 2
+        client.receive(SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03, 0x00, 0x01]
+        ))
+
+        self.assertEqual(mapping_1.num_parse_calls, 0)
+        self.assertEqual(mapping_2.num_parse_calls, 1)
+        self.assertEqual(mapping_3.num_parse_calls, 0)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_2])
+        self.assertEqual(mapping_2.value, 1)
+
+        # Finished request has been removed from the index
+        self.assertEqual(len(client.requests), 2)
+        self.assertEqual(client.get_matching_request(mapping_2), None)
+
+        client.receive(SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03, 0x00, 0x02]
+        ))
+
+        self.assertEqual(mapping_2.num_parse_calls, 1)
+        self.assertEqual(mapping_2.value, 1)
+
+        # Unrelated messages do not reach any mapping
+        client.receive(ControlChange(21, 3))
+        client.receive(SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x34, 0x03, 0x00, 0x02]
+        ))
+
+        self.assertEqual(mapping_1.num_parse_calls, 0)
+        self.assertEqual(mapping_3.num_parse_calls, 0)
+
+        # CC message
+        client.receive(ControlChange(20, 3))
+
+        self.assertEqual(mapping_3.num_parse_calls, 1)
+        self.assertEqual(mapping_3.value, 3)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_2, mapping_3])
+
+        # Re-register a finished mapping
+        client.request(mapping_2, listener)
+        self.assertEqual(len(client.requests), 2)
+
+        client.receive(SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03, 0x00, 0x05]
+        ))
+
+        self.assertEqual(mapping_2.num_parse_calls, 2)
+        self.assertEqual(mapping_2.value, 5)
+
+        # Terminated requests are removed, too
+        req = client.get_matching_request(mapping_1)
+        req.terminate()
+
+        client._Client__cleanup_terminated_period = MockPeriodCounter()
+        client._Client__cleanup_terminated_period.exceed_next_time = True
+        client.receive(None)
+
+        self.assertEqual(client.requests, [])
+        self.assertEqual(client.get_matching_request(mapping_1), None)
+
+
+    def test_stream_fast_path(self):
+        midi = MockAdafruitMIDI.MIDI()
+
+        client = Client(
+            midi = midi,
+            config = {},
+        )
+
+        class CountingParameterMapping(ClientParameterMapping):
+            def __init__(self, request, response, notify_always):
+                super().__init__(
+                    name = uuid4(),
+                    create_key = ClientParameterMapping,
+                    request = request,
+                    response = response,
+                    notify_always = notify_always
+                )
+                self.num_parse_calls = 0
+
+            def parse(self, midi_message):
+                self.num_parse_calls += 1
+                return super().parse(midi_message)
+
+        # Streamed value (no request message, notify always)
+        mapping_stream = CountingParameterMapping(
+            request = None,
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x7c, 0x0f]
+            ),
+            notify_always = True
+        )
+
+        # Not streamed (same address)
+        mapping_other = CountingParameterMapping(
+            request = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x41, 0x00, 0x7c, 0x0f]
+            ),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x7c, 0x0f]
+            ),
+            notify_always = False
+        )
+
+        listener = MockClientRequestListener()
+
+        client.register(mapping_stream, listener)
+
+        streams = client._Client__streams
+        self.assertEqual(list(streams.values()), [client.get_matching_request(mapping_stream)])
+
+        def message(value):
+            return SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x7c, 0x0f, 0x00, value]
+            )
+
+        self.assertEqual(client.receive(message(3)), True)
+        self.assertEqual(client.receive(message(3)), True)
+
+        self.assertEqual(mapping_stream.value, 3)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_stream, mapping_stream])
+
+        # Unrelated messages are not taken by the fast path
+        self.assertEqual(client.receive(ControlChange(20, 1)), False)
+        self.assertEqual(mapping_stream.num_parse_calls, 2)
+
+        # Another request for the same address: Fast path disabled
+        client.request(mapping_other, listener)
+        self.assertEqual(streams, {})
+
+        self.assertEqual(client.receive(message(4)), True)
+
+        self.assertEqual(mapping_stream.num_parse_calls, 3)
+        self.assertEqual(mapping_other.num_parse_calls, 1)
+        self.assertEqual(listener.parameter_changed_calls, [mapping_stream, mapping_stream, mapping_stream, mapping_other])
+
+        # Other request finished: Fast path enabled again
+        self.assertEqual(list(streams.values()), [client.get_matching_request(mapping_stream)])
+
+        self.assertEqual(client.receive(message(5)), True)
+        
+        self.assertEqual(mapping_stream.num_parse_calls, 4)
+        self.assertEqual(mapping_other.num_parse_calls, 1)
+        self.assertEqual(mapping_stream.value, 5)
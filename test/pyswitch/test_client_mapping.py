@@ -1,6 +1,8 @@
 from uuid import uuid4
+import os
 import sys
 import unittest
+from time import perf_counter
 from unittest.mock import patch   # Necessary workaround! Needs to be separated.
 
 from .mocks_lib import *
@@ -24,6 +26,10 @@ with patch.dict(sys.modules, {
     from lib.pyswitch.controller.client import *
 
 
+# Set PYSWITCH_BENCHMARK=1 to print the benchmark results
+_PRINT_RESULTS = os.environ.get("PYSWITCH_BENCHMARK", None)
+
+
 class TestClientParameterMapping(unittest.TestCase):
 
     def test_private_init(self):
@@ -40,6 +46,35 @@ class TestClientParameterMapping(unittest.TestCase):
         with self.assertRaises(Exception):
             ClientParameterMapping.get(name = None)
 
+    def test_get_keyed(self):
+        calls = []
+
+        def factory(key = None):
+            calls.append(key)
+            return ClientParameterMapping.get(name = uuid4())
+
+        def factory_2part(key):
+            calls.append(key)
+            return ClientTwoPartParameterMapping.get(name = uuid4())
+
+        mapping = ClientParameterMapping.get_keyed(factory)
+        self.assertIs(ClientParameterMapping.get_keyed(factory), mapping)
+
+        mapping_1 = ClientParameterMapping.get_keyed(factory, 1)
+        mapping_2 = ClientParameterMapping.get_keyed(factory, (2, 3))
+        self.assertIs(ClientParameterMapping.get_keyed(factory, 1), mapping_1)
+        self.assertIs(ClientParameterMapping.get_keyed(factory, (2, 3)), mapping_2)
+        self.assertIsNot(mapping_1, mapping_2)
+        self.assertIsNot(mapping, mapping_1)
+
+        mapping_2part = ClientTwoPartParameterMapping.get_keyed(factory_2part, 1)
+        self.assertIsInstance(mapping_2part, ClientTwoPartParameterMapping)
+        self.assertIs(ClientTwoPartParameterMapping.get_keyed(factory_2part, 1), mapping_2part)
+        self.assertIsNot(mapping_2part, mapping_1)
+
+        # The factories have only been called once per key
+        self.assertEqual(calls, [None, 1, (2, 3), 1])
+
 
     #####################################################################################
 
@@ -147,7 +182,7 @@ class TestClientParameterMapping(unittest.TestCase):
         def msg_valid(value): 
             hex_str = [ord(c) for c in list(value)]
             
-            return SystemExclusive(
+            return MockBytesSystemExclusive(
                 manufacturer_id = [0x00, 0x10, 0x20],
                 data = [
                     0x00, 
@@ -161,7 +196,7 @@ class TestClientParameterMapping(unittest.TestCase):
         
         mapping = ClientParameterMapping.get(
             name = uuid4(),
-            response = SystemExclusive(
+            response = MockBytesSystemExclusive(
                 manufacturer_id = [0x00, 0x10, 0x20],
                 data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa]
             ),
@@ -344,6 +379,76 @@ class TestClientParameterMapping(unittest.TestCase):
         self.assertEqual(list(mapping.set.data[0:6]), [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa])
 
 
+    def test_set_value_sysex_encoded(self):
+        mapping = ClientParameterMapping.get(
+            name = uuid4(),
+            set = MockBytesSystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa]
+            )            
+        )
+
+        mapping.set_value(0x105)
+
+        # The message is replaced by a pre-encoded one once
+        msg = mapping.set
+        self.assertIsInstance(msg, EncodedSystemExclusive)
+        self.assertEqual(msg.manufacturer_id, bytes([0x00, 0x10, 0x20]))
+        self.assertEqual(msg.data, bytes([0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa, 0x02, 0x05]))
+        self.assertEqual(msg.encoded, bytes([0xf0, 0x00, 0x10, 0x20, 0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa, 0x02, 0x05, 0xf7]))
+        self.assertEqual(bytes(msg), bytes(msg.encoded))
+
+        mapping.set_value(16383)
+        self.assertIs(mapping.set, msg)
+        self.assertEqual(msg.data[6:], bytes([0x7f, 0x7f]))
+        self.assertEqual(msg.encoded[-3:], bytes([0x7f, 0x7f, 0xf7]))
+
+        # Lists of messages
+        mapping_list = ClientParameterMapping.get(
+            name = uuid4(),
+            set = [
+                MockBytesSystemExclusive(
+                    manufacturer_id = [0x00, 0x10, 0x20],
+                    data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa]
+                ),
+                ControlChange(3, 0)
+            ]
+        )
+
+        mapping_list.set_value([200, 7])
+
+        self.assertIsInstance(mapping_list.set[0], EncodedSystemExclusive)
+        self.assertEqual(mapping_list.set[0].encoded[-3:], bytes([0x01, 0x48, 0xf7]))
+        self.assertEqual(mapping_list.set[1].value, 7)
+
+    def test_set_value_sysex_no_allocations(self):
+        import tracemalloc
+
+        mapping = ClientParameterMapping.get(
+            name = uuid4(),
+            set = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa]
+            )            
+        )
+
+        # Warm up (encodes the message)
+        mapping.set_value(1)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+
+            for i in range(100):
+                mapping.set_value(i * 100)
+
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(after, before)
+
+
     def test_set_value_sysex_string(self):
         mapping = ClientParameterMapping.get(
             name = uuid4(),
@@ -505,3 +610,196 @@ class TestClientParameterMapping(unittest.TestCase):
         self.assertEqual(mapping.result_finished(), True)
         self.assertEqual(mapping.value, 11 * 128 + 34)
 
+
+
+    #####################################################################################
+
+    def test_dispatch_keys(self):
+        mapping_sysex = ClientParameterMapping.get(
+            name = uuid4(),
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03]
+            )
+        )
+
+        key = get_dispatch_key(SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x21],
+            data = [0x02, 0x7f, 0x01, 0x00, 0x32, 0x03, 0x00, 0x01]
+        ))
+
+        self.assertEqual(mapping_sysex.dispatch_keys(), [key])
+
+        # Different address or length
+        self.assertNotEqual(key, get_dispatch_key(SystemExclusive(data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03])))
+        self.assertNotEqual(key, get_dispatch_key(SystemExclusive(data = [0x00, 0x00, 0x01, 0x00, 0x32])))
+        self.assertNotEqual(get_dispatch_key(SystemExclusive(data = [0x00, 0x00, 0x00, 0x32])), get_dispatch_key(SystemExclusive(data = [0x00, 0x00, 0x32])))
+
+        # Control change and program change
+        mapping_2part = ClientTwoPartParameterMapping.get(
+            name = uuid4(),
+            response = [
+                ControlChange(32, 0),
+                ProgramChange(0)
+            ]
+        )
+
+        self.assertEqual(mapping_2part.dispatch_keys(), [get_dispatch_key(ControlChange(32, 5)), get_dispatch_key(ProgramChange(7))])
+        self.assertNotEqual(get_dispatch_key(ControlChange(32, 5)), get_dispatch_key(ControlChange(33, 5)))
+
+        # No response: Never receives anything
+        mapping_none = ClientParameterMapping.get(
+            name = uuid4()
+        )
+
+        self.assertEqual(mapping_none.dispatch_keys(), [])
+
+        # Unknown types are not indexed
+        mapping_unknown = ClientParameterMapping.get(
+            name = uuid4(),
+            response = "foo"
+        )
+
+        self.assertEqual(get_dispatch_key("foo"), None)
+        self.assertEqual(mapping_unknown.dispatch_keys(), None)
+
+
+####################################################################################################
+
+
+    def test_sysex_matcher(self):
+        response = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa]
+        )
+
+        matcher = SysexMatcher(response)
+
+        self.assertTrue(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x01, 0x02, 0xd9, 0x01, 0x04, 0xaa, 0x03, 0x04])))
+        self.assertTrue(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x01, 0x02, 0xd9, 0x01, 0x04, 0xaa])))
+
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x21], data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa, 0x03, 0x04])))
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd8, 0x01, 0x04, 0xaa, 0x03, 0x04])))
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd9, 0x02, 0x04, 0xaa, 0x03, 0x04])))
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd9, 0x01, 0x05, 0xaa, 0x03, 0x04])))
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xab, 0x03, 0x04])))
+        self.assertFalse(matcher.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd9, 0x01, 0x04])))
+
+        # Decoding
+        msg = MockBytesSystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0xd9, 0x01, 0x04, 0xaa] + [ord(c) for c in "Rig Name"] + [0])
+        self.assertEqual(matcher.decode_string(msg), "Rig Name")
+
+        # Short templates
+        matcher_short = SysexMatcher(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x32]))
+
+        self.assertTrue(matcher_short.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x32])))
+        self.assertFalse(matcher_short.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x32, 0x00])))
+        self.assertFalse(matcher_short.matches(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x33])))
+
+    def test_sysex_matcher_no_allocations(self):
+        import tracemalloc
+
+        response = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03]
+        )
+
+        matcher = SysexMatcher(response)
+        mapping = ClientParameterMapping.get(name = uuid4(), response = response)
+
+        msg_match = SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03, 0x05, 0x06])
+        msg_other = SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x01, 0x00, 0x33, 0x03, 0x05, 0x06])
+
+        # Warm up
+        matcher.matches(msg_match)
+        mapping.parse_against(msg_match, response)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+
+            for _ in range(100):
+                matcher.matches(msg_match)
+                matcher.matches(msg_other)
+                mapping.parse_against(msg_match, response)
+                mapping.parse_against(msg_other, response)
+
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(after, before)
+
+    def test_parse_uses_compiled_matcher(self):
+        response = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03]
+        )
+
+        mapping = ClientParameterMapping.get(
+            name = uuid4(),
+            response = response
+        )
+
+        self.assertEqual(mapping.parse_against(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x03, 0x01, 0x02]), response), 130)
+        self.assertEqual(mapping.parse_against(SystemExclusive(manufacturer_id = [0x00, 0x10, 0x20], data = [0x00, 0x00, 0x01, 0x00, 0x32, 0x04, 0x01, 0x02]), response), None)
+
+        # Only one matcher is compiled per template
+        self.assertEqual(len(mapping._ClientParameterMapping__matchers), 1)
+        self.assertIs(mapping._ClientParameterMapping__matchers[0].response, response)
+
+    # Benchmark: Parsing of SysEx responses with the compiled matchers, compared to the former implementation
+    # which sliced the message data.
+    def test_benchmark_parse_sysex(self):
+        num_runs = 20000
+
+        response = MockBytesSystemExclusive(
+            manufacturer_id = [0x00, 0x20, 0x33],
+            data = [0x02, 0x7f, 0x43, 0x00, 0x00, 0x01]
+        )
+
+        msg_int = MockBytesSystemExclusive(
+            manufacturer_id = [0x00, 0x20, 0x33],
+            data = [0x00, 0x00, 0x43, 0x00, 0x00, 0x01, 0x00, 0x05]
+        )
+
+        msg_string = MockBytesSystemExclusive(
+            manufacturer_id = [0x00, 0x20, 0x33],
+            data = [0x00, 0x00, 0x43, 0x00, 0x00, 0x01] + [ord(c) for c in "Some Rig Name"] + [0x00]
+        )
+
+        def parse_legacy(midi_message, is_string):
+            if midi_message.manufacturer_id != response.manufacturer_id:
+                return None
+
+            if midi_message.data[2:6] != response.data[2:6]:
+                return None
+
+            if is_string:
+                return ''.join(chr(int(c)) for c in list(midi_message.data[6:-1]))
+            else:
+                return midi_message.data[-2] * 128 + midi_message.data[-1]
+
+        mapping_int = ClientParameterMapping.get(name = uuid4(), response = response)
+        mapping_string = ClientParameterMapping.get(name = uuid4(), response = response, type = ClientParameterMapping.PARAMETER_TYPE_STRING)
+
+        def run(func):
+            start = perf_counter()
+
+            for i in range(num_runs):
+                func()
+
+            return (perf_counter() - start) / num_runs * 1000000
+        
+        self.assertEqual(mapping_int.parse_against(msg_int, response), parse_legacy(msg_int, False))
+        self.assertEqual(mapping_string.parse_against(msg_string, response), parse_legacy(msg_string, True))
+
+        cost_int_legacy = run(lambda: parse_legacy(msg_int, False))
+        cost_int = run(lambda: mapping_int.parse_against(msg_int, response))
+        cost_string_legacy = run(lambda: parse_legacy(msg_string, True))
+        cost_string = run(lambda: mapping_string.parse_against(msg_string, response))
+
+        # Timings are only reported, not asserted (they depend on the load of the machine). The 14-bit case is about 
+        # on par on CPython (the gain on the device is that no memory is allocated, see test_sysex_matcher_no_allocations)
+        if _PRINT_RESULTS:                   # pragma: no cover
+            print(f"\nSysEx parsing per message: 14-bit value: slicing { round(cost_int_legacy, 3) }us, compiled { round(cost_int, 3) }us, string value: slicing { round(cost_string_legacy, 3) }us, compiled { round(cost_string, 3) }us")
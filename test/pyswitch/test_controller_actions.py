@@ -231,4 +231,40 @@ class TestControllerActions(unittest.TestCase):
 
         self.assertEqual(action_1.num_reset_calls, 2)
         self.assertEqual(action_2.num_reset_calls, 2)
-        self.assertEqual(action_3.num_reset_calls, 2)
\ No newline at end of file
+        self.assertEqual(action_3.num_reset_calls, 2)
+
+    def test_buffered_led_driver(self):
+        class MockBufferedNeoPixelDriver(MockNeoPixelDriver):
+            def __init__(self):
+                super().__init__()
+                self.num_show_calls = 0
+
+            def show(self):
+                self.num_show_calls += 1
+
+        led_driver = MockBufferedNeoPixelDriver()
+
+        appl = Controller(
+            led_driver = led_driver,
+            midi = MockMidiController(),
+            inputs = [
+                {
+                    "assignment": {
+                        "model": MockSwitch()
+                    },
+                    "actions": [
+                        MockAction()
+                    ]
+                }
+            ]
+        )
+
+        appl.init()
+
+        self.assertEqual(led_driver.num_show_calls, 0)
+
+        appl.tick()
+        self.assertEqual(led_driver.num_show_calls, 1)
+
+        appl.tick()
+        self.assertEqual(led_driver.num_show_calls, 2)
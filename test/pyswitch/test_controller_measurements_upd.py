@@ -68,4 +68,73 @@ class TestControllerMeasurementsUpdate(unittest.TestCase):
                 
                 self.assertGreaterEqual(gc_mock_data().collect_calls, 1)
                 self.assertIn(MockMisc.format_size(gc_mock_data().output_mem_free), MockMisc.msgs_str)
-                
\ No newline at end of file
+                
+
+
+    def test_profiler(self):
+        with patch.dict(sys.modules, {
+            "micropython": MockMicropython,
+            "usb_midi": MockUsbMidi(),
+            "adafruit_midi": MockAdafruitMIDI(),
+            "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+            "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+            "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+            "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+            "gc": MockGC(),
+            "time": MockTime
+        }):
+            from .mocks_appl import MockNeoPixelDriver, MockMidiController, MockSwitch, MockAction, MockPeriodCounter
+            from lib.pyswitch.controller.measure import TickProfiler
+            from lib.pyswitch.controller.controller import Controller
+            from lib.pyswitch.misc import Updateable
+
+            class MockUpdateable(Updateable):
+                def __init__(self):
+                    self.num_update_calls = 0
+
+                def update(self):
+                    self.num_update_calls += 1
+
+            action_1 = MockAction({ "id": "foo" })
+            period = MockPeriodCounter()
+            midi = MockMidiController()
+
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = midi,
+                inputs = [
+                    {
+                        "assignment": {
+                            "model": MockSwitch()
+                        },
+                        "actions": [
+                            action_1                        
+                        ]
+                    }
+                ],
+                period_counter = period,
+                config = {
+                    "debugProfiler": True
+                }
+            )
+
+            profiler = appl._Controller__profiler
+            self.assertIsInstance(profiler, TickProfiler)
+            self.assertIn(profiler, appl.updateables)
+
+            u = MockUpdateable()
+            appl.add_updateable(u)
+
+            self.assertEqual(profiler.names, ["MockAction foo", "SwitchController 1", "Client.receive", "MIDI.receive", "MockUpdateable"])
+
+            period.exceed_next_time = True
+            appl.tick()
+
+            self.assertEqual(action_1.num_update_calls_overall, 1)
+            self.assertEqual(u.num_update_calls, 1)
+
+            self.assertEqual(profiler.calls[0], 1)
+            self.assertEqual(profiler.calls[1], 3)
+            self.assertEqual(profiler.calls[2], 3)
+            self.assertEqual(profiler.calls[3], 3)
+            self.assertEqual(profiler.calls[4], 1)
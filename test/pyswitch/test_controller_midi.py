@@ -20,6 +20,40 @@ with patch.dict(sys.modules, {
     from lib.pyswitch.controller.controller import Controller
 
 
+# Advances the (mocked) time by 100us with every received message
+class MockTimedMidiController(MockMidiController):
+    def __init__(self):
+        super().__init__()
+        self.backlog = False
+
+    def receive(self):
+        msg = super().receive()
+
+        if msg != None:
+            MockTime.mock["monotonicReturn"] += 0.0001
+
+        return msg
+    
+
+class MockReceivingClient:
+    def __init__(self):
+        self.receive_calls = []
+
+    def receive(self, midi_message):
+        self.receive_calls.append(midi_message)
+
+
+class MockCountingSwitch(MockSwitch):
+    def __init__(self):
+        super().__init__()
+        self.num_reads = 0
+
+    @property
+    def pushed(self):
+        self.num_reads += 1
+        return False
+    
+
 class TestControllerMidi(unittest.TestCase):
 
     def test_clear_buffers(self):
@@ -63,4 +97,132 @@ class TestControllerMidi(unittest.TestCase):
         self.assertEqual(len(midi.next_receive_messages), 0 if do_it else num_msgs)
 
 
+    ###############################################################################################
+
+
+    def test_time_budget(self):
+        midi = MockTimedMidiController()
+        switch = MockCountingSwitch()
+
+        with patch.dict(sys.modules, {
+            "time": MockTime
+        }):
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = midi,
+                config = {
+                    "midiTimeBudgetMicros": 250,
+                    "maxConsecutiveMidiMessages": 1
+                },
+                inputs = [
+                    {
+                        "assignment": {
+                            "model": switch
+                        }
+                    }
+                ],
+                period_counter = MockPeriodCounter()
+            )
+
+        appl.client = MockReceivingClient()
+        switch.num_reads = 0
+
+        for i in range(7):
+            midi.next_receive_messages.append(i + 1)
+
+        # Each message takes 100us, so 3 messages are parsed per tick (budget exceeded after the third)
+        appl.tick()
+        self.assertEqual(len(midi.next_receive_messages), 4)
+        self.assertEqual(switch.num_reads, 1)
+
+        appl.tick()
+        self.assertEqual(len(midi.next_receive_messages), 1)
+        self.assertEqual(switch.num_reads, 2)
+
+        appl.tick()
+        self.assertEqual(len(midi.next_receive_messages), 0)
+        self.assertEqual(switch.num_reads, 3)
+
+        self.assertEqual(len(appl.client.receive_calls), 8)   # 7 messages, plus None at the end
+        
+
+    def test_time_budget_backlog(self):
+        midi = MockTimedMidiController()
+
+        with patch.dict(sys.modules, {
+            "time": MockTime
+        }):
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = midi,
+                config = {
+                    "midiTimeBudgetMicros": 250
+                },
+                period_counter = MockPeriodCounter()
+            )
+
+        appl.client = MockReceivingClient()
+
+        for i in range(100):
+            midi.next_receive_messages.append(i + 1)
+
+        def do_tick():
+            before = len(midi.next_receive_messages)
+            appl.tick()
+            return before - len(midi.next_receive_messages)
+
+        # No backlog
+        self.assertEqual(do_tick(), 3)
+        self.assertEqual(do_tick(), 3)
+
+        # Backlog: Budget is increased up to 4 times
+        midi.backlog = True
+
+        self.assertEqual(do_tick(), 3)
+        self.assertEqual(do_tick(), 5)
+        self.assertEqual(do_tick(), 8)
+        self.assertEqual(do_tick(), 10)
+        self.assertEqual(do_tick(), 10)
+
+        # Backlog resolved
+        midi.backlog = False
+
+        self.assertEqual(do_tick(), 10)
+        self.assertEqual(do_tick(), 3)
+
+        # Queue drained: Budget is reset
+        midi.backlog = True
+        
+        self.assertEqual(do_tick(), 3)
+        self.assertEqual(do_tick(), 5)
+
+        midi.next_receive_messages = [1, 2]
+        self.assertEqual(do_tick(), 2)
+
+        midi.next_receive_messages = [i + 1 for i in range(20)]
+        self.assertEqual(do_tick(), 3)
+
+
+    def test_client_flush(self):
+        class MockFlushingClient(MockReceivingClient):
+            def __init__(self):
+                super().__init__()
+                self.num_flush_calls = 0
+
+            def flush(self):
+                self.num_flush_calls += 1
+
+        for config, flush in [({}, False), ({ "prioritizeSetMessages": True }, True), ({ "coalesceContinuousMessages": True }, True)]:
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = MockMidiController(),
+                config = config,
+                period_counter = MockPeriodCounter()
+            )
+
+            appl.client = MockFlushingClient()
+
+            appl.tick()
+            appl.tick()
 
+            self.assertEqual(appl.client.num_flush_calls, 2 if flush else 0)
@@ -0,0 +1,159 @@
+import sys
+import unittest
+from unittest.mock import patch   # Necessary workaround! Needs to be separated.
+
+from .mocks_lib import *
+
+# Import subject under test
+with patch.dict(sys.modules, {
+    "micropython": MockMicropython,
+    "usb_midi": MockUsbMidi(),
+    "adafruit_midi": MockAdafruitMIDI(),
+    "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+    "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+    "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+    "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+    "gc": MockGC()
+}):
+    from .mocks_appl import *
+    from lib.pyswitch.misc import Updateable
+    from .mocks_callback import *
+    from lib.pyswitch.controller.controller import Controller
+
+
+class MockScheduledUpdateable(Updateable):
+    def __init__(self, interval_millis = None):
+        self.update_interval_millis = interval_millis
+        self.num_update_calls = 0
+
+    def update(self):
+        self.num_update_calls += 1
+
+
+class MockCountingMidiController(MockMidiController):
+    def __init__(self):
+        super().__init__()
+        self.num_receive_calls = 0
+
+    def receive(self):
+        self.num_receive_calls += 1
+        return super().receive()
+
+
+class TestControllerScheduler(unittest.TestCase):
+
+    def test_scheduled_updateables(self):
+        self.current_millis = 1000
+
+        def get_current_millis():
+            return self.current_millis
+
+        midi = MockCountingMidiController()
+        period = MockPeriodCounter()
+
+        # Replace the time source in the controller module's namespace
+        with patch.dict(Controller.tick.__globals__, { "get_current_millis": get_current_millis }):
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = midi,
+                period_counter = period
+            )
+
+            u_periodic = MockScheduledUpdateable()
+            u_fast = MockScheduledUpdateable(10)
+            u_slow = MockScheduledUpdateable(50)
+
+            appl.add_updateable(u_periodic)
+            appl.add_updateable(u_fast)
+            appl.add_updateable(u_slow)
+
+            # Adding again has no effect
+            appl.add_updateable(u_fast)
+
+            self.assertEqual(appl.updateables, [u_periodic, u_fast, u_slow])
+
+            def check(periodic, fast, slow):
+                self.assertEqual(u_periodic.num_update_calls, periodic)
+                self.assertEqual(u_fast.num_update_calls, fast)
+                self.assertEqual(u_slow.num_update_calls, slow)
+
+            appl.tick()
+            check(0, 0, 0)
+
+            # Periodic updateables are not affected by the scheduler
+            period.exceed_next_time = True
+            appl.tick()
+            check(1, 0, 0)
+
+            self.current_millis = 1009
+            appl.tick()
+            check(1, 0, 0)
+
+            # Updates interleave with MIDI receiving
+            midi.num_receive_calls = 0
+
+            self.current_millis = 1010
+            appl.tick()
+            check(1, 1, 0)
+            self.assertEqual(midi.num_receive_calls, 2)
+
+            appl.tick()
+            check(1, 1, 0)
+
+            self.current_millis = 1050
+            appl.tick()
+            check(1, 2, 1)
+
+            self.current_millis = 1060
+            period.exceed_next_time = True
+            appl.tick()
+            check(2, 3, 1)
+
+            self.current_millis = 1100
+            appl.tick()
+            check(2, 4, 2)
+
+    def test_client_update_interval(self):
+        appl = Controller(
+            led_driver = MockNeoPixelDriver(),
+            midi = MockMidiController(),
+            protocol = MockBidirectionalProtocol(),
+            config = {
+                "clientUpdateInterval": 500
+            },
+            period_counter = MockPeriodCounter()
+        )
+
+        self.assertEqual(appl.client.update_interval_millis, 500)
+        self.assertIn(appl.client, appl.updateables)
+
+
+    def test_callback_update_interval(self):
+        appl = Controller(
+            led_driver = MockNeoPixelDriver(),
+            midi = MockMidiController(),
+            config = {
+                "callbackUpdateInterval": 50
+            },
+            period_counter = MockPeriodCounter()
+        )
+
+        cb = MockCallback(mappings = [MockParameterMapping()])
+        cb.init(appl)
+
+        self.assertEqual(cb.update_interval_millis, 50)
+        self.assertIn(cb, appl.updateables)
+        self.assertNotIn(cb, appl._Controller__periodic)
+
+        # Without the option, callbacks are updated with the global interval
+        appl = Controller(
+            led_driver = MockNeoPixelDriver(),
+            midi = MockMidiController(),
+            period_counter = MockPeriodCounter()
+        )
+
+        cb = MockCallback(mappings = [MockParameterMapping()])
+        cb.init(appl)
+
+        self.assertEqual(cb.update_interval_millis, None)
+        self.assertIn(cb, appl._Controller__periodic)
@@ -0,0 +1,192 @@
+import os
+import sys
+import unittest
+from time import perf_counter
+from importlib.util import spec_from_file_location, module_from_spec
+from unittest.mock import patch   # Necessary workaround! Needs to be separated.
+
+from .mocks_lib import *
+
+
+# MIDI handler mock which behaves like adafruit_midi.MIDI regarding the input port: It always requests 
+# to fill up its input buffer. Every three bytes form a message.
+class MockByteMIDI:
+    class MIDI:
+        def __init__(self, midi_out = None, out_channel = None, midi_in = None, in_channel = None, in_buf_size = 30):
+            self.midi_in = midi_in
+            self.in_channel = in_channel
+            self.in_buf_size = in_buf_size
+            self.buffer = bytearray()
+            self.num_parse_calls = 0
+
+        def receive(self):
+            if len(self.buffer) < self.in_buf_size:
+                data = self.midi_in.read(self.in_buf_size - len(self.buffer))
+                if data:
+                    self.buffer.extend(data)
+
+            self.num_parse_calls += 1
+
+            if len(self.buffer) < 3:
+                return None
+            
+            ret = bytes(self.buffer[:3])
+            del self.buffer[:3]
+
+            # Channel filter: The message is dropped, further ones stay in the buffer
+            if self.in_channel != None and (ret[0] & 0x0f) != self.in_channel:
+                return None
+            
+            return ret
+        
+
+# Import subject under test (directly from the file, as the hardware package needs the board modules)
+with patch.dict(sys.modules, {
+    "micropython": MockMicropython,
+    "adafruit_midi": MockByteMIDI(),
+    "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+    "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+    "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+    "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+    "busio": MockBusIO()
+}):
+    import lib.pyswitch.hardware
+
+    _spec = spec_from_file_location(
+        "lib.pyswitch.hardware.adafruit.AdafruitDinMidiDevice", 
+        os.path.join(lib.pyswitch.hardware.__path__[0], "adafruit", "AdafruitDinMidiDevice.py")
+    )
+    _module = module_from_spec(_spec)
+    _spec.loader.exec_module(_module)
+
+    AdafruitDinMidiDevice = _module.AdafruitDinMidiDevice
+    EncodedSystemExclusive = _module._EncodedSystemExclusive
+
+
+# Set PYSWITCH_BENCHMARK=1 to print the benchmark results
+_PRINT_RESULTS = os.environ.get("PYSWITCH_BENCHMARK", None)
+
+
+class TestDinMidiDevice(unittest.TestCase):
+
+    def _create(self, non_blocking, stream_parser = False, in_channel = None):
+        device = AdafruitDinMidiDevice(
+            gpio_in = "in",
+            gpio_out = "out",
+            in_buf_size = 30,
+            baudrate = 31250,
+            timeout = 0.001,
+            in_channel = in_channel,
+            non_blocking = non_blocking,
+            stream_parser = stream_parser
+        )
+
+        midi = device._AdafruitDinMidiDevice__midi
+        uart = device._AdafruitDinMidiDevice__port_out
+
+        return (device, midi, uart)
+
+    def test_receive(self):
+        for non_blocking in [False, True]:
+            device, midi, uart = self._create(non_blocking)
+
+            self.assertEqual(device.receive(), None)
+
+            uart.incoming.extend([0xb0, 0x01, 0x02, 0xb0])
+            self.assertEqual(device.receive(), bytes([0xb0, 0x01, 0x02]))
+            self.assertEqual(device.receive(), None)
+
+            uart.incoming.extend([0x03, 0x04, 0xc0, 0x05, 0x06])
+            self.assertEqual(device.receive(), bytes([0xb0, 0x03, 0x04]))
+            self.assertEqual(device.receive(), bytes([0xc0, 0x05, 0x06]))
+            self.assertEqual(device.receive(), None)
+            self.assertEqual(device.receive(), None)
+
+            self.assertEqual(midi.num_parse_calls, 7)
+
+            if non_blocking:
+                # Never waits for the timeout
+                self.assertEqual(uart.stalled, 0)
+            else:
+                self.assertGreater(uart.stalled, 0)
+
+    def test_receive_channel_filter(self):
+        device, midi, uart = self._create(True, in_channel = 0)
+
+        # The first message is dropped by adafruit_midi, the second one is still waiting in its buffer
+        uart.incoming.extend([0xb1, 0x01, 0x02, 0xb0, 0x03, 0x04])
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.in_waiting, 0)
+
+        self.assertEqual(device.receive(), bytes([0xb0, 0x03, 0x04]))
+        self.assertEqual(device.receive(), None)
+
+    def test_receive_stream_parser_idle(self):
+        device, midi, uart = self._create(True, stream_parser = True)
+
+        # Data bytes without status: No message
+        uart.incoming.extend([0x01, 0x02])
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.num_reads, 1)
+
+        # Idle: The UART is not read again until new bytes are waiting
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.num_reads, 1)
+
+        # More bytes waiting than fit into the input buffer: Not idle
+        uart.incoming.extend([0x01] * 35)
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.in_waiting, 5)
+
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.num_reads, 3)
+
+        self.assertEqual(device.receive(), None)
+        self.assertEqual(uart.num_reads, 3)
+
+        uart.incoming.extend([0xf8])
+        self.assertNotEqual(device.receive(), None)
+        self.assertEqual(uart.num_reads, 4)
+
+    def test_send_encoded(self):
+        device, midi, uart = self._create(True)
+
+        msg = EncodedSystemExclusive(
+            manufacturer_id = [0x00, 0x20, 0x33],
+            data = [0x02, 0x7f, 0x01, 0x00, 0x32, 0x03, 0x00, 0x00]
+        )
+
+        msg.set_data(7, 0x12)
+        
+        # Written directly to the port
+        device.send(msg)
+        self.assertEqual(uart.outgoing, bytes([0xf0, 0x00, 0x20, 0x33, 0x02, 0x7f, 0x01, 0x00, 0x32, 0x03, 0x00, 0x12, 0xf7]))
+
+    # Benchmark: Simulates the receive loop of the controller (up to 10 messages per tick, until None is returned)
+    # with a message coming in every 5 ticks. The cost per tick is the CPU time plus the (simulated) time
+    # spent waiting for the UART read timeout.
+    def test_benchmark(self):
+        num_ticks = 2000
+        
+        def run(non_blocking):
+            device, midi, uart = self._create(non_blocking)
+
+            start = perf_counter()
+
+            for tick in range(num_ticks):
+                if tick % 5 == 0:
+                    uart.incoming.extend([0xb0, 0x01, tick % 128])
+
+                for i in range(10):
+                    if device.receive() == None:
+                        break
+
+            return (perf_counter() - start + uart.stalled) / num_ticks * 1000000
+
+        cost_blocking = run(False)
+        cost_non_blocking = run(True)
+
+        if _PRINT_RESULTS:                   # pragma: no cover
+            print(f"\nDIN MIDI receive per tick: blocking { round(cost_blocking, 2) }us, non-blocking { round(cost_non_blocking, 2) }us")
+
+        self.assertLess(cost_non_blocking, cost_blocking)
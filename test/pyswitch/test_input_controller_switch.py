@@ -457,3 +457,86 @@ class TestControllerSwitch(unittest.TestCase):
         self.assertEqual(action_1.num_release_calls, 1)
         self.assertEqual(action_2.num_release_calls, 1)
         self.assertEqual(action_o.num_release_calls, 1)
+
+    ##############################################################################
+
+    def test_latency_edges(self):
+        class MockLatency:
+            def __init__(self):
+                self.num_edges = 0
+
+            def input_edge(self):
+                self.num_edges += 1
+
+        appl = MockController(num_leds=5)
+        switch_1 = MockSwitch()
+        action_1 = MockAction()
+
+        fs = SwitchController(appl, {
+            "assignment": {
+                "model": switch_1
+            },
+            "actions": [
+                action_1
+            ]
+        })
+
+        # Not set by default
+        self.assertEqual(fs.latency, None)
+
+        fs.latency = MockLatency()
+
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 0)
+
+        switch_1.shall_be_pushed = True
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 1)
+
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 1)
+
+        # Releases do not trigger actions
+        switch_1.shall_be_pushed = False
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 1)
+
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 1)
+
+    def test_latency_edges_hold(self):
+        class MockLatency:
+            def __init__(self):
+                self.num_edges = 0
+
+            def input_edge(self):
+                self.num_edges += 1
+
+        appl = MockController(num_leds=5)
+        switch_1 = MockSwitch()
+        action_1 = MockAction()
+        action_2 = MockAction()
+
+        fs = SwitchController(appl, {
+            "assignment": {
+                "model": switch_1
+            },
+            "actions": [
+                action_1
+            ],
+            "actionsHold": [
+                action_2
+            ]
+        }, MockPeriodCounter())
+
+        fs.latency = MockLatency()
+
+        # In hold mode, the actions are triggered on release
+        switch_1.shall_be_pushed = True
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 0)
+
+        switch_1.shall_be_pushed = False
+        fs.process()
+        self.assertEqual(fs.latency.num_edges, 1)
+        self.assertEqual(action_1.num_push_calls, 1)
@@ -202,6 +202,21 @@ class TestKemper(unittest.TestCase):
         self.assertIn("FixAir", MAPPING_FIXED_AIR().name)
         self.assertIn("FixTracker", MAPPING_FIXED_DBL_TRACKER().name)
 
+    def test_persisted_mappings(self):
+        # Only permanently displayed values are stored in the value cache
+        self.assertEqual(KemperMappings.RIG_ID().persist, True)
+        self.assertEqual(KemperMappings.RIG_NAME().persist, True)
+        self.assertEqual(KemperMappings.EFFECT_TYPE(KemperEffectSlot.EFFECT_SLOT_ID_A).persist, True)
+        self.assertEqual(KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A).persist, True)
+        self.assertEqual(MAPPING_NEXT_BANK().persist, True)
+        self.assertEqual(MAPPING_PREVIOUS_BANK().persist, True)
+
+        self.assertEqual(KemperMappings.RIG_DATE().persist, False)
+        self.assertEqual(KemperMappings.TUNER_MODE_STATE().persist, False)
+        self.assertEqual(KemperMappings.TUNER_NOTE().persist, False)
+        self.assertEqual(KemperMappings.TUNER_DEVIANCE().persist, False)
+        self.assertEqual(MAPPING_TEMPO_DISPLAY().persist, False)
+
 
 ##########################################################################################################
 
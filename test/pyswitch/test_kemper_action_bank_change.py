@@ -27,6 +27,8 @@ with patch.dict(sys.modules, {
     from lib.pyswitch.clients.kemper.actions.rig_select import *
     from lib.pyswitch.clients.kemper.mappings.bank import *
     from lib.pyswitch.clients.kemper.mappings.select import *
+    import lib.pyswitch.clients.kemper.rig_name_cache as rig_name_cache_module
+    from lib.pyswitch.clients.kemper.rig_name_cache import KemperRigNameCache
 
 
 ####################################################################################################
@@ -813,3 +815,47 @@ class TestKemperActionDefinitionsBankChange(unittest.TestCase):
 
 
 
+    def test_rig_names(self):
+        self._test_rig_names(up = True, display_mode = RIG_SELECT_DISPLAY_TARGET_RIG, rig_id = 12)
+        self._test_rig_names(up = False, display_mode = RIG_SELECT_DISPLAY_TARGET_RIG, rig_id = 2)
+        self._test_rig_names(up = True, display_mode = RIG_SELECT_DISPLAY_CURRENT_RIG, rig_id = 7)
+
+    def _test_rig_names(self, up, display_mode, rig_id):
+        display = DisplayLabel(layout = {
+            "font": "foo",
+            "backColor": (0, 0, 0)
+        })
+
+        action = (BANK_UP if up else BANK_DOWN)(
+            display = display,
+            text = "foo",
+            display_mode = display_mode,
+            preselect = True,
+            rig_names = True
+        )
+
+        appl = MockController()
+        switch = MockFootswitch(actions = [action])
+
+        # The cache module is imported by the callback on demand
+        with patch.dict(sys.modules, { "lib.pyswitch.clients.kemper.rig_name_cache": rig_name_cache_module }):
+            action.init(appl, switch)
+
+        cache = appl.shared["rigNameCache"]
+        self.assertIsInstance(cache, KemperRigNameCache)
+
+        mapping = appl.client.register_calls[0]["mapping"]
+        mapping.value = 7
+
+        # Name not known yet
+        action.update_displays()
+        self.assertEqual(display.text, "foo")
+
+        # Name is learned (the label is updated by the cache)
+        KemperMappings.RIG_ID().value = rig_id
+        KemperMappings.RIG_NAME().value = "Rig Name"
+        KemperMappings.RIG_DATE().value = "Date"
+
+        cache._KemperRigNameCache__store()
+
+        self.assertEqual(display.text, "Rig Name")
@@ -126,6 +126,48 @@ class TestKemperActionEffectState(unittest.TestCase):
             self.assertEqual(cb.get_effect_category(i), KemperEffectEnableCallback.CATEGORY_REVERB)
 
 
+    def test_effect_categories_all_types(self):
+        cb = KemperEffectEnableCallback(KemperEffectSlot.EFFECT_SLOT_ID_DLY)
+
+        # Reference implementation (as the categories were determined before the lookup table was used)
+        def get_category(t):
+            if t == 0:
+                return KemperEffectEnableCallback.CATEGORY_NONE
+            elif (0 < t and t <= 10) or t == 12:
+                return KemperEffectEnableCallback.CATEGORY_WAH
+            elif t == 11 or t == 13:
+                return KemperEffectEnableCallback.CATEGORY_PITCH
+            elif 14 < t and t <= 45:
+                return KemperEffectEnableCallback.CATEGORY_DISTORTION
+            elif 45 < t and t <= 55:
+                return KemperEffectEnableCallback.CATEGORY_COMPRESSOR
+            elif 55 < t and t <= 60:
+                return KemperEffectEnableCallback.CATEGORY_NOISE_GATE
+            elif 60 < t and t <= 64:
+                return KemperEffectEnableCallback.CATEGORY_SPACE
+            elif 64 < t and t <= 80:
+                return KemperEffectEnableCallback.CATEGORY_CHORUS
+            elif 80 < t and t <= 95:
+                return KemperEffectEnableCallback.CATEGORY_PHASER_FLANGER
+            elif 95 < t and t <= 110:
+                return KemperEffectEnableCallback.CATEGORY_EQUALIZER
+            elif 110 < t and t <= 120:
+                return KemperEffectEnableCallback.CATEGORY_BOOSTER
+            elif 120 < t and t <= 125:
+                return KemperEffectEnableCallback.CATEGORY_LOOPER
+            elif 125 < t and t <= 135:
+                return KemperEffectEnableCallback.CATEGORY_PITCH
+            elif 135 < t and t <= 143:
+                return KemperEffectEnableCallback.CATEGORY_DUAL
+            elif 143 < t and t <= 170:
+                return KemperEffectEnableCallback.CATEGORY_DELAY
+            else:
+                return KemperEffectEnableCallback.CATEGORY_REVERB
+
+        for i in range(0, 16384):
+            self.assertEqual(cb.get_effect_category(i), get_category(i), i)
+
+
     def test_type_colors(self):
         # All types have to be mapped
         cb = KemperEffectEnableCallback(KemperEffectSlot.EFFECT_SLOT_ID_DLY)
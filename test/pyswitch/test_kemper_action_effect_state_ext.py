@@ -71,3 +71,21 @@ class TestKemperActionEffectStateExt(unittest.TestCase):
 
         self.assertEqual(cb.get_effect_category_text(0, 2), "foo")
         self.assertEqual(cb.get_effect_category_text(0, 33), "bar")
+
+
+    def test_effect_type_names_table(self):
+        cb = EFFECT_STATE_EXT(KemperEffectSlot.EFFECT_SLOT_ID_DLY).callback
+
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_NONE, 0), "Empty")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_WAH, 1), "Wah")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_WAH, 6), "Wah Ph")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_DISTORTION, 42), "Full OC")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_CHORUS, 80), "SawPan")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_PHASER_FLANGER, 81), "Phaser")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_REVERB, 193), "Spring")
+
+        # Unused types: Category names
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_WAH, 5), "Wah")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_DISTORTION, 40), "Dist")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_REVERB, 194), "Reverb")
+        self.assertEqual(cb.get_effect_category_text(KemperEffectEnableCallback.CATEGORY_REVERB, 5000), "Reverb")
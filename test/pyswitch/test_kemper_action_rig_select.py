@@ -25,6 +25,8 @@ with patch.dict(sys.modules, {
 
     from lib.pyswitch.clients.kemper.actions.rig_select import *
     from lib.pyswitch.clients.kemper.actions.rig_select_and_morph_state import *
+    import lib.pyswitch.clients.kemper.rig_name_cache as rig_name_cache_module
+    from lib.pyswitch.clients.kemper.rig_name_cache import KemperRigNameCache
     
     from lib.pyswitch.clients.kemper.mappings.select import *
 
@@ -1331,3 +1333,56 @@ class TestKemperActionDefinitionsRigSelect(unittest.TestCase):
         self.assertEqual(appl.shared["morphStateOverride"], 0)
 
         self.assertEqual(len(appl.client.set_calls), 2)
+
+
+#################################################################################################
+
+
+    def test_rig_names(self):
+        display = DisplayLabel(layout = {
+            "font": "foo",
+            "backColor": (0, 0, 0)
+        })
+
+        action = RIG_SELECT(
+            rig = 2,
+            display = display,
+            display_mode = RIG_SELECT_DISPLAY_TARGET_RIG,
+            rig_names = True
+        )
+
+        appl = MockController()
+        switch = MockFootswitch(actions = [action])
+
+        # The cache module is imported by the callback on demand
+        with patch.dict(sys.modules, { "lib.pyswitch.clients.kemper.rig_name_cache": rig_name_cache_module }):
+            action.init(appl, switch)
+
+        cache = appl.shared["rigNameCache"]
+        self.assertIsInstance(cache, KemperRigNameCache)
+
+        mapping = action.callback._KemperRigSelectCallback__mapping
+        mapping.value = 10
+
+        action.update_displays()
+        self.assertEqual(display.text, "Rig 3-2")
+
+        # Name of the target rig is learned when the rig is visited (the label is updated by the cache)
+        KemperMappings.RIG_NAME().value = "Lead"
+        KemperMappings.RIG_DATE().value = "Date"
+        mapping.value = 11
+
+        cache._KemperRigNameCache__store()
+
+        self.assertEqual(display.text, "Lead")
+
+        mapping.value = 10
+
+        action.update_displays()
+        self.assertEqual(display.text, "Lead")
+
+        # Preselected bank with unknown rig
+        appl.shared["preselectedBank"] = 5
+
+        action.update_displays()
+        self.assertEqual(display.text, "Rig 6-2")
@@ -216,3 +216,119 @@ class TestKemperBidirectionalProtocol(unittest.TestCase):
 
         # Not in
         self.assertEqual(protocol.feedback_value(MAPPING_CABINET_STATE()), False)
+
+
+    def test_auto_parameter_set(self):
+        def run(mappings):
+            protocol = KemperBidirectionalProtocol(20, auto_parameter_set = True)
+            protocol.init_period = MockPeriodCounter()
+            protocol.resend_period = MockPeriodCounter()
+            protocol.sensing_period = MockPeriodCounter()
+
+            midi = MockMidiController()
+            protocol.init(midi, MockClient())
+
+            for m in mappings:
+                protocol.is_bidirectional(m)
+
+            protocol.init_period.exceed_next_time = True
+            protocol.update()
+
+            self.assertEqual(len(midi.messages_sent), 1)
+
+            return (protocol, midi, midi.messages_sent[0].data[5])
+        
+        # Only set 2 is known: Used for everything, even if no bidirectional mapping is registered
+        protocol, midi, set_id = run([
+            KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
+            MAPPING_CABINET_STATE()
+        ])
+
+        self.assertEqual(set_id, 0x02)
+        self.assertEqual(protocol.is_bidirectional(KemperMappings.RIG_NAME()), True)
+        self.assertEqual(protocol.is_bidirectional(MAPPING_CABINET_STATE()), False)
+
+        protocol, midi, set_id = run([])
+        self.assertEqual(set_id, 0x02)
+
+        # With a smaller set available
+        sets = (
+            (0x01, set([
+                KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
+                KemperMappings.TUNER_MODE_STATE()
+            ])),
+            (0x02, set([
+                KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
+                KemperMappings.TUNER_MODE_STATE(),
+                KemperMappings.RIG_NAME()
+            ]))
+        )
+
+        with patch.dict(KemperBidirectionalProtocol.__init__.__globals__, { "_PARAMETER_SETS": sets }):
+            protocol, midi, set_id = run([
+                KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
+                MAPPING_CABINET_STATE()
+            ])
+
+            self.assertEqual(set_id, 0x01)
+            self.assertEqual(protocol.parameter_set_id, 0x01)
+
+            protocol.state = protocol._STATE_RUNNING
+
+            # Nothing to do
+            protocol.update()
+            self.assertEqual(len(midi.messages_sent), 1)
+
+            # Covered mapping registered later
+            self.assertEqual(protocol.is_bidirectional(KemperMappings.TUNER_MODE_STATE()), True)
+            protocol.update()
+            self.assertEqual(len(midi.messages_sent), 1)
+
+            # Not covered mapping registered later: Re-initialize with a set covering it
+            self.assertEqual(protocol.is_bidirectional(KemperMappings.RIG_NAME()), True)
+            self.assertEqual(protocol.feedback_value(KemperMappings.RIG_NAME()), True)
+
+            protocol.update()
+            self.assertEqual(len(midi.messages_sent), 2)
+            self.assertEqual(midi.messages_sent[1].data[5], 0x02)
+            self.assertEqual(protocol.parameter_set_id, 0x02)
+
+            protocol.update()
+            self.assertEqual(len(midi.messages_sent), 2)
+
+            # Selection is done again on every initial beacon
+            protocol.state = protocol._STATE_OFFLINE
+            protocol.init_period.exceed_next_time = True
+            protocol.update()
+
+            self.assertEqual(len(midi.messages_sent), 3)
+            self.assertEqual(midi.messages_sent[2].data[5], 0x02)
+
+            # Rig name: Set 2
+            protocol, midi, set_id = run([
+                KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A),
+                KemperMappings.RIG_NAME()
+            ])
+
+            self.assertEqual(set_id, 0x02)
+
+            # Before selection, all mappings of the largest set are bidirectional
+            protocol = KemperBidirectionalProtocol(20, auto_parameter_set = True)
+            self.assertEqual(protocol.is_bidirectional(KemperMappings.RIG_NAME()), True)
+            self.assertEqual(protocol.parameter_set_id, 0x02)
+
+    def test_fixed_parameter_set(self):
+        protocol = KemperBidirectionalProtocol(20)
+        protocol.init_period = MockPeriodCounter()
+
+        midi = MockMidiController()
+        protocol.init(midi, MockClient())
+
+        protocol.is_bidirectional(KemperMappings.EFFECT_STATE(KemperEffectSlot.EFFECT_SLOT_ID_A))
+
+        protocol.init_period.exceed_next_time = True
+        protocol.update()
+
+        self.assertEqual(midi.messages_sent[0].data[5], 0x02)
+        self.assertEqual(protocol.parameter_set_id, 0x02)
+        self.assertEqual(protocol.is_bidirectional(KemperMappings.RIG_NAME()), True)
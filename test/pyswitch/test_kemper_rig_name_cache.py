@@ -0,0 +1,201 @@
+import sys
+import unittest
+from unittest.mock import patch   # Necessary workaround! Needs to be separated.
+
+from .mocks_lib import *
+
+# Import subject under test
+with patch.dict(sys.modules, {
+    "micropython": MockMicropython,
+    "displayio": MockDisplayIO(),
+    "adafruit_display_text": MockAdafruitDisplayText(),
+    "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+    "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+    "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+    "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+    "adafruit_display_shapes.rect": MockDisplayShapes().rect(),
+    "gc": MockGC()
+}):
+    from lib.pyswitch.clients.kemper import *
+    from lib.pyswitch.clients.kemper.rig_name_cache import KemperRigNameCache
+
+    from .mocks_appl import *
+
+
+class TestKemperRigNameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.current_millis = 1000
+
+        self.mapping_id = KemperMappings.RIG_ID()
+        self.mapping_name = KemperMappings.RIG_NAME()
+        self.mapping_date = KemperMappings.RIG_DATE()
+
+        self.mapping_id.value = None
+        self.mapping_name.value = None
+        self.mapping_date.value = None
+
+    def get_current_millis(self):
+        return self.current_millis
+
+    def visit(self, cache, rig_id, name, date):
+        self.mapping_id.value = rig_id
+        cache.parameter_changed(self.mapping_id)
+
+        self.mapping_name.value = name
+        cache.parameter_changed(self.mapping_name)
+
+        self.mapping_date.value = date
+        cache.parameter_changed(self.mapping_date)
+
+        self.current_millis += 1000
+        cache.update()
+
+
+    def test_init(self):
+        appl = MockController()
+        
+        cache = KemperRigNameCache.get(appl)
+
+        self.assertIs(KemperRigNameCache.get(appl), cache)
+        self.assertIn(cache, appl.updateables)
+
+        self.assertEqual([c["mapping"] for c in appl.client.register_calls], [
+            self.mapping_id,
+            self.mapping_name,
+            self.mapping_date
+        ])
+
+        # Size derived from free memory (20kB in the mock)
+        self.assertEqual(cache.size, 20)
+
+        # Size limits
+        self.assertEqual(KemperRigNameCache(size = 1).size, NUM_RIGS_PER_BANK)
+        self.assertEqual(KemperRigNameCache(size = 10000).size, NUM_BANKS * NUM_RIGS_PER_BANK)
+
+        # Mappings are requested on update
+        cache.update()
+
+        self.assertEqual([c["mapping"] for c in appl.client.request_calls], [
+            self.mapping_id,
+            self.mapping_name,
+            self.mapping_date
+        ])
+
+
+    def test_settle(self):
+        with patch.dict(KemperRigNameCache.update.__globals__, { "get_current_millis": self.get_current_millis }):
+            cache = KemperRigNameCache(size = 10, settle_millis = 500)
+            cache.init(MockController())
+
+            listener = MockClientRequestListener()
+            cache.add_listener(listener)
+
+            # Rig change in progress: Nothing is stored until all values have been stable for the settle time
+            self.mapping_id.value = 7
+            cache.parameter_changed(self.mapping_id)
+
+            self.current_millis = 1300
+            self.mapping_name.value = "Old Name"
+            self.mapping_date.value = "Date 1"
+            cache.parameter_changed(self.mapping_name)
+            cache.parameter_changed(self.mapping_date)
+
+            self.current_millis = 1600
+            cache.update()
+
+            self.assertEqual(cache.name(1, 2), None)
+            self.assertEqual(len(cache), 0)
+
+            self.mapping_name.value = "Name"
+            cache.parameter_changed(self.mapping_name)
+
+            self.current_millis = 2000
+            cache.update()
+            self.assertEqual(cache.name(1, 2), None)
+
+            self.current_millis = 2100
+            cache.update()
+
+            self.assertEqual(cache.name(1, 2), "Name")
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(listener.parameter_changed_calls, [self.mapping_name])
+
+            # Incomplete values are not stored
+            self.mapping_id.value = 8
+            self.mapping_date.value = None
+            cache.parameter_changed(self.mapping_id)
+
+            self.current_millis = 3000
+            cache.update()
+
+            self.assertEqual(cache.name(1, 3), None)
+            self.assertEqual(len(cache), 1)
+
+            # Offline
+            self.mapping_date.value = "Date 2"
+            cache.parameter_changed(self.mapping_date)
+            cache.request_terminated(self.mapping_date)
+
+            self.current_millis = 4000
+            cache.update()
+
+            self.assertEqual(cache.name(1, 3), None)
+
+
+    def test_invalidate_by_date(self):
+        with patch.dict(KemperRigNameCache.update.__globals__, { "get_current_millis": self.get_current_millis }):
+            cache = KemperRigNameCache(size = 10)
+            cache.init(MockController())
+
+            listener = MockClientRequestListener()
+            cache.add_listener(listener)
+
+            self.visit(cache, 0, "Clean", "Date 1")
+            self.visit(cache, 1, "Crunch", "Date 1")
+
+            self.assertEqual(cache.name(0, 0), "Clean")
+            self.assertEqual(cache.name(0, 1), "Crunch")
+            self.assertEqual(len(listener.parameter_changed_calls), 2)
+
+            # Unchanged: No notification
+            self.visit(cache, 0, "Clean", "Date 1")
+            self.assertEqual(len(listener.parameter_changed_calls), 2)
+
+            # Rig has been saved with a new name
+            self.visit(cache, 0, "Clean 2", "Date 2")
+
+            self.assertEqual(cache.name(0, 0), "Clean 2")
+            self.assertEqual(cache.name(0, 1), "Crunch")
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(len(listener.parameter_changed_calls), 3)
+
+
+    def test_lru(self):
+        with patch.dict(KemperRigNameCache.update.__globals__, { "get_current_millis": self.get_current_millis }):
+            cache = KemperRigNameCache(size = 5)
+            cache.init(MockController())
+
+            for i in range(5):
+                self.visit(cache, i, "Rig " + repr(i), "Date")
+
+            self.assertEqual(len(cache), 5)
+
+            # Access marks rig 0 as recently used, so rig 1 is evicted next
+            self.assertEqual(cache.name(0, 0), "Rig 0")
+
+            self.visit(cache, 5, "Rig 5", "Date")
+
+            self.assertEqual(len(cache), 5)
+            self.assertEqual(cache.name(0, 0), "Rig 0")
+            self.assertEqual(cache.name(0, 1), None)
+            self.assertEqual(cache.name(1, 0), "Rig 5")
+
+            # Visiting a cached rig also marks it as recently used
+            self.visit(cache, 2, "Rig 2", "Date")
+            self.visit(cache, 6, "Rig 6", "Date")
+
+            self.assertEqual(cache.name(0, 2), "Rig 2")
+            self.assertEqual(cache.name(0, 3), None)
+            self.assertEqual(cache.name(0, 4), "Rig 4")
+            self.assertEqual(cache.name(1, 1), "Rig 6")
@@ -26,6 +26,43 @@ with patch.dict(sys.modules, {
 
 class TestKemperRigNameCallback(unittest.TestCase):
 
+    def test_stale(self):
+        cb = KemperRigNameCallback(
+            show_rig_id = True,
+            stale_dim_factor = 0.5
+        )
+
+        label = DisplayLabel(
+            layout = {
+                "font": "foo",
+                "textColor": (200, 100, 50)
+            },
+            callback = cb
+        )
+
+        appl = MockController()
+        ui = MockUiController()
+        label.init(ui, appl)
+
+        mapping_name = KemperMappings.RIG_NAME()
+        mapping_id = KemperMappings.RIG_ID()
+
+        mapping_name.value = "foo"
+        mapping_id.value = 12
+
+        # Restored from the value cache: Text is dimmed
+        mapping_id.stale = True
+        cb.update_label(label)
+
+        self.assertEqual(label.text, "3-3 foo")
+        self.assertEqual(label.text_color, (100, 50, 25))
+
+        # Confirmed by the device
+        mapping_id.stale = False
+        cb.update_label(label)
+
+        self.assertEqual(label.text_color, (200, 100, 50))
+
     def test(self):
         self._test(False, False)
         self._test(False, True)
@@ -34,7 +34,8 @@ class MockStrobe:
                      speed = 0, 
                      color = None, 
                      max_fps = 0, 
-                     reverse = None 
+                     reverse = None,
+                     frame_rate = 0
             ):
             self.init_calls = []
 
@@ -45,6 +46,7 @@ class MockStrobe:
             self.color = color 
             self.max_fps = max_fps
             self.reverse = reverse
+            self.frame_rate = frame_rate
 
         def init(self, appl):
             self.init_calls.append(appl)
@@ -57,6 +59,7 @@ class MockController2(Updater):
         self.client = MockClient()
         self.inputs = inputs
         self.shared = {}
+        self.config = {}
       
 
 class MockFootSwitch:
@@ -213,7 +216,8 @@ class TestKemperTunerDisplayCallback(unittest.TestCase):
                 strobe_dim = 0.75,
                 strobe_speed = 1111,
                 strobe_max_fps = 121,
-                strobe_reverse = False
+                strobe_reverse = False,
+                frame_rate = 30
             )
 
         appl = MockController2()
@@ -230,5 +234,8 @@ class TestKemperTunerDisplayCallback(unittest.TestCase):
         self.assertEqual(strobe.color, (3, 4, 5))
         self.assertEqual(strobe.max_fps, 121)
         self.assertEqual(strobe.reverse, False)
+        self.assertEqual(strobe.frame_rate, 30)
+
+        self.assertEqual(cb._TunerDisplayCallback__splash_tuner.frame.update_interval_millis, 33)
 
 
@@ -16,7 +16,7 @@ with patch.dict(sys.modules, {
     "time": MockTime,
     "gc": MockGC()
 }):
-    from lib.pyswitch.controller.measure import RuntimeMeasurement
+    from lib.pyswitch.controller.measure import RuntimeMeasurement, LatencyMeasurement, TickProfiler
 
 
 class MockRuntimeMeasurementListener:
@@ -119,3 +119,212 @@ class TestMeasurementRuntime(unittest.TestCase):
 
 
 
+
+
+###############################################################################################
+
+
+class TestMeasurementLatency(unittest.TestCase):
+
+    def _create(self, **kwargs):
+        with patch.dict(sys.modules, {
+            "time": MockTime
+        }):
+            return LatencyMeasurement(**kwargs)
+
+    def test_histogram(self):
+        m = self._create(bin_width_micros = 100, num_bins = 10)
+
+        self.assertEqual(len(m.bins), 11)
+        self.assertEqual(m.percentile(50), 0)
+
+        for micros in [50, 150, 160, 250, 999, 1000, 5000]:
+            m.add(micros)
+
+        self.assertEqual(list(m.bins), [1, 2, 1, 0, 0, 0, 0, 0, 0, 1, 2])
+        self.assertEqual(m.count, 7)
+        self.assertEqual(m.min, 50)
+        self.assertEqual(m.max, 5000)
+
+        self.assertEqual(m.percentile(0), 100)
+        self.assertEqual(m.percentile(50), 300)
+        self.assertEqual(m.percentile(70), 1000)
+        self.assertEqual(m.percentile(99), 5000)
+
+        exp = m.export()
+        self.assertEqual(exp["count"], 7)
+        self.assertEqual(exp["unmatched"], 0)
+        self.assertEqual(exp["min"], 50)
+        self.assertEqual(exp["max"], 5000)
+        self.assertEqual(exp["p50"], 300)
+        self.assertEqual(exp["p95"], 5000)
+        self.assertEqual(exp["p99"], 5000)
+        self.assertEqual(exp["binWidth"], 100)
+        self.assertEqual(exp["bins"], [1, 2, 1, 0, 0, 0, 0, 0, 0, 1, 2])
+
+        m.clear()
+        self.assertEqual(m.count, 0)
+        self.assertEqual(m.max, 0)
+        self.assertEqual(list(m.bins), [0 for i in range(11)])
+
+    def test_percentile_max(self):
+        m = self._create(bin_width_micros = 100)
+
+        m.add(120)
+        m.add(130)
+
+        # Bin bound exceeds the maximum
+        self.assertEqual(m.percentile(50), 130)
+
+    def test_edges(self):
+        m = self._create(bin_width_micros = 250, timeout_millis = 100)
+
+        MockTime.mock["monotonicReturn"] = 10
+
+        # No edge yet
+        m.message_sent()
+        self.assertEqual(m.count, 0)
+
+        m.input_edge()
+
+        MockTime.mock["monotonicReturn"] = 10.0021
+        m.message_sent()
+
+        # Only the first message after an edge counts
+        MockTime.mock["monotonicReturn"] = 10.0051
+        m.message_sent()
+
+        self.assertEqual(m.count, 1)
+        self.assertEqual(m.bins[8], 1)
+
+        # Edge without MIDI output
+        m.input_edge()
+        m.input_edge()
+        self.assertEqual(m.unmatched, 1)
+
+        # Timeout exceeded
+        MockTime.mock["monotonicReturn"] = 10.2
+        m.message_sent()
+
+        self.assertEqual(m.unmatched, 2)
+        self.assertEqual(m.count, 1)
+
+    def test_report(self):
+        m = self._create(interval_millis = 500)
+
+        self.assertEqual(m.update_interval_millis, 500)
+
+        msgs = []
+        def do_print(msg):
+            msgs.append(msg)
+
+        with patch.dict(m.update.__globals__, { "do_print": do_print }):
+            m.update()
+            self.assertEqual(msgs, [])
+
+            m.add(300)
+            m.update()
+            self.assertEqual(msgs, [m.report()])
+            self.assertIn("p50 300us", msgs[0])
+            
+            # Only print when new samples came in
+            m.update()
+            self.assertEqual(len(msgs), 1)
+
+
+###############################################################################################
+
+
+class TestMeasurementProfiler(unittest.TestCase):
+
+    def _create(self, **kwargs):
+        with patch.dict(sys.modules, {
+            "time": MockTime
+        }):
+            return TickProfiler(**kwargs)
+
+    def test_slots(self):
+        p = self._create(max_slots = 3)
+
+        self.assertEqual(p.slot("foo"), 0)
+        self.assertEqual(p.slot("bar"), 1)
+        self.assertEqual(p.slot("foo"), 0)
+        self.assertEqual(p.names, ["foo", "bar"])
+
+        p.add(1, 5000)
+
+        # Full: Remaining ones share the last slot, which is reserved for them
+        self.assertEqual(p.slot("baz"), 2)
+        self.assertEqual(p.slot("other"), 2)
+        self.assertEqual(p.slot("bar"), 1)
+        self.assertEqual(p.names, ["foo", "bar", "(Other)"])
+
+        # Samples of the named components are kept separately
+        self.assertEqual(p.calls[1], 1)
+        self.assertEqual(p.sums[1], 5)
+        self.assertEqual(p.calls[2], 0)
+
+    def test_wrap(self):
+        p = self._create()
+
+        MockTime.mock["monotonicReturn"] = 10
+
+        def func_0():
+            MockTime.mock["monotonicReturn"] += 0.002
+            return 5
+
+        def func_1(arg):
+            MockTime.mock["monotonicReturn"] += 0.0005
+            return arg * 2
+
+        w0 = p.wrap(func_0, "func0")
+        w1 = p.wrap(func_1, "func1", num_args = 1)
+        
+        with self.assertRaises(Exception):
+            p.wrap(func_1, "func2", num_args = 2)
+
+        self.assertEqual(w0(), 5)
+        self.assertEqual(w0(), 5)
+        self.assertEqual(w1(3), 6)
+
+        self.assertEqual(p.calls[0], 2)
+        self.assertEqual(p.calls[1], 1)
+        self.assertAlmostEqual(p.sums[0], 4000, delta = 2)
+        self.assertAlmostEqual(p.maxs[0], 2000, delta = 1)
+        self.assertAlmostEqual(p.sums[1], 500, delta = 1)
+
+    def test_report(self):
+        p = self._create(top = 2)
+
+        MockTime.mock["monotonicReturn"] = 10
+        p.clear()
+
+        p.add(p.slot("small"), 1000000)
+        p.add(p.slot("large"), 5000000)
+        p.add(p.slot("large"), 3000000)
+        p.add(p.slot("medium"), 2000000)
+        p.slot("unused")
+
+        MockTime.mock["monotonicReturn"] = 10.1
+
+        report = p.report()
+        self.assertEqual(len(report), 3)
+        self.assertIn("Top 2 of 4 in 100ms", report[0])
+        self.assertIn("large", report[1])
+        self.assertIn("Sum 8ms (8%), Max 5000us, Avg 4000us, Calls: 2", report[1])
+        self.assertIn("medium", report[2])
+
+        msgs = []
+        def do_print(msg):
+            msgs.append(msg)
+
+        with patch.dict(p.update.__globals__, { "do_print": do_print }):
+            p.update()
+
+        self.assertEqual(msgs, report)
+        
+        # Cleared after output
+        self.assertEqual(p.calls[1], 0)
+        self.assertEqual(p.sums[1], 0)
+        self.assertEqual(p.maxs[1], 0)
+        self.assertEqual(len(p.report()), 1)
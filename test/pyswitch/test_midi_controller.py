@@ -16,13 +16,58 @@ with patch.dict(sys.modules, {
     "gc": MockGC()
 }):
     from adafruit_midi.system_exclusive import SystemExclusive
+    from adafruit_midi.control_change import ControlChange
     from adafruit_midi.midi_message import MIDIUnknownEvent
-    from lib.pyswitch.controller.midi import MidiController, MidiRouting
+    from lib.pyswitch.controller.midi import MidiController, MidiRouting, RawMidiForwarder
 
     from.mocks_appl import *
 
 
 
+class MockRawMidiDevice(MockMidiController):
+    def __init__(self):
+        super().__init__()
+
+        self.next_receive_chunks = []
+        self.data_sent = []
+        self.num_receive_calls = 0
+        self.backlog = False
+
+    def receive(self):
+        self.num_receive_calls += 1
+        return super().receive()
+
+    def read_raw(self, buffer):
+        if not self.next_receive_chunks:
+            return 0
+        
+        chunk = self.next_receive_chunks.pop(0)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+    
+    def write_raw(self, buffer, num):
+        self.data_sent += list(buffer[:num])
+
+
+# Raw device which can pass the data read for the application to raw routings
+class MockTeeMidiDevice(MockRawMidiDevice):
+    def __init__(self):
+        super().__init__()
+
+        self.tee = None
+
+    def tee_raw(self, callback):
+        self.tee = callback
+        return True
+
+    def receive(self):
+        if self.tee and self.next_receive_chunks:
+            chunk = self.next_receive_chunks.pop(0)
+            self.tee(bytearray(chunk), len(chunk))
+
+        return super().receive()
+
+
 class TestMidiController(unittest.TestCase):
 
     def test_appl_routing(self):
@@ -289,6 +334,347 @@ class TestMidiController(unittest.TestCase):
         self.assertEqual(sub_midi_2.messages_sent, [])
         
         
+    def test_external_routings_filter(self):
+        sub_midi_1 = MockMidiController()
+        sub_midi_2 = MockMidiController()
+        sub_midi_3 = MockMidiController()
+
+        midi = MidiController(
+            routings = [
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_2,
+                    exclude_status = [0xb0]
+                ),
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_3
+                )
+            ]
+        )
+
+        midi_message_1 = ControlChange(1, 2)
+        midi_message_2 = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x07, 0x45]
+        )
+
+        sub_midi_1.next_receive_messages = [
+            midi_message_1,
+            midi_message_2
+        ]
+
+        midi.receive()
+        midi.receive()
+
+        self.assertEqual(sub_midi_2.messages_sent, [midi_message_2])
+        self.assertEqual(sub_midi_3.messages_sent, [midi_message_1, midi_message_2])
+
+
+    def test_external_routings_raw(self):
+        sub_midi_1 = MockRawMidiDevice()
+        sub_midi_2 = MockRawMidiDevice()
+        sub_midi_3 = MockRawMidiDevice()
+
+        midi = MidiController(
+            routings = [
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_2,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_3,
+                    raw = True,
+                    exclude_status = [0xf8, 0xb0, 0xf0]
+                ),
+                MidiRouting(
+                    source = sub_midi_2,
+                    target = sub_midi_1,
+                    raw = True
+                )
+            ]
+        )
+
+        data_1 = [0xb0, 0x01, 0xf8, 0x02, 0xc0]
+        data_2 = [0x05, 0xf0, 0x01, 0x02, 0xf7, 0x90, 0x40, 0x7f]
+        data_3 = [0xc1, 0x01]
+
+        sub_midi_1.next_receive_chunks = [bytes(data_1), bytes(data_2)]
+        sub_midi_2.next_receive_chunks = [bytes(data_3)]
+
+        midi.receive()
+
+        # The incomplete program change at the end is held back until the next chunk
+        self.assertEqual(sub_midi_2.data_sent, data_1[:4])
+        self.assertEqual(sub_midi_3.data_sent, [])
+        self.assertEqual(sub_midi_1.data_sent, data_3)
+
+        midi.receive()
+        midi.receive()
+
+        self.assertEqual(sub_midi_2.data_sent, data_1 + data_2)
+        self.assertEqual(sub_midi_3.data_sent, [0xc0, 0x05, 0x90, 0x40, 0x7f])
+        self.assertEqual(sub_midi_1.data_sent, data_3)
+
+        # No messages have been decoded
+        self.assertEqual(sub_midi_1.num_receive_calls, 0)
+        self.assertEqual(sub_midi_2.num_receive_calls, 0)
+
+
+    def test_external_routings_raw_fallback(self):
+        sub_midi_1 = MockRawMidiDevice()
+        sub_midi_2 = MockRawMidiDevice()
+        sub_midi_3 = MockMidiController()
+
+        midi = MidiController(
+            routings = [
+                # Source is also routed to the application, but can not pass its data to raw routings
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_2,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = MidiRouting.APPLICATION
+                ),
+
+                # Target does not support raw data
+                MidiRouting(
+                    source = sub_midi_2,
+                    target = sub_midi_3,
+                    raw = True
+                )
+            ]
+        )
+
+        midi_message_1 = ControlChange(1, 2)
+        midi_message_2 = ControlChange(3, 4)
+
+        sub_midi_1.next_receive_messages = [midi_message_1]
+        sub_midi_2.next_receive_messages = [midi_message_2]
+
+        sub_midi_1.next_receive_chunks = [bytes([0xc0, 0x01])]
+        sub_midi_2.next_receive_chunks = [bytes([0xc0, 0x02])]
+
+        self.assertEqual(midi.receive(), None)   # The application message has been consumed by the external routing
+
+        self.assertEqual(sub_midi_2.messages_sent, [midi_message_1])
+        self.assertEqual(sub_midi_3.messages_sent, [midi_message_2])
+        
+        self.assertEqual(sub_midi_2.data_sent, [])
+
+
+    def test_external_routings_raw_shared_target(self):
+        sub_midi_1 = MockRawMidiDevice()
+        sub_midi_2 = MockRawMidiDevice()
+        sub_midi_3 = MockRawMidiDevice()
+        sub_midi_4 = MockRawMidiDevice()
+        sub_midi_5 = MockRawMidiDevice()
+
+        midi = MidiController(
+            routings = [
+                # Target also receives from the application
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = sub_midi_2,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = MidiRouting.APPLICATION,
+                    target = sub_midi_2
+                ),
+
+                # Target also receives from another source
+                MidiRouting(
+                    source = sub_midi_3,
+                    target = sub_midi_5,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = sub_midi_4,
+                    target = sub_midi_5,
+                    raw = True
+                )
+            ]
+        )
+
+        midi_message_1 = ControlChange(1, 2)
+
+        sub_midi_1.next_receive_chunks = [bytes([0xb0, 0x01]), bytes([0x02])]
+        sub_midi_3.next_receive_chunks = [bytes([0xb0, 0x03, 0x04, 0xc0]), bytes([0x05])]
+        sub_midi_4.next_receive_chunks = [bytes([0xb1, 0x06]), bytes([0x07])]
+
+        midi.receive()
+
+        # Only complete messages are written, so the messages from the other sources do not get in between
+        self.assertEqual(sub_midi_2.data_sent, [])
+        self.assertEqual(sub_midi_5.data_sent, [0xb0, 0x03, 0x04])
+
+        midi.send(midi_message_1)
+        midi.receive()
+
+        self.assertEqual(sub_midi_2.messages_sent, [midi_message_1])
+        self.assertEqual(sub_midi_2.data_sent, [0xb0, 0x01, 0x02])
+        self.assertEqual(sub_midi_5.data_sent, [0xb0, 0x03, 0x04, 0xc0, 0x05, 0xb1, 0x06, 0x07])
+        
+        # No messages have been decoded
+        self.assertEqual(sub_midi_1.num_receive_calls, 0)
+        self.assertEqual(sub_midi_3.num_receive_calls, 0)
+        self.assertEqual(sub_midi_4.num_receive_calls, 0)
+
+    # Through USB DIN bidirectional: Both devices are routed raw to each other, the DIN device also to and from the application
+    def test_external_routings_raw_appl(self):
+        usb = MockTeeMidiDevice()
+        din = MockTeeMidiDevice()
+
+        midi = MidiController(
+            routings = [
+                MidiRouting(
+                    source = usb,
+                    target = din,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = din,
+                    target = usb,
+                    raw = True
+                ),
+                MidiRouting(
+                    source = din,
+                    target = MidiRouting.APPLICATION
+                ),
+                MidiRouting(
+                    source = MidiRouting.APPLICATION,
+                    target = din
+                )
+            ]
+        )
+
+        self.assertEqual(din.tee != None, True)
+        self.assertEqual(usb.tee, None)
+
+        midi_message_1 = ControlChange(1, 2)
+        midi_message_2 = ControlChange(3, 4)
+
+        # The application gets the messages parsed from the same data which is forwarded
+        din.next_receive_messages = [midi_message_1]
+        din.next_receive_chunks = [bytes([0xb0, 0x01, 0x02, 0xf0, 0x00])]
+        usb.next_receive_chunks = [bytes([0x90, 0x40])]
+
+        self.assertEqual(midi.receive(), midi_message_1)
+
+        self.assertEqual(usb.data_sent, [0xb0, 0x01, 0x02])
+        self.assertEqual(din.data_sent, [])
+
+        # Application sends to the DIN device while the note is incomplete
+        midi.send(midi_message_2)
+
+        din.next_receive_chunks = [bytes([0x01, 0xf7])]
+        usb.next_receive_chunks = [bytes([0x7f])]
+
+        self.assertEqual(midi.receive(), None)
+
+        self.assertEqual(usb.data_sent, [0xb0, 0x01, 0x02, 0xf0, 0x00, 0x01, 0xf7])
+        self.assertEqual(din.data_sent, [0x90, 0x40, 0x7f])
+        self.assertEqual(din.messages_sent, [midi_message_2])
+
+        # The USB device is read raw, the DIN device only by the application
+        self.assertEqual(usb.num_receive_calls, 0)
+        self.assertEqual(din.num_receive_calls, 2)
+
+
+    def test_raw_forwarder(self):
+        target = MockRawMidiDevice()
+
+        forwarder = RawMidiForwarder(
+            [
+                MidiRouting(
+                    source = None,
+                    target = target,
+                    raw = True
+                )
+            ],
+            carry_size = 8
+        )
+
+        def forward(data):
+            forwarder.forward(bytearray(data), len(data))
+
+        # Running status
+        forward([0x90, 0x40, 0x7f, 0x41])
+        self.assertEqual(target.data_sent, [0x90, 0x40, 0x7f])
+
+        forward([0x7f, 0x42])
+        self.assertEqual(target.data_sent, [0x90, 0x40, 0x7f, 0x41, 0x7f])
+
+        # Realtime messages inside of other messages stay in place
+        target.data_sent = []
+        forward([0x00, 0xf8, 0xc0])
+        self.assertEqual(target.data_sent, [0x42, 0x00, 0xf8])
+
+        forward([0xf8, 0x01, 0xf8])
+        self.assertEqual(target.data_sent, [0x42, 0x00, 0xf8, 0xc0, 0xf8, 0x01, 0xf8])
+
+        # Single byte messages
+        target.data_sent = []
+        forward([0xf6, 0xfa])
+        self.assertEqual(target.data_sent, [0xf6, 0xfa])
+
+        # Incomplete message interrupted by another status
+        target.data_sent = []
+        forward([0xb0, 0x01, 0xc0])
+        self.assertEqual(target.data_sent, [0xb0, 0x01])
+
+        forward([0x02])
+        self.assertEqual(target.data_sent, [0xb0, 0x01, 0xc0, 0x02])
+
+        # SysEx longer than the carry buffer is written in parts
+        target.data_sent = []
+        forward([0xf0, 0x01, 0x02, 0x03])
+        forward([0x04, 0x05, 0x06, 0x07])
+        self.assertEqual(target.data_sent, [])
+
+        forward([0x08, 0x09])
+        self.assertEqual(target.data_sent, [0xf0, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07])
+
+        forward([0xf7, 0xb0])
+        self.assertEqual(target.data_sent, [0xf0, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0xf7])
+        
+
+    def test_backlog(self):
+        sub_midi_1 = MockMidiController()
+        sub_midi_2 = MockRawMidiDevice()
+        sub_midi_3 = MockRawMidiDevice()
+
+        midi = MidiController(
+            routings = [
+                MidiRouting(
+                    source = sub_midi_1,
+                    target = MidiRouting.APPLICATION
+                ),
+                MidiRouting(
+                    source = sub_midi_2,
+                    target = MidiRouting.APPLICATION
+                ),
+                MidiRouting(
+                    source = sub_midi_3,
+                    target = sub_midi_2
+                )
+            ]
+        )
+
+        self.assertEqual(midi.backlog, False)
+
+        sub_midi_3.backlog = True
+        self.assertEqual(midi.backlog, False)
+
+        sub_midi_2.backlog = True
+        self.assertEqual(midi.backlog, True)
+
+
     def test_no_args(self):
         # Must not throw
         MidiController([])
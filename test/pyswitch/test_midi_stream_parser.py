@@ -0,0 +1,326 @@
+import sys
+import unittest
+from unittest.mock import patch   # Necessary workaround! Needs to be separated.
+
+from .mocks_lib import *
+
+# Import subject under test
+with patch.dict(sys.modules, {
+    "micropython": MockMicropython,
+    "adafruit_midi": MockAdafruitMIDI(),
+    "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+    "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+    "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+    "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+    "gc": MockGC()
+}):
+    from adafruit_midi.midi_message import MIDIMessage, MIDIUnknownEvent
+    from lib.pyswitch.controller import midi as midi_module
+    from lib.pyswitch.controller.midi import MidiStreamParser
+
+
+class MockMessage:
+    CHANNELMASK = 0x0F
+    ENDSTATUS = None
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_bytes(cls, msg_bytes):
+        return cls(bytes(msg_bytes))
+
+class MockNoteOn(MockMessage):
+    _STATUS = 0x90
+    _STATUSMASK = 0xF0
+    LENGTH = 3
+
+class MockControlChange(MockMessage):
+    _STATUS = 0xB0
+    _STATUSMASK = 0xF0
+    LENGTH = 3
+
+class MockProgramChange(MockMessage):
+    _STATUS = 0xC0
+    _STATUSMASK = 0xF0
+    LENGTH = 2
+
+class MockTimingClock(MockMessage):
+    _STATUS = 0xF8
+    _STATUSMASK = 0xFF
+    LENGTH = 1
+
+class MockSystemExclusive(MockMessage):
+    _STATUS = 0xF0
+    _STATUSMASK = 0xFF
+    LENGTH = -1
+    ENDSTATUS = 0xF7
+
+
+class MockPortIn:
+    def __init__(self):
+        self.chunks = []
+        self.num_reads = 0
+
+    def readinto(self, buf):
+        self.num_reads += 1
+
+        if not self.chunks:
+            return None
+        
+        chunk = self.chunks[0]
+        num = len(buf) if len(buf) < len(chunk) else len(chunk)
+
+        buf[:num] = chunk[:num]
+        
+        if num < len(chunk):
+            self.chunks[0] = chunk[num:]
+        else:
+            self.chunks.pop(0)
+
+        return num
+
+
+class TestMidiStreamParser(unittest.TestCase):
+
+    def setUp(self):
+        MIDIMessage._statusandmask_to_class.clear()
+
+        for message_class in [MockTimingClock, MockSystemExclusive, MockNoteOn, MockControlChange, MockProgramChange]:
+            MIDIMessage._statusandmask_to_class.append(((message_class._STATUS, message_class._STATUSMASK), message_class))
+
+        # Force rebuilding the status table
+        midi_module._num_registered_types = -1
+
+    def tearDown(self):
+        MIDIMessage._statusandmask_to_class.clear()
+        midi_module._num_registered_types = -1
+
+    def _receive_all(self, parser, max_calls = 100):
+        ret = []
+        for i in range(max_calls):
+            msg = parser.receive()
+            if msg:
+                ret.append(msg)
+
+        return ret
+    
+    def _assert_messages(self, messages, expected):
+        self.assertEqual(
+            [(type(m), m.data) for m in messages], 
+            [(e[0], bytes(e[1])) for e in expected]
+        )
+
+    def test_channel_messages(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, in_buf_size = 4)
+
+        self.assertEqual(parser.receive(), None)
+
+        # Messages split over several reads
+        port.chunks = [
+            bytes([0xb0, 0x01]), 
+            bytes([0x02, 0xc0, 0x05, 0x93, 0x40, 0x7f])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockControlChange, [0xb0, 0x01, 0x02]),
+            (MockProgramChange, [0xc0, 0x05]),
+            (MockNoteOn, [0x93, 0x40, 0x7f])
+        ])
+
+        self.assertEqual(parser.skipped_bytes, 0)
+
+    def test_tee(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, in_buf_size = 4)
+
+        teed = []
+        def tee(buffer, num):
+            teed.append(list(buffer[:num]))
+
+        parser.tee = tee
+
+        port.chunks = [
+            bytes([0xb0, 0x01]), 
+            bytes([0x02, 0xc0, 0x05])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockControlChange, [0xb0, 0x01, 0x02]),
+            (MockProgramChange, [0xc0, 0x05])
+        ])
+
+        # All read bytes are passed on, in read order
+        self.assertEqual(teed, [[0xb0, 0x01], [0x02, 0xc0, 0x05]])
+
+    def test_reads_once_per_call(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, in_buf_size = 10)
+
+        port.chunks = [
+            bytes([0xb0, 0x01]), 
+            bytes([0x02])
+        ]
+
+        self.assertEqual(parser.receive(), None)
+        self.assertEqual(port.num_reads, 1)
+
+        self._assert_messages([parser.receive()], [
+            (MockControlChange, [0xb0, 0x01, 0x02])
+        ])
+        self.assertEqual(port.num_reads, 2)
+
+    def test_running_status(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port)
+
+        port.chunks = [
+            bytes([0xb0, 0x01, 0x02, 0x03, 0x04, 0xc1, 0x05, 0x06])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockControlChange, [0xb0, 0x01, 0x02]),
+            (MockControlChange, [0xb0, 0x03, 0x04]),
+            (MockProgramChange, [0xc1, 0x05]),
+            (MockProgramChange, [0xc1, 0x06])
+        ])
+
+    def test_realtime_inside_messages(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port)
+
+        port.chunks = [
+            bytes([0xb0, 0x01, 0xf8, 0x02, 0xf0, 0x10, 0xf8, 0x11, 0xf7])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockTimingClock, [0xf8]),
+            (MockControlChange, [0xb0, 0x01, 0x02]),
+            (MockTimingClock, [0xf8]),
+            (MockSystemExclusive, [0xf0, 0x10, 0x11, 0xf7])
+        ])
+
+    def test_sysex_larger_than_buffer(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, in_buf_size = 4)
+
+        sysex = [0xf0] + [i for i in range(30)] + [0xf7]
+
+        port.chunks = [
+            bytes(sysex[:10]),
+            bytes(sysex[10:] + [0xc0, 0x01])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockSystemExclusive, sysex),
+            (MockProgramChange, [0xc0, 0x01])
+        ])
+
+        self.assertEqual(parser.dropped_sysex, 0)
+
+    def test_sysex_too_long(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, max_sysex_size = 10)
+
+        port.chunks = [
+            bytes([0xf0] + [i for i in range(9)] + [0xf7]),
+            bytes([0xf0] + [i for i in range(8)] + [0xf7]),
+            bytes([0xc0, 0x01])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockSystemExclusive, [0xf0] + [i for i in range(8)] + [0xf7]),
+            (MockProgramChange, [0xc0, 0x01])
+        ])
+
+        self.assertEqual(parser.dropped_sysex, 1)
+
+    def test_sysex_interrupted(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port)
+
+        port.chunks = [
+            bytes([0xf0, 0x01, 0x02, 0xc0, 0x01])
+        ]
+
+        self._assert_messages(self._receive_all(parser), [
+            (MockProgramChange, [0xc0, 0x01])
+        ])
+
+        self.assertEqual(parser.dropped_sysex, 1)
+
+    def test_unknown_status(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port)
+
+        port.chunks = [
+            bytes([0x01, 0xa0, 0x01, 0x02, 0xc0, 0x01])
+        ]
+
+        messages = self._receive_all(parser)
+
+        self.assertEqual(len(messages), 2)
+        self.assertIsInstance(messages[0], MIDIUnknownEvent)
+        self.assertEqual(messages[0].status, 0xa0)
+        self.assertEqual(messages[1].data, bytes([0xc0, 0x01]))
+
+        self.assertEqual(parser.skipped_bytes, 3)
+
+    def test_channel_filter(self):
+        def test(in_channel, expected_channels):
+            port = MockPortIn()
+            parser = MidiStreamParser(port = port, in_channel = in_channel)
+
+            port.chunks = [
+                bytes([0xc0, 0x01, 0xc1, 0x02, 0xc2, 0x03, 0xf8])
+            ]
+
+            messages = self._receive_all(parser)
+            
+            self.assertEqual(
+                [m.data[0] for m in messages], 
+                [0xc0 + c for c in expected_channels] + [0xf8]
+            )
+
+        test(None, [0, 1, 2])
+        test(1, [1])
+        test((0, 2), [0, 2])
+
+    def test_status_table_update(self):
+        port = MockPortIn()
+        MidiStreamParser(port = port)
+
+        MIDIMessage._statusandmask_to_class.pop()   # Program change
+
+        port.chunks = [
+            bytes([0xc0, 0x01])
+        ]
+
+        # New parsers use the updated table
+        parser = MidiStreamParser(port = port)
+        
+        msg = parser.receive()
+        self.assertIsInstance(msg, MIDIUnknownEvent)
+        self.assertEqual(msg.status, 0xc0)
+
+
+    def test_backlog(self):
+        port = MockPortIn()
+        parser = MidiStreamParser(port = port, in_buf_size = 4)
+
+        self.assertEqual(parser.backlog, False)
+
+        port.chunks = [
+            bytes([0xc0, 0x01, 0xc0, 0x02, 0xc0, 0x03])
+        ]
+
+        parser.receive()
+        self.assertEqual(parser.backlog, True)     # Buffer has been filled completely
+
+        parser.receive()
+        parser.receive()
+        self.assertEqual(parser.backlog, False)
+
+        parser.receive()
+        self.assertEqual(parser.backlog, False)
@@ -214,6 +214,89 @@ class TestMiscUpdater(unittest.TestCase):
 ##############################################################################
 
 
+class TestMiscUpdateScheduler(unittest.TestCase):
+
+    def test_schedule(self):
+        u1 = MockUpdateable()
+        u2 = MockUpdateable()
+        u3 = MockUpdateable()
+
+        scheduler = UpdateScheduler()
+        self.assertEqual(len(scheduler), 0)
+        self.assertEqual(scheduler.next_due, None)
+        self.assertEqual(scheduler.pop_due(1000), None)
+
+        scheduler.add(u1, 100, 0)
+        scheduler.add(u2, 30, 0)
+        scheduler.add(u3, 30, 0)
+
+        # Adding again has no effect
+        scheduler.add(u1, 50, 0)
+
+        self.assertEqual(len(scheduler), 3)
+        self.assertEqual(scheduler.next_due, 30)
+
+        self.assertEqual(scheduler.pop_due(29), None)
+
+        # Same due time: FIFO
+        self.assertEqual(scheduler.pop_due(30), u2)
+        self.assertEqual(scheduler.pop_due(30), u3)
+        self.assertEqual(scheduler.pop_due(30), None)
+        self.assertEqual(scheduler.next_due, 60)
+
+        self.assertEqual(scheduler.pop_due(60), u2)
+        self.assertEqual(scheduler.pop_due(60), u3)
+        self.assertEqual(scheduler.pop_due(89), None)
+
+        self.assertEqual(scheduler.pop_due(100), u2)
+        self.assertEqual(scheduler.pop_due(100), u3)
+        self.assertEqual(scheduler.next_due, 100)
+        self.assertEqual(scheduler.pop_due(100), u1)
+        self.assertEqual(scheduler.pop_due(100), None)
+        self.assertEqual(scheduler.next_due, 120)
+
+    def test_schedule_late(self):
+        u1 = MockUpdateable()
+        u2 = MockUpdateable()
+
+        scheduler = UpdateScheduler()
+        
+        scheduler.add(u1, 10, 0)
+        scheduler.add(u2, 100, 0)
+
+        # Late by more than one interval: No catching up
+        self.assertEqual(scheduler.pop_due(55), u1)
+        self.assertEqual(scheduler.pop_due(55), None)
+        self.assertEqual(scheduler.next_due, 65)
+
+        # Late by less than one interval: Stay in the grid
+        self.assertEqual(scheduler.pop_due(70), u1)
+        self.assertEqual(scheduler.next_due, 75)
+
+    def test_order(self):
+        scheduler = UpdateScheduler()
+
+        intervals = [70, 20, 50, 10, 90, 30, 60, 80, 40]
+        for i in intervals:
+            u = MockUpdateable()
+            u.interval = i
+            scheduler.add(u, i, 0)
+
+        # Updateables must come in order of due times, each one exactly at multiples of its interval
+        last = 0
+        for i in range(100):
+            now = scheduler.next_due
+            self.assertGreaterEqual(now, last)
+
+            u = scheduler.pop_due(now)
+            self.assertEqual(now % u.interval, 0)
+
+            last = now
+
+
+##############################################################################
+
+
 class TestMiscEventEmitter(unittest.TestCase):
 
     def test_add_listener(self):
@@ -242,6 +325,57 @@ class TestMiscEventEmitter(unittest.TestCase):
 ##############################################################################
 
 
+class TestMiscFifo(unittest.TestCase):
+
+    def test_fifo(self):
+        q = Fifo()
+        self.assertEqual(len(q), 0)
+
+        q.append(1)
+        q.append(2)
+        q.append(3)
+
+        self.assertEqual(len(q), 3)
+        self.assertEqual(q.pop(), 1)
+        self.assertEqual(len(q), 2)
+
+        q.append(4)
+
+        self.assertEqual(q.pop(), 2)
+        self.assertEqual(q.pop(), 3)
+        self.assertEqual(q.pop(), 4)
+        self.assertEqual(len(q), 0)
+
+        with self.assertRaises(IndexError):
+            q.pop()
+
+        q.append(5)
+        q.clear()
+        self.assertEqual(len(q), 0)
+
+    def test_fifo_many(self):
+        q = Fifo()
+
+        for i in range(100):
+            q.append(i)
+
+        # Consumed items are dropped while the queue is still filled
+        for i in range(150):
+            self.assertEqual(q.pop(), i)
+            q.append(100 + i)
+
+        self.assertEqual(len(q), 100)
+        self.assertLess(len(q._Fifo__items), 250)
+
+        for i in range(150, 250):
+            self.assertEqual(q.pop(), i)
+
+        self.assertEqual(len(q), 0)
+
+
+##############################################################################
+
+
 class TestMiscPeriodCounter(unittest.TestCase):
 
     def test_counter(self):
@@ -306,3 +440,60 @@ class TestMiscPeriodCounter(unittest.TestCase):
         MockTime.mock["monotonicReturn"] = 2.702
         self.assertEqual(p.exceeded, False)
         self.assertEqual(p.passed, 1)
+
+
+    def test_led_frame(self):
+        frame = LedFrame(3)
+
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame[1], (0, 0, 0))
+        self.assertEqual(frame.changed, False)
+
+        written = []
+        def write(index, color):
+            written.append((index, color))
+
+        # Nothing changed yet
+        self.assertEqual(frame.flush(write), False)
+        self.assertEqual(written, [])
+
+        # Setting the same color does not mark the pixel
+        frame[0] = (0, 0, 0)
+        self.assertEqual(frame.changed, False)
+
+        frame[0] = (10, 20, 30)
+        frame[2] = (1, 2, 3)
+        frame[2] = (4, 5, 6)
+
+        self.assertEqual(frame.changed, True)
+        self.assertEqual(frame[0], (10, 20, 30))
+        self.assertEqual(frame[2], (4, 5, 6))
+
+        self.assertEqual(frame.flush(write), True)
+        self.assertEqual(written, [(0, (10, 20, 30)), (2, (4, 5, 6))])
+        self.assertEqual(frame.changed, False)
+
+        # Flushed pixels are clean again
+        written.clear()
+        self.assertEqual(frame.flush(write), False)
+        self.assertEqual(written, [])
+
+        frame.fill((10, 20, 30))
+        self.assertEqual(frame.flush(write), True)
+        self.assertEqual(written, [(1, (10, 20, 30)), (2, (10, 20, 30))])
+
+        # Components are clamped
+        frame[1] = (300, -5, 12.7)
+        self.assertEqual(frame[1], (255, 0, 12))
+
+        frame[1] = (255, 0, 12)
+        written.clear()
+        frame.flush(write)
+        self.assertEqual(written, [(1, (255, 0, 12))])
+
+        # Invalidated frames are written completely
+        written.clear()
+        frame.invalidate()
+        self.assertEqual(frame.changed, True)
+        self.assertEqual(frame.flush(write), True)
+        self.assertEqual(written, [(0, (10, 20, 30)), (1, (255, 0, 12)), (2, (10, 20, 30))])
@@ -34,7 +34,8 @@ class MockImports:
                 MockImports.MockHardwareAdafruit.AdafruitST7789DisplayDriver.init_calls += 1
 
         class AdafruitNeoPixelDriver:
-            pass
+            def __init__(self, buffered = False):
+                self.buffered = buffered
 
         class AdafruitFontLoader:
             pass
@@ -226,6 +227,7 @@ class TestProcessScript(unittest.TestCase):
             self.assertEqual(controller.tick_calls, 5)
 
             self.assertIsInstance(controller.led_driver, MockImports.MockHardwareAdafruit.AdafruitNeoPixelDriver)
+            self.assertEqual(controller.led_driver.buffered, False)
             self.assertIsInstance(controller.protocol, MockProtocol)
             
             self.assertIsInstance(controller.midi, MockImports.MockMidiController.MidiController)
@@ -398,4 +398,177 @@ class TestStrobeController(unittest.TestCase):
             reverse.add(maximum)
             index -= 1
 
-        return sorted(forward & reverse)
\ No newline at end of file
+        return sorted(forward & reverse)
+
+
+    ########################################################################################
+
+
+    def test_frame_rate(self):
+        mapping_1 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        mapping_2 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x10]
+            )
+        )
+
+        strobe = StrobeController(
+            mapping_state = mapping_1,
+            mapping_deviance = mapping_2,
+            color = (100, 0, 0),
+            frame_rate = 25
+        )
+
+        self.assertEqual(strobe.update_interval_millis, 40)
+
+        switches = [
+            MockFootswitch(id = 1, order = 0),
+            MockFootswitch(id = 2, order = 1),
+            MockFootswitch(id = 3, order = 2)
+        ]
+
+        appl = MockController(
+            inputs = switches + [MockInputControllerDefinition()]
+        )
+        strobe.init(appl)
+
+        # Updated with the frame rate by the controller
+        self.assertIn(strobe, appl.updateables)
+
+        period = MockPeriodCounter()
+        strobe._StrobeController__period = period
+
+        mapping_1.value = 1
+        strobe.parameter_changed(mapping_1)
+
+        # Incoming values are only stored
+        mapping_2.value = 8191 - 500
+        period.passed = 20
+        period.exceed_next_time = True
+
+        strobe.parameter_changed(mapping_2)
+
+        mapping_2.value = 8191
+        strobe.parameter_changed(mapping_2)
+
+        for switch in switches:
+            self.assertEqual(switch.color, (0, 0, 0))
+
+        # Next frame: Latest value is shown
+        strobe.update()
+
+        for switch in switches:
+            self.assertEqual(switch.color, (100, 0, 0))
+
+        self.assertEqual(strobe._StrobeController__last_deviance, 8191)
+        self.assertEqual(switches[0].brightness, 0.1)
+
+
+    def test_update_between_deviances(self):
+        mapping_1 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        mapping_2 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x10]
+            )
+        )
+
+        strobe = StrobeController(
+            mapping_state = mapping_1,
+            mapping_deviance = mapping_2,
+            color = (100, 0, 0),
+            max_fps = 100
+        )
+
+        switches = [
+            MockFootswitch(id = 1, order = 0),
+            MockFootswitch(id = 2, order = 1),
+            MockFootswitch(id = 3, order = 2),
+            MockFootswitch(id = 4, order = 3)
+        ]
+
+        appl = MockController(
+            inputs = switches + [MockInputControllerDefinition()]
+        )
+        strobe.init(appl)
+
+        # Updated with the max. frame rate by the controller
+        self.assertIn(strobe, appl.updateables)
+        self.assertEqual(strobe.update_interval_millis, 40)
+
+        period = MockPeriodCounter()
+        period.interval = 40
+        strobe._StrobeController__period = period
+
+        mapping_1.value = 1
+        strobe.parameter_changed(mapping_1)
+
+        mapping_2.value = 8191 + 2000
+        period.passed = 40
+        period.exceed_next_time = True
+        strobe.parameter_changed(mapping_2)
+
+        brightnesses = [s.brightness for s in switches]
+        self.assertEqual([s.color for s in switches], [(100, 0, 0) for s in switches])
+
+        # No new deviance received: The strobe keeps moving
+        positions = []
+        for i in range(5):
+            period.passed = 40
+            period.exceed_next_time = True
+            strobe.update()
+
+            positions.append(strobe._StrobeController__strobe_pos)
+
+        self.assertEqual(len(set(positions)), 5)
+        self.assertNotEqual([s.brightness for s in switches], brightnesses)
+
+        # Period not exceeded: No change
+        brightnesses = [s.brightness for s in switches]
+        strobe.update()
+
+        self.assertEqual([s.brightness for s in switches], brightnesses)
+        self.assertEqual(strobe._StrobeController__strobe_pos, positions[-1])
+
+        # The color is only set on the first frame after activation
+        for s in switches:
+            s.color = (1, 2, 3)
+
+        period.exceed_next_time = True
+        strobe.update()
+
+        self.assertEqual([s.color for s in switches], [(1, 2, 3) for s in switches])
+
+        mapping_1.value = 0
+        strobe.parameter_changed(mapping_1)
+        mapping_1.value = 1
+        strobe.parameter_changed(mapping_1)
+
+        period.exceed_next_time = True
+        strobe.update()
+
+        self.assertEqual([s.color for s in switches], [(100, 0, 0) for s in switches])
+
+        # Disabled: No updates
+        mapping_1.value = 0
+        strobe.parameter_changed(mapping_1)
+
+        pos = strobe._StrobeController__strobe_pos
+
+        period.exceed_next_time = True
+        strobe.update()
+
+        self.assertEqual(strobe._StrobeController__strobe_pos, pos)
@@ -174,6 +174,7 @@ class TestDisplayLabel(unittest.TestCase):
         u = Updater()
         u.client = MockClient()
         u.low_memory_warning = False
+        u.config = {}
 
         label.init(ui, u)
 
@@ -49,6 +49,159 @@ class TestTunerDisplay(unittest.TestCase):
         self._do_test(16383, 1, Colors.ORANGE)
 
 
+    def test_frame_rate(self):
+        mapping_1 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        mapping_2 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x10]
+            )
+        )
+
+        display = TunerDisplay(
+            mapping_note = mapping_1,
+            mapping_deviance = mapping_2,
+            bounds = DisplayBounds(0, 0, 404, 200),
+            layout = {
+                "font": "foo"
+            },
+            deviance_width = 4,
+            deviance_zoom = 1,
+            frame_rate = 20
+        )
+
+        self.assertEqual(display.frame.update_interval_millis, 50)
+
+        ui = UiController(
+            display_driver = MockDisplayDriver(init = True), 
+            font_loader = MockFontLoader(), 
+            splash_callback = MockSplashCallback(output = display)
+        )
+
+        appl = Controller(
+            led_driver = MockNeoPixelDriver(),
+            midi = MockMidiController(),
+            ui = ui
+        )
+
+        appl.init()
+
+        # Redrawn with the frame rate by the controller only
+        self.assertIn(display.frame, appl.updateables)
+        self.assertNotIn(display, appl.updateables)
+        self.assertEqual(ui.updateables, [])
+
+        marker = display.deviance._TunerDevianceDisplay__marker
+        x_initial = marker.x
+
+        # Incoming values are only stored
+        mapping_2.value = 0
+        display.parameter_changed(mapping_2)
+
+        mapping_2.value = 16383
+        display.parameter_changed(mapping_2)
+
+        self.assertEqual(marker.x, x_initial)
+
+        # Next frame: Only the latest value is drawn
+        display.frame.update()
+
+        self.assertEqual(marker.x, 399)
+        self.assertEqual(display.label_note.text_color, Colors.ORANGE)
+
+        # Nothing received: No changes
+        marker.x = 5
+        display.frame.update()
+
+        self.assertEqual(marker.x, 5)
+
+
+    def test_frame_rate_redraws(self):
+        self.current_millis = 1000
+
+        def get_current_millis():
+            return self.current_millis
+
+        mapping_1 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x09]
+            )
+        )
+
+        mapping_2 = MockParameterMapping(
+            response = SystemExclusive(
+                manufacturer_id = [0x00, 0x10, 0x20],
+                data = [0x00, 0x00, 0x10]
+            )
+        )
+
+        display = TunerDisplay(
+            mapping_note = mapping_1,
+            mapping_deviance = mapping_2,
+            bounds = DisplayBounds(0, 0, 404, 200),
+            layout = {
+                "font": "foo"
+            },
+            frame_rate = 20
+        )
+
+        ui = UiController(
+            display_driver = MockDisplayDriver(init = True), 
+            font_loader = MockFontLoader(), 
+            splash_callback = MockSplashCallback(output = display)
+        )
+
+        period = MockPeriodCounter()
+
+        with patch.dict(Controller.tick.__globals__, { "get_current_millis": get_current_millis }):
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = MockMidiController(),
+                ui = ui,
+                period_counter = period
+            )
+
+            appl.init()
+
+            # Count the redraws of the deviance display
+            redraws = []
+            set_deviance = display.deviance.set
+
+            def count_set(value):
+                redraws.append(value)
+                set_deviance(value)
+
+            display.deviance.set = count_set
+
+            # Several frames, each with a lot of incoming values, and the periodic updates running every tick
+            for frame in range(5):
+                for i in range(10):
+                    mapping_2.value = frame * 1000 + i * 10
+                    display.parameter_changed(mapping_2)
+
+                    period.exceed_next_time = True
+                    appl.tick()
+
+                self.assertEqual(len(redraws), frame)
+
+                self.current_millis += 50
+
+                for i in range(3):
+                    period.exceed_next_time = True
+                    appl.tick()
+
+                # Exactly one redraw per frame, with the latest value
+                self.assertEqual(len(redraws), frame + 1)
+                self.assertEqual(redraws[-1], frame * 1000 + 90)
+
+
     ##################################################################################################################
 
 
@@ -0,0 +1,332 @@
+import sys
+import json
+import unittest
+from os import path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch   # Necessary workaround! Needs to be separated.
+
+from .mocks_lib import *
+
+# Import subject under test
+with patch.dict(sys.modules, {
+    "micropython": MockMicropython,
+    "usb_midi": MockUsbMidi(),
+    "adafruit_midi": MockAdafruitMIDI(),
+    "adafruit_midi.control_change": MockAdafruitMIDIControlChange(),
+    "adafruit_midi.system_exclusive": MockAdafruitMIDISystemExclusive(),
+    "adafruit_midi.program_change": MockAdafruitMIDIProgramChange(),
+    "adafruit_midi.midi_message": MockAdafruitMIDIMessage(),
+    "gc": MockGC()
+}):
+    from adafruit_midi.system_exclusive import SystemExclusive
+
+    from .mocks_appl import *
+    import lib.pyswitch.controller.cache as cache_module
+    from lib.pyswitch.controller.cache import ValueCache
+    from lib.pyswitch.controller.client import Client
+    from lib.pyswitch.controller.controller import Controller
+
+
+class TestValueCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.file = path.join(self.dir.name, "values")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write_snapshot(self, values):
+        with open(self.file, "w") as f:
+            json.dump(values, f)
+
+    def read_snapshot(self):
+        with open(self.file, "r") as f:
+            return json.load(f)
+
+
+    def test_restore(self):
+        self.write_snapshot({
+            "Cache Rig Name": "Some Rig",
+            "Cache Effect": 3,
+            "Cache Other": 5
+        })
+
+        cache = ValueCache(path = self.file)
+
+        mapping_1 = MockParameterMapping(name = "Cache Rig Name", persist = True)
+        mapping_2 = MockParameterMapping(name = "Cache Effect", value = 7, persist = True)
+        mapping_3 = MockParameterMapping(name = "Cache Unknown", persist = True)
+        mapping_4 = MockParameterMapping()
+
+        listener = MockClientRequestListener()
+
+        cache.watch(mapping_1, listener)
+        cache.watch(mapping_2, listener)
+        cache.watch(mapping_3, listener)
+        cache.watch(mapping_4, listener)
+
+        cache.restore()
+
+        # Only mappings without value are restored
+        self.assertEqual(mapping_1.value, "Some Rig")
+        self.assertEqual(mapping_1.stale, True)
+
+        self.assertEqual(mapping_2.value, 7)
+        self.assertEqual(mapping_2.stale, False)
+
+        self.assertEqual(mapping_3.value, None)
+        self.assertEqual(mapping_3.stale, False)
+
+        self.assertEqual(mapping_4.value, None)
+
+        self.assertEqual(listener.parameter_changed_calls, [mapping_1])
+
+    def test_watch_persisted_only(self):
+        self.write_snapshot({
+            "Cache Persist": 1,
+            "Cache No Persist": 2,
+            "Cache Notify Always": 3
+        })
+
+        cache = ValueCache(path = self.file)
+
+        mapping_1 = MockParameterMapping(name = "Cache Persist", persist = True)
+        mapping_2 = MockParameterMapping(name = "Cache No Persist")
+        mapping_3 = MockParameterMapping(name = "Cache Notify Always", notify_always = True, persist = True)
+
+        listener = MockClientRequestListener()
+
+        cache.watch(mapping_1, listener)
+        cache.watch(mapping_2, listener)
+        cache.watch(mapping_3, listener)
+
+        cache.restore()
+
+        # Mappings without persist flag and mappings notifying about every value are not restored
+        self.assertEqual(mapping_1.value, 1)
+        self.assertEqual(mapping_2.value, None)
+        self.assertEqual(mapping_3.value, None)
+
+        self.assertEqual(listener.parameter_changed_calls, [mapping_1])
+
+    def test_missing_or_invalid_file(self):
+        cache = ValueCache(path = self.file)
+
+        mapping = MockParameterMapping(name = "Cache Missing", persist = True)
+        cache.watch(mapping)
+        cache.restore()
+
+        self.assertEqual(mapping.value, None)
+
+        with open(self.file, "w") as f:
+            f.write("{ invalid")
+
+        cache = ValueCache(path = self.file)
+        cache.watch(mapping)
+        cache.restore()
+
+        self.assertEqual(mapping.value, None)
+
+
+    def test_write(self):
+        self.current_millis = 1000
+
+        def get_current_millis():
+            return self.current_millis
+
+        with patch.dict(ValueCache.update.__globals__, { "get_current_millis": get_current_millis }):
+            self.write_snapshot({
+                "Cache Write 1": 1,
+                "Cache Write Not Watched": 8
+            })
+
+            cache = ValueCache(path = self.file, write_delay_millis = 500, min_write_interval_millis = 10000)
+
+            mapping_1 = MockParameterMapping(name = "Cache Write 1", persist = True)
+            mapping_2 = MockParameterMapping(name = "Cache Write 2", persist = True)
+            mapping_3 = MockParameterMapping(name = "Cache Write 3", value = [1, 2], persist = True)
+
+            cache.watch(mapping_1)
+            cache.watch(mapping_2)
+            cache.watch(mapping_3)
+
+            cache.restore()
+
+            # Stale values are not written
+            cache.update()
+            self.current_millis = 2000
+            cache.update()
+
+            self.assertEqual(cache.num_writes, 0)
+
+            # Live value: Written after the value has been stable for the write delay
+            mapping_1.value = 2
+            mapping_1.stale = False
+
+            mapping_2.value = "foo"
+
+            cache.update()
+            self.assertEqual(cache.num_writes, 0)
+
+            self.current_millis = 2400
+            cache.update()
+            self.assertEqual(cache.num_writes, 0)
+
+            self.current_millis = 2600
+            cache.update()
+            self.assertEqual(cache.num_writes, 1)
+
+            self.assertEqual(self.read_snapshot(), {
+                "Cache Write 1": 2,
+                "Cache Write 2": "foo",
+                "Cache Write Not Watched": 8
+            })
+
+            # Unchanged: No writes
+            self.current_millis = 20000
+            cache.update()
+            cache.update()
+            self.assertEqual(cache.num_writes, 1)
+
+            # Changes back to the stored value before the delay has passed do not cause writes
+            mapping_1.value = 3
+            cache.update()
+
+            mapping_1.value = 2
+            self.current_millis = 21000
+            cache.update()
+
+            mapping_1.value = 3
+            cache.update()
+            self.assertEqual(cache.num_writes, 1)
+
+            # Minimum write interval
+            self.current_millis = 22000
+            mapping_1.value = 4
+            cache.update()
+
+            self.current_millis = 25000
+            cache.update()
+            self.assertEqual(cache.num_writes, 2)
+
+            mapping_1.value = 5
+            cache.update()
+
+            self.current_millis = 30000
+            cache.update()
+            self.assertEqual(cache.num_writes, 2)
+
+            self.current_millis = 35001
+            cache.update()
+            self.assertEqual(cache.num_writes, 3)
+
+            self.assertEqual(self.read_snapshot()["Cache Write 1"], 5)
+
+    def test_not_writable(self):
+        self.current_millis = 1000
+
+        def get_current_millis():
+            return self.current_millis
+
+        with patch.dict(ValueCache.update.__globals__, { "get_current_millis": get_current_millis }):
+            cache = ValueCache(path = path.join(self.dir.name, "not", "existing"), write_delay_millis = 0)
+
+            mapping = MockParameterMapping(name = "Cache Not Writable", value = 1, persist = True)
+            cache.watch(mapping)
+
+            with patch.dict(ValueCache.update.__globals__, { "do_print": lambda msg: None }):
+                cache.update()
+                self.current_millis = 2000
+                cache.update()
+
+            self.assertEqual(cache.num_writes, 0)
+
+            mapping.value = 2
+            self.current_millis = 3000
+            cache.update()
+            self.current_millis = 4000
+            cache.update()
+
+            self.assertEqual(cache.num_writes, 0)
+
+
+    def test_stale_cleared_by_client(self):
+        self.write_snapshot({
+            "Cache Client": 3
+        })
+
+        midi = MockMidiController()
+        client = Client(midi, {})
+        client.cache = ValueCache(path = self.file)
+
+        response = SystemExclusive(
+            manufacturer_id = [0x00, 0x10, 0x20],
+            data = [0x00, 0x00, 0x09]
+        )
+
+        mapping = MockParameterMapping(
+            name = "Cache Client",
+            response = response,
+            persist = True
+        )
+
+        listener = MockClientRequestListener()
+
+        client.register(mapping, listener)
+        client.cache.restore()
+
+        self.assertEqual(mapping.value, 3)
+        self.assertEqual(mapping.stale, True)
+        self.assertEqual(listener.parameter_changed_calls, [mapping])
+
+        # Live value confirms the restored one: Listeners are notified again
+        mapping.outputs_parse = [
+            {
+                "message": response,
+                "value": 3
+            }
+        ]
+
+        client.receive(response)
+
+        self.assertEqual(mapping.value, 3)
+        self.assertEqual(mapping.stale, False)
+        self.assertEqual(listener.parameter_changed_calls, [mapping, mapping])
+
+
+    def test_controller(self):
+        self.write_snapshot({
+            "Cache Controller": 6
+        })
+
+        mapping = MockParameterMapping(name = "Cache Controller", persist = True)
+        listener = MockClientRequestListener()
+
+        # The cache module is imported by the controller on demand
+        with patch.dict(sys.modules, { "lib.pyswitch.controller.cache": cache_module }):
+            appl = Controller(
+                led_driver = MockNeoPixelDriver(),
+                midi = MockMidiController(),
+                config = {
+                    "valueCache": True,
+                    "valueCacheFile": self.file
+                }
+            )
+
+        self.assertIsInstance(appl.client.cache, ValueCache)
+        self.assertIn(appl.client.cache, appl.updateables)
+
+        appl.client.register(mapping, listener)
+        appl.init()
+
+        self.assertEqual(mapping.value, 6)
+        self.assertEqual(listener.parameter_changed_calls, [mapping])
+
+    def test_controller_disabled(self):
+        appl = Controller(
+            led_driver = MockNeoPixelDriver(),
+            midi = MockMidiController()
+        )
+
+        self.assertEqual(appl.client.cache, None)
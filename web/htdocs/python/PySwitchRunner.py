@@ -131,7 +131,10 @@ class PySwitchRunner:
 
             # Controller instance (runs the processing loop and keeps everything together)
             self.controller = Controller(
-                led_driver = WrapNeoPixelDriver(self.dom_namespace), 
+                led_driver = WrapNeoPixelDriver(
+                    dom_namespace = self.dom_namespace,
+                    buffered = get_option(config_py, "bufferedLeds")
+                ), 
                 protocol = self.protocol,
                 midi = MidiController(
                     routings = {
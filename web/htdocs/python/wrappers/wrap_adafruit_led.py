@@ -2,6 +2,8 @@ from js import document
 from math import pow
 # import colorsys
 
+from pyswitch.misc import LedFrame
+
 class WrapNeoPixelDriver:
     class LedList(list):
         def __init__(self, dom_namespace):
@@ -10,47 +12,71 @@ class WrapNeoPixelDriver:
 
         def __add__(self, *args, **kwargs):
             return WrapNeoPixelDriver.LedList(super().__add__(*args, **kwargs))
-        
-        def __setitem__(self, key, value):            
-            super(WrapNeoPixelDriver.LedList, self).__setitem__(key, value)
-
-            led = document.getElementById(self.dom_namespace + "-led-" + str(key))
-
-            if not led:
-                #print("Warning: LED " + str(key) + " not found in DOM")
-                return
-            
-            # Store original value for testing
-            led.dataset.color = [v for v in value]
-
-            # When black, make transparent
-            if value == (0, 0, 0):
-                led.style.backgroundColor = f"rgba(0, 0, 0, 0)"
-                return
 
-            # Apply gamma correction
-            def trans(x, gamma = 0.28):
-                return pow((x/255), gamma) * 255
-            
-            def clip(x):
-                return x if x < 256 else 255
-            
-            value = [clip(trans(v * 3)) for v in value]
+        def __setitem__(self, key, value):
+            super(WrapNeoPixelDriver.LedList, self).__setitem__(key, value)
 
-            led.style.backgroundColor = f"rgb({ value[0] }, { value[1] }, { value[2] })"
+            _update_led(self.dom_namespace, key, value)
 
         def fill(self, color):
             for i in range(len(self)):
                 self[i] = color
 
-    def __init__(self, dom_namespace):
+    # buffered: If enabled, LED colors are collected in a frame buffer and only pushed to the
+    #           DOM once per tick (when show() is called), and only if anything has changed.
+    def __init__(self, dom_namespace, buffered = False):
         self.leds = None
         self.dom_namespace = dom_namespace
-        
+        self.buffered = buffered
+
     def init(self, num_leds):
-        self.leds = self.LedList(self.dom_namespace) 
+        if self.buffered:
+            self.leds = LedFrame(num_leds)
+
+            # Push the initial frame, as show() only writes changed pixels
+            self.leds.invalidate()
+            self.show()
+            return
+
+        self.leds = self.LedList(self.dom_namespace)
 
         while len(self.leds) < num_leds:
             self.leds.append(None)
 
+    # Pushes all changed pixels to the DOM (buffered mode only)
+    def show(self):
+        if not self.buffered:
+            return
+
+        self.leds.flush(self.__write_pixel)
+
+    def __write_pixel(self, index, color):
+        _update_led(self.dom_namespace, index, color)
+
+
+# Updates the DOM representation of a LED
+def _update_led(dom_namespace, key, value):
+    led = document.getElementById(dom_namespace + "-led-" + str(key))
+
+    if not led:
+        #print("Warning: LED " + str(key) + " not found in DOM")
+        return
+
+    # Store original value for testing
+    led.dataset.color = [v for v in value]
+
+    # When black, make transparent
+    if value == (0, 0, 0):
+        led.style.backgroundColor = f"rgba(0, 0, 0, 0)"
+        return
+
+    # Apply gamma correction
+    def trans(x, gamma = 0.28):
+        return pow((x/255), gamma) * 255
+
+    def clip(x):
+        return x if x < 256 else 255
+
+    value = [clip(trans(v * 3)) for v in value]
 
+    led.style.backgroundColor = f"rgb({ value[0] }, { value[1] }, { value[2] })"